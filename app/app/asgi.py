@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
-application = get_asgi_application()
+# As get_asgi_application(), with the handler sending the streams of the
+# async read views without blocking the event loop.
+django.setup(set_prefix=False)
+
+from core.async_views import ASGIHandler  # noqa: E402
+
+application = ASGIHandler()
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -81,14 +83,36 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# DB_POOL_MODE picks how connections are reused:
+# - persistent: each server thread keeps its connection for DB_CONN_MAX_AGE
+#   seconds instead of opening one per request.
+# - pgbouncer: the same, through PgBouncer in transaction pooling mode,
+#   where a server-side cursor can't outlive its transaction.
+# - none: a new connection per request.
+# With DB_CONN_HEALTH_CHECKS, a kept connection idle for more than
+# DB_CONN_HEALTH_CHECK_IDLE seconds is pinged at the start of a request
+# and replaced if the server dropped it (see core.db).
+DB_POOL_MODE = os.environ.get('DB_POOL_MODE', 'persistent')
+if DB_POOL_MODE not in ('persistent', 'pgbouncer', 'none'):
+    raise ImproperlyConfigured(f'Unknown DB_POOL_MODE {DB_POOL_MODE!r}.')
+
 DATABASES = {
     'default': {
        'ENGINE' : 'django.db.backends.postgresql',
        'HOST' : os.environ.get('DB_HOST'),
+       'PORT' : os.environ.get('DB_PORT', ''),
        'NAME' : os.environ.get('DB_NAME'),
        'USER' : os.environ.get('DB_USER'),
        'PASSWORD' : os.environ.get('DB_PASS'),
-       
+       'CONN_MAX_AGE' : (
+           0 if DB_POOL_MODE == 'none'
+           else int(os.environ.get('DB_CONN_MAX_AGE', 60))
+       ),
+       'CONN_HEALTH_CHECKS' : os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1',
+       'CONN_HEALTH_CHECK_IDLE' : int(
+           os.environ.get('DB_CONN_HEALTH_CHECK_IDLE', 30)
+       ),
+       'DISABLE_SERVER_SIDE_CURSORS' : DB_POOL_MODE == 'pgbouncer',
     }
 }
 
@@ -132,9 +156,39 @@ USE_TZ = True
 STATIC_URL = '/static/static/'
 MEDIA_URL = '/static/media/'
 
-MEDAI_ROOT = '/vol/web/media'
+MEDIA_ROOT = '/vol/web/media'
 STATIC_ROOT = '/vol/web/static'
 
+# Largest paper PDF accepted, enforced while the upload streams in.
+PAPER_PDF_MAX_SIZE = int(
+    os.environ.get('PAPER_PDF_MAX_SIZE', 10 * 1024 * 1024)
+)
+
+# How paper PDF downloads are sent: 'django' streams them from the app,
+# 'x-accel-redirect' (nginx) and 'x-sendfile' (Apache, lighttpd) hand the
+# file over to the fronting server after the permission check.
+PAPER_PDF_SERVE = os.environ.get('PAPER_PDF_SERVE', 'django')
+if PAPER_PDF_SERVE not in ('django', 'x-accel-redirect', 'x-sendfile'):
+    raise ImproperlyConfigured(f'Unknown PAPER_PDF_SERVE {PAPER_PDF_SERVE!r}.')
+# Internal nginx location mapped to MEDIA_ROOT, for x-accel-redirect.
+PAPER_PDF_ACCEL_PREFIX = os.environ.get(
+    'PAPER_PDF_ACCEL_PREFIX', '/protected-media/'
+)
+
+# Outgoing email, only sent by the process_outbox command.
+EMAIL_BACKEND = os.environ.get(
+    'EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend'
+)
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', '0') == '1'
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 30))
+DEFAULT_FROM_EMAIL = os.environ.get(
+    'DEFAULT_FROM_EMAIL', 'no-reply@localhost'
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -143,7 +197,58 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.StandardCursorPagination',
+    'PAGE_SIZE': 50,
+}
+
+# Any Django cache backend works, e.g. FileBasedCache with a directory as
+# CACHE_LOCATION, or a Redis backend such as django_redis.cache.RedisCache
+# with a redis:// URL. It must be shared by the workers: outside DEBUG the
+# default is the database cache (python manage.py createcachetable).
+if DEBUG:
+    CACHE_DEFAULTS = ('django.core.cache.backends.locmem.LocMemCache', '')
+else:
+    CACHE_DEFAULTS = ('django.core.cache.backends.db.DatabaseCache',
+                      'django_cache')
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', CACHE_DEFAULTS[0]),
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_DEFAULTS[1]),
+    }
 }
+
+# Rendered responses of the public event and topic reads. Only cached in
+# memcached or Redis: hits in the database cache cost more queries than
+# the responses. A LocMemCache is per process, so it isn't used unless
+# LOCAL_CACHE allows it (a single worker): other workers would serve
+# responses invalidated in one.
+API_RESPONSE_CACHE = {
+    'TIMEOUT': int(os.environ.get('API_RESPONSE_CACHE_TIMEOUT', 300)),
+    'CACHE_ALIAS': 'default',
+    'LOCAL_CACHE': DEBUG or os.environ.get('API_RESPONSE_LOCAL_CACHE') == '1',
+}
+
+# Cache of token -> user lookups done by CachedTokenAuthentication.
+# SHARED_CACHE also stores them in the CACHE_ALIAS cache so every worker
+# benefits from one lookup. Invalidations reach the other workers through
+# token versions kept in the CACHE_ALIAS cache, which is read on every
+# request: lookups are only cached when it is a LocMemCache, memcached or
+# Redis, not the database cache.
+TOKEN_AUTH_CACHE = {
+    'TIMEOUT': int(os.environ.get('TOKEN_AUTH_CACHE_TIMEOUT', 60)),
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_MAX_SIZE', 1024)),
+    'SHARED_CACHE': os.environ.get('TOKEN_AUTH_SHARED_CACHE') == '1',
+    'CACHE_ALIAS': 'default',
+}
+
+# Async read path of the public event views (core.async_views), for ASGI
+# servers. MAX_WORKERS bounds the concurrent reads, and so the database
+# connections they hold.
+ASYNC_READS = {
+    'ENABLED': os.environ.get('ASYNC_READS') == '1',
+    'MAX_WORKERS': int(os.environ.get('ASYNC_READS_MAX_WORKERS', 16)),
+}
+
 SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
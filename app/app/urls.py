@@ -23,6 +23,8 @@ from django.urls import path,include
 from django.conf.urls.static import static
 from django.conf import settings
 
+from core.downloads import serve_public_media
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
@@ -38,7 +40,9 @@ urlpatterns = [
 ]
 
 if settings.DEBUG:
+    # Paper PDFs are only sent by the permission-checked pdf action.
     urlpatterns += static(
         settings.MEDIA_URL,
+        view = serve_public_media,
         document_root = settings.MEDIA_ROOT,
-    )
\ No newline at end of file
+    )
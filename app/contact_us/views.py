@@ -1,10 +1,12 @@
+from django.db import transaction
 from rest_framework import viewsets, mixins
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
 
 from contact_us import serializers
+from core.authentication import CachedTokenAuthentication
 from contact_us.permissions import IsOwnerOrAdmin
 from core.models import ContactUs
+from core.notifications import notify_contact_message
 
 
 class ContactUsViewSet(
@@ -16,7 +18,7 @@ class ContactUsViewSet(
     """ViewSet for Contact Us messages."""
 
     serializer_class = serializers.ContactUsSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
 
     queryset = ContactUs.objects.all().order_by('-id')
@@ -27,5 +29,7 @@ class ContactUsViewSet(
             return self.queryset
         return self.queryset.filter(user=user)
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        contact = serializer.save(user=self.request.user)
+        notify_contact_message(contact)
@@ -1,8 +1,10 @@
 """Django admin"""
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from core import models
+from event.counters import COUNTER_FIELDS, save_event
 
 class UserAdmin(BaseUserAdmin):
     """Define the admin pages for users."""
@@ -42,10 +44,25 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+
+class EventAdmin(admin.ModelAdmin):
+    """Counters are only changed by registrations and papers."""
+    readonly_fields = COUNTER_FIELDS
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        with transaction.atomic():
+            save_event(obj)
+
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Event)
+admin.site.register(models.Event, EventAdmin)
 admin.site.register(models.Topic)
 admin.site.register(models.Paper)
+admin.site.register(models.Keyword)
+admin.site.register(models.PaperJob)
+admin.site.register(models.OutboxMessage)
 admin.site.register(models.EventRegistration)
 admin.site.register(models.EventSchedule)
 admin.site.register(models.ContactUs)
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""Async entry points for the public read views under ASGI.
+
+Django 3.2 has no async ORM and runs sync views through
+``sync_to_async(thread_sensitive=True)``: one thread serves every request
+of a worker in turn. Views using AsyncReadMixin are coroutines instead.
+Safe requests run to a rendered response in a bounded thread pool of
+their own while the event loop keeps accepting and writing to other
+(possibly slow) connections. Other methods keep Django's default path.
+Streamed bodies need the ASGIHandler below, which app.asgi serves.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers import asgi
+from django.db import close_old_connections, connections
+from django.http import HttpResponse
+
+from core.db import check_connections, mark_connections_idle
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_executor = None
+
+
+def get_executor():
+    """Return the thread pool running async reads."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_READS['MAX_WORKERS'],
+            thread_name_prefix='async-read',
+        )
+    return _executor
+
+
+async def stream_in_thread(content):
+    """Yield the chunks of a streaming body, each produced in one thread.
+
+    Django 3.2 iterates streaming bodies on the event loop, where the ORM
+    refuses to run. A thread of the stream's own reads them instead, so
+    the server-side cursor of an export stays on a single connection,
+    and the loop serves other connections while a chunk is produced.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix='async-stream',
+    )
+    iterator = iter(content)
+    done = object()
+    try:
+        while True:
+            chunk = await loop.run_in_executor(executor, next, iterator, done)
+            if chunk is done:
+                return
+            yield chunk
+    finally:
+        # The thread goes away with the stream: so does its connection.
+        await loop.run_in_executor(executor, connections.close_all)
+        executor.shutdown(wait=False)
+
+
+def _detach(response):
+    """Return a response the event loop can finish without the ORM.
+
+    Django would otherwise render the response back on the event loop,
+    so its content is copied to a plain HttpResponse. Streaming responses
+    are passed through, with their body read by stream_in_thread when
+    ASGIHandler sends it.
+    """
+    if response.streaming:
+        response.async_streaming_content = stream_in_thread(
+            response.streaming_content,
+        )
+        return response
+    detached = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        detached[header] = value
+    detached.cookies = response.cookies
+    return detached
+
+
+def run_read(view, request, args, kwargs):
+    """Run a sync view in the current (pool) thread, fully rendered.
+
+    The request signals are sent in another thread, so the upkeep they do
+    on that thread's connections is done here for this one's.
+    """
+    close_old_connections()
+    check_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response = response.render()
+        return _detach(response)
+    finally:
+        close_old_connections()
+        mark_connections_idle()
+
+
+def async_read_view(view):
+    """Wrap a sync view so safe requests run in the async read pool."""
+    write_view = sync_to_async(view, thread_sensitive=True)
+
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method not in READ_METHODS:
+            return await write_view(request, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_executor(),
+            functools.partial(run_read, view, request, args, kwargs),
+        )
+
+    return async_view
+
+
+class AsyncReadMixin:
+    """Serve the view from a coroutine when ASYNC_READS is enabled.
+
+    Only worth it under ASGI: a WSGI server would have to run the
+    coroutine in an event loop of its own for every request.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        if not settings.ASYNC_READS['ENABLED']:
+            return view
+        return async_read_view(view)
+
+
+class ASGIHandler(asgi.ASGIHandler):
+    """Django's ASGI handler, awaiting the bodies of stream_in_thread."""
+
+    async def send_response(self, response, send):
+        content = getattr(response, 'async_streaming_content', None)
+        if content is None:
+            return await super().send_response(response, send)
+
+        async def send_with_content(message):
+            # Django sends the headers, then the closing body message of
+            # an empty stream: the chunks go in between.
+            if message['type'] == 'http.response.body':
+                async for part in content:
+                    for chunk, _ in self.chunk_bytes(part):
+                        await send({
+                            'type': 'http.response.body',
+                            'body': chunk,
+                            'more_body': True,
+                        })
+            await send(message)
+
+        response.streaming_content = ()
+        try:
+            await super().send_response(response, send_with_content)
+        finally:
+            await content.aclose()
@@ -0,0 +1,207 @@
+"""Token authentication with cached token lookups."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from core.cache import is_memory_cache
+
+DEFAULTS = {
+    'TIMEOUT': 60,
+    'MAX_SIZE': 1024,
+    'SHARED_CACHE': False,
+    'CACHE_ALIAS': 'default',
+}
+
+
+def get_setting(name):
+    """Return a TOKEN_AUTH_CACHE setting, falling back to the default."""
+    return getattr(settings, 'TOKEN_AUTH_CACHE', {}).get(name, DEFAULTS[name])
+
+
+class TokenLRUCache:
+    """Bounded, thread-safe LRU of token key -> user with a TTL.
+
+    Entries remember the version of their token they were stored under,
+    and are only returned for that version.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version=None):
+        """Return the cached user for the key and version, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, entry_version, user = entry
+            if expires <= time.monotonic() or entry_version != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def set(self, key, user, version=None):
+        """Cache the user for the key, evicting the oldest entries."""
+        expires = time.monotonic() + get_setting('TIMEOUT')
+        with self._lock:
+            self._entries[key] = (expires, version, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > get_setting('MAX_SIZE'):
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Drop one token key."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        """Drop every token key that resolves to the user."""
+        with self._lock:
+            keys = [
+                key for key, (_, _, user) in self._entries.items()
+                if user.pk == user_id
+            ]
+            for key in keys:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenLRUCache()
+
+
+def shared_cache_key(key):
+    """Return the Django cache key for a token key."""
+    return f'auth-token:{key}'
+
+
+def version_cache_key(key):
+    """Return the Django cache key of a token key's version."""
+    return f'auth-token:version:{key}'
+
+
+def version_cache():
+    """Return the Django cache holding the token versions."""
+    return caches[get_setting('CACHE_ALIAS')]
+
+
+def is_enabled():
+    """Return whether token lookups are cached.
+
+    Only when the versions are kept in memory (LocMemCache, memcached or
+    Redis): read from the database cache, a version costs the query the
+    cache is meant to save.
+    """
+    return is_memory_cache(version_cache())
+
+
+def shared_cache():
+    """Return the Django cache used as the shared tier, or None."""
+    if not get_setting('SHARED_CACHE'):
+        return None
+    return caches[get_setting('CACHE_ALIAS')]
+
+
+def _new_version():
+    # Time based, so an evicted version never restarts at a value that
+    # cached entries were stored under.
+    return time.time_ns()
+
+
+def get_version(key):
+    """Return the current version of a token key."""
+    cache = version_cache()
+    version = cache.get(version_cache_key(key))
+    if version is None:
+        version = _new_version()
+        cache.set(version_cache_key(key), version, None)
+    return version
+
+
+def bump_versions(keys):
+    """Orphan the entries of token keys cached by any process."""
+    if not is_enabled():
+        return
+    cache = version_cache()
+    for key in keys:
+        try:
+            cache.incr(version_cache_key(key))
+        except ValueError:
+            cache.set(version_cache_key(key), _new_version(), None)
+
+
+def invalidate_token(key):
+    """Forget a cached token in every tier and process."""
+    bump_versions([key])
+    token_cache.delete(key)
+    cache = shared_cache()
+    if cache is not None:
+        cache.delete(shared_cache_key(key))
+
+
+def invalidate_user(user_id, token_keys=()):
+    """Forget every cached token of a user in every tier and process."""
+    bump_versions(token_keys)
+    token_cache.delete_user(user_id)
+    cache = shared_cache()
+    if cache is not None and token_keys:
+        cache.delete_many([shared_cache_key(key) for key in token_keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that caches token -> user resolution.
+
+    Lookups hit a per-process LRU first, then (when enabled) the shared
+    Django cache, and only then the Token/User join. The signal handlers
+    in core.signals bump the token's version in the Django cache when a
+    token is deleted or its user is saved or deleted: other processes
+    then drop their entry on the next lookup. Their LRU only sees this
+    when CACHE_ALIAS is a cache shared by the processes. Nothing is
+    cached unless that cache is in memory (see is_enabled).
+    """
+
+    def authenticate_credentials(self, key):
+        if not is_enabled():
+            return super().authenticate_credentials(key)
+
+        # Read before the database, so an invalidation racing the query
+        # below leaves an entry that is already stale.
+        version = get_version(key)
+        user = token_cache.get(key, version)
+        cache = shared_cache()
+        if user is None and cache is not None:
+            user = cache.get(shared_cache_key(key))
+            if user is not None:
+                token_cache.set(key, user, version)
+
+        if user is None:
+            user, _token = super().authenticate_credentials(key)
+            token_cache.set(key, user, version)
+            if cache is not None:
+                cache.set(
+                    shared_cache_key(key), user, get_setting('TIMEOUT')
+                )
+        elif not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+
+        # Each request gets its own copy so views can't mutate the cached
+        # instance shared with other threads.
+        user = copy.copy(user)
+        return (user, self.get_model()(key=key, user=user))
@@ -0,0 +1,15 @@
+"""What the configured Django cache backends cost to use."""
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import BaseMemcachedCache
+
+
+def is_shared_memory_cache(cache):
+    """Return whether cache is memcached or Redis, shared by processes."""
+    return isinstance(cache, BaseMemcachedCache) or (
+        'redis' in type(cache).__module__
+    )
+
+
+def is_memory_cache(cache):
+    """Return whether reading cache costs no database query."""
+    return isinstance(cache, LocMemCache) or is_shared_memory_cache(cache)
@@ -0,0 +1,45 @@
+"""Health checks of persistent database connections.
+
+Django 3.2 only replaces a kept connection once a query on it has failed,
+so the first request after a database restart or a PgBouncer/firewall
+idle timeout errors out. Databases with CONN_HEALTH_CHECKS get their kept
+connection pinged when a request starts, after Django has closed the
+obsolete ones, and reconnected lazily if the ping fails. Only connections
+idle for more than CONN_HEALTH_CHECK_IDLE seconds are pinged: the ones in
+steady use don't pay a round trip per request.
+"""
+import time
+
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.dispatch import receiver
+
+DEFAULT_IDLE = 30
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    """Close kept connections that were idle and no longer answer."""
+    now = time.monotonic()
+    for connection in connections.all():
+        if not connection.settings_dict.get('CONN_HEALTH_CHECKS'):
+            continue
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        idle_since = getattr(connection, 'idle_since', None)
+        idle = connection.settings_dict.get(
+            'CONN_HEALTH_CHECK_IDLE', DEFAULT_IDLE,
+        )
+        if idle_since is not None and now - idle_since < idle:
+            continue
+        if not connection.is_usable():
+            connection.close()
+
+
+@receiver(request_finished)
+def mark_connections_idle(**kwargs):
+    """Remember when the kept connections stopped being used."""
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.idle_since = now
@@ -0,0 +1,158 @@
+"""Sending stored files, with Range and conditional requests."""
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views import static
+from rest_framework.renderers import BaseRenderer
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Media only sent by permission-checked views, never as public files.
+PRIVATE_MEDIA = ('uploads/papers/',)
+
+
+class UnsatisfiableRange(ValueError):
+    """The requested byte range starts beyond the end of the file."""
+
+
+class FileRenderer(BaseRenderer):
+    """Let clients ask for the media type of files served by serve_file.
+
+    The files bypass rendering.
+    """
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only reached for error responses, whose status says it all.
+        return data if isinstance(data, bytes) else b''
+
+
+class PDFRenderer(FileRenderer):
+    media_type = 'application/pdf'
+    format = 'pdf'
+
+
+class JPEGRenderer(FileRenderer):
+    media_type = 'image/jpeg'
+    format = 'jpg'
+
+
+def parse_range(header, size):
+    """Return the inclusive (start, end) bytes a Range header asks for.
+
+    Returns None when the whole file should be sent: no header, a
+    malformed one or several ranges, which clients accept a 200 for.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last bytes of the file.
+        if int(last) == 0:
+            raise UnsatisfiableRange()
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise UnsatisfiableRange()
+    return start, min(end, size - 1)
+
+
+class FileRange:
+    """File-like object reading length bytes of a file from start.
+
+    Keeps fileno(), so WSGI servers using sendfile() for FileResponse
+    send the range (from the current offset, up to Content-Length)
+    without copying it through the application.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+        if hasattr(file, 'fileno'):
+            self.fileno = file.fileno
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def serve_file(request, storage, name, content_type, filename, etag=None,
+               offload='django', accel_prefix='/protected-media/'):
+    """Return the response sending the stored file name.
+
+    etag, a strong ETag of the content, enables conditional requests and
+    If-Range. offload is 'django' to stream the file from here, or
+    'x-accel-redirect' / 'x-sendfile' to only send the header telling the
+    fronting server which file to send (it then handles Range itself).
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+        return response
+
+    disposition = f'inline; filename="{filename}"'
+    if offload != 'django':
+        response = HttpResponse(content_type=content_type)
+        if offload == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = (
+                accel_prefix.rstrip('/') + '/' + quote(name)
+            )
+        else:
+            response['X-Sendfile'] = storage.path(name)
+        response['Content-Disposition'] = disposition
+        if etag:
+            response['ETag'] = etag
+        return response
+
+    try:
+        size = storage.size(name)
+    except FileNotFoundError:
+        raise Http404('No such file.')
+
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range is None or (etag and if_range == etag):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except UnsatisfiableRange:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = storage.open(name, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+        response['Content-Length'] = size
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            FileRange(file, start, end - start + 1),
+            status=206, content_type=content_type,
+        )
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Disposition'] = disposition
+    response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+    return response
+
+
+def serve_public_media(request, path, document_root=None, show_indexes=False):
+    """Serve media files in development, except the private ones."""
+    if (posixpath.normpath(path).lstrip('/') + '/').startswith(PRIVATE_MEDIA):
+        raise Http404()
+    return static.serve(request, path, document_root, show_indexes)
@@ -0,0 +1,74 @@
+"""Django command to measure the cost of connection handling per request"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.test import RequestFactory
+
+from event.views import EventViewSet
+
+MODES = {
+    'new connection per request': {
+        'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False,
+    },
+    'persistent': {
+        'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': False,
+    },
+    'persistent + health checks': {
+        'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True,
+    },
+}
+
+
+class Command(BaseCommand):
+    """Django command to benchmark connection reuse"""
+    help = (
+        'Serve the event list repeatedly with and without persistent '
+        'connections and report p50/p99 latency. Uses the configured '
+        'database (PostgreSQL, or SQLite as a stand-in).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument(
+            '--url', default='/api/event/events/?page_size=10',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        view = EventViewSet.as_view({'get': 'list'})
+        factory = RequestFactory(SERVER_NAME='localhost')
+        saved = {key: connection.settings_dict.get(key) for key in
+                 ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+        try:
+            for name, mode in MODES.items():
+                connection.close()
+                connection.settings_dict.update(mode)
+                timings = self._run(view, factory, options)
+                self.stdout.write(
+                    f'{name:>28}: p50 {statistics.median(timings):.2f} ms, '
+                    f'p99 {timings[int(len(timings) * 0.99) - 1]:.2f} ms'
+                )
+        finally:
+            connection.close()
+            connection.settings_dict.update(saved)
+
+    def _run(self, view, factory, options):
+        timings = []
+        for _ in range(options['requests']):
+            request = factory.get(options['url'])
+            start = time.perf_counter()
+            # The same signals a server sends, which open/close or keep
+            # the connection.
+            request_started.send(sender=self.__class__)
+            try:
+                response = view(request)
+                if callable(getattr(response, 'render', None)):
+                    response.render()
+            finally:
+                request_finished.send(sender=self.__class__)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return timings
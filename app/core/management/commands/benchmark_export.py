@@ -0,0 +1,112 @@
+"""Django command to measure the throughput of the CSV/NDJSON exports"""
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Event, EventRegistration, Paper
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the export endpoints"""
+    help = (
+        'Seed an event with rows, stream its export and report rows per '
+        'second. Everything runs in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument(
+            '--target', choices=['papers', 'registrations'],
+            default='registrations',
+        )
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        with transaction.atomic():
+            admin = get_user_model().objects.create_superuser(
+                email='export-benchmark@example.com', password=None,
+            )
+            event = Event.objects.create(
+                user=admin, title='Export benchmark', description='',
+                location='Benchmark', start_date=date.today(),
+                end_date=date.today(),
+            )
+            self.stdout.write(f'Seeding {options["rows"]} rows...')
+            self._seed(options['target'], event, options['rows'],
+                       options['batch_size'])
+
+            if options['target'] == 'papers':
+                url = reverse('event-papers-export', args=[event.pk])
+            else:
+                url = reverse(
+                    'event:event-export-registrations', args=[event.pk],
+                )
+            match = resolve(url)
+            request = APIRequestFactory().get(
+                url, HTTP_ACCEPT=FORMATS[options['format']],
+            )
+            force_authenticate(request, user=admin)
+
+            start = time.perf_counter()
+            response = match.func(request, *match.args, **match.kwargs)
+            size = lines = 0
+            for chunk in response.streaming_content:
+                size += len(chunk)
+                lines += chunk.count(b'\n')
+            elapsed = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        rows = lines - (options['format'] == 'csv')
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {rows} {options["target"]} as {options["format"]} '
+            f'({size / 2 ** 20:.1f} MiB) in {elapsed:.2f}s: '
+            f'{rows / elapsed:,.0f} rows/s.'
+        ))
+
+    def _seed(self, target, event, rows, batch_size):
+        for offset in range(0, rows, batch_size):
+            count = min(batch_size, rows - offset)
+            if target == 'papers':
+                Paper.objects.bulk_create([
+                    Paper(
+                        event=event, author=event.user,
+                        title=f'Paper {offset + i}', abstract='',
+                        keywords='benchmark',
+                        paper_type=Paper.PaperType.ORAL,
+                    )
+                    for i in range(count)
+                ])
+                continue
+
+            users = get_user_model().objects.bulk_create([
+                get_user_model()(
+                    email=f'export-{offset + i}@example.com',
+                    name=f'User {offset + i}', password='!',
+                )
+                for i in range(count)
+            ])
+            if not users[0].pk:
+                # Backends without RETURNING don't set primary keys.
+                users = get_user_model().objects.filter(
+                    email__startswith='export-',
+                ).order_by('-pk')[:count]
+            EventRegistration.objects.bulk_create([
+                EventRegistration(
+                    user=user, event=event, price=0,
+                    plan=EventRegistration.RegistrationPlan.GENERAL,
+                )
+                for user in users
+            ])
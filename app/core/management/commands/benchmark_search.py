@@ -0,0 +1,80 @@
+"""Django command to measure the latency of paper search"""
+import random
+import statistics
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import Event, Paper
+from core.search import search
+
+WORDS = (
+    'graph neural network security privacy learning cloud edge energy '
+    'vision language robot sensor quantum protocol database compiler '
+    'storage scheduling wireless medical genome climate market fairness'
+).split()
+
+
+class Command(BaseCommand):
+    """Django command to benchmark paper search"""
+    help = (
+        'Seed papers, run keyword searches and report their latency. '
+        'Everything runs in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        rng = random.Random(0)
+        with transaction.atomic():
+            author = get_user_model().objects.create_user(
+                email='search-benchmark@example.com', password=None,
+            )
+            event = Event.objects.create(
+                user=author, title='Search benchmark', description='',
+                location='Benchmark', start_date=date.today(),
+                end_date=date.today(),
+            )
+            self.stdout.write(f'Seeding {options["rows"]} papers...')
+            for offset in range(0, options['rows'], options['batch_size']):
+                count = min(options['batch_size'], options['rows'] - offset)
+                Paper.objects.bulk_create([
+                    Paper(
+                        event=event, author=author,
+                        title=' '.join(rng.sample(WORDS, 4)),
+                        abstract=' '.join(rng.choices(WORDS, k=40)),
+                        keywords=', '.join(rng.sample(WORDS, 3)),
+                        paper_type=Paper.PaperType.ORAL,
+                    )
+                    for _ in range(count)
+                ])
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE core_paper')
+
+            papers = Paper.objects.filter(event=event).only('id', 'title')
+            # Warm up, builds the in-process index on other backends.
+            list(search(papers, WORDS[0])[:50])
+
+            timings = []
+            for _ in range(options['queries']):
+                query = ' '.join(rng.sample(WORDS, rng.randint(1, 2)))
+                start = time.perf_counter()
+                list(search(papers, query).order_by('-search_rank')[:50])
+                timings.append((time.perf_counter() - start) * 1000)
+
+            transaction.set_rollback(True)
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(self.style.SUCCESS(
+            f'{options["queries"]} searches over {options["rows"]} papers: '
+            f'median {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms.'
+        ))
@@ -0,0 +1,118 @@
+"""Django command to compare the plans of the event topic filter"""
+import random
+import statistics
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import Event, Topic
+from event.views import filter_by_topics
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the topic filter"""
+    help = (
+        'Seed events linked to topics, then time the DISTINCT join and the '
+        'EXISTS semi-join filters. Everything runs in a transaction that is '
+        'rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=100000)
+        parser.add_argument('--topics-per-event', type=int, default=10)
+        parser.add_argument('--topics', type=int, default=100)
+        parser.add_argument('--filter-topics', type=int, default=3)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--explain', action='store_true', help='Print both plans.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        rng = random.Random(0)
+        with transaction.atomic():
+            self._seed(rng, options)
+            topic_ids = rng.sample(
+                list(Topic.objects.values_list('id', flat=True)),
+                options['filter_topics'],
+            )
+            events = Event.objects.only('id', 'title')
+            plans = {
+                'join + DISTINCT': events.filter(
+                    topics__id__in=topic_ids,
+                ).order_by('-id').distinct(),
+                'EXISTS': filter_by_topics(
+                    events, topic_ids,
+                ).order_by('-id'),
+            }
+
+            for name, queryset in plans.items():
+                if options['explain']:
+                    self.stdout.write(f'{name}:\n{queryset.explain()}\n')
+                page = self._time(queryset[:50], options['repeat'])
+                count = self._time(
+                    queryset.values('id'), options['repeat'], count=True,
+                )
+                self.stdout.write(
+                    f'{name:>16}: first page {page:.2f} ms, '
+                    f'count {count:.2f} ms (median of {options["repeat"]})'
+                )
+
+            transaction.set_rollback(True)
+
+    def _time(self, queryset, repeat, count=False):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            if count:
+                queryset.all().count()
+            else:
+                list(queryset.all())
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def _seed(self, rng, options):
+        user = get_user_model().objects.create_user(
+            email='topic-benchmark@example.com', password=None,
+        )
+        Topic.objects.bulk_create([
+            Topic(name=f'benchmark-topic-{i}')
+            for i in range(options['topics'])
+        ])
+        topic_ids = list(Topic.objects.filter(
+            name__startswith='benchmark-topic-',
+        ).values_list('id', flat=True))
+        EventTopic = Event.topics.through
+
+        self.stdout.write(
+            f'Seeding {options["events"]} events x '
+            f'{options["topics_per_event"]} topics...'
+        )
+        for offset in range(0, options['events'], options['batch_size']):
+            count = min(options['batch_size'], options['events'] - offset)
+            Event.objects.bulk_create([
+                Event(
+                    user=user, title=f'Event {offset + i}', description='',
+                    location='Benchmark', start_date=date.today(),
+                    end_date=date.today(),
+                )
+                for i in range(count)
+            ])
+            event_ids = Event.objects.filter(user=user).order_by(
+                '-id',
+            ).values_list('id', flat=True)[:count]
+            EventTopic.objects.bulk_create([
+                EventTopic(event_id=event_id, topic_id=topic_id)
+                for event_id in event_ids
+                for topic_id in rng.sample(
+                    topic_ids, options['topics_per_event'],
+                )
+            ])
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE core_event, core_event_topics')
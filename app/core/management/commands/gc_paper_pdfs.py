@@ -0,0 +1,68 @@
+"""Django command to delete paper files no paper references anymore"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from paper.uploads import (
+    GC_GRACE,
+    PDF_DIR,
+    PDF_FIELD,
+    THUMBNAIL_DIR,
+    THUMBNAIL_FIELD,
+    get_storage,
+    is_garbage,
+    iter_stored_pdfs,
+    release_pdf,
+)
+
+
+class Command(BaseCommand):
+    """Django command to garbage collect paper PDFs"""
+    help = (
+        'Delete stored paper PDFs and thumbnails that no paper references, '
+        'including abandoned partial uploads.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int,
+            default=int(GC_GRACE.total_seconds()),
+            help='Keep files modified less than this many seconds ago.',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report the files that would be deleted.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        storage = get_storage()
+        grace = timedelta(seconds=options['grace'])
+
+        garbage = [
+            (name, field)
+            for directory, field in (
+                (PDF_DIR, PDF_FIELD), (THUMBNAIL_DIR, THUMBNAIL_FIELD),
+            )
+            for name in iter_stored_pdfs(storage, directory)
+            if is_garbage(name, storage, grace, field)
+        ]
+
+        deleted = freed = 0
+        for name, field in garbage:
+            try:
+                size = storage.size(name)
+            except FileNotFoundError:
+                continue
+            if options['dry_run']:
+                self.stdout.write(name)
+            elif not release_pdf(name, storage, grace, field):
+                # Deduplicated to or deleted since it was listed.
+                continue
+            deleted += 1
+            freed += size
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {deleted} unreferenced file(s), {freed} bytes.'
+        ))
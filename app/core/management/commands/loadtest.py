@@ -0,0 +1,97 @@
+"""Django command to load test a running server"""
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """Django command to measure the throughput of one endpoint"""
+    help = (
+        'Send GET requests from concurrent keep-alive clients to a running '
+        'server and report throughput and latency. Run it against the same '
+        'app under a WSGI and an ASGI server to compare them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', default='http://127.0.0.1:8000/api/event/events/',
+        )
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument(
+            '--slow-read', type=float, default=0.0,
+            help='Seconds each client waits between 1 KiB reads, to act '
+                 'like slow clients holding connections open.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        url = urlsplit(options['url'])
+        path = url.path + (f'?{url.query}' if url.query else '')
+        deadline = time.monotonic() + options['duration']
+        results = []
+        lock = threading.Lock()
+
+        def client():
+            latencies, failures = [], 0
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80)
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    conn.request('GET', path)
+                    response = conn.getresponse()
+                    self._read(response, options['slow_read'])
+                except (OSError, http.client.HTTPException):
+                    failures += 1
+                    conn.close()
+                    continue
+                if response.status >= 400:
+                    failures += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+            conn.close()
+            with lock:
+                results.append((latencies, failures))
+
+        threads = [
+            threading.Thread(target=client)
+            for _ in range(options['concurrency'])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(
+            latency for client_latencies, _ in results
+            for latency in client_latencies
+        )
+        failures = sum(client_failures for _, client_failures in results)
+        if not latencies:
+            self.stderr.write(f'No successful request ({failures} failed).')
+            return
+
+        def percentile(p):
+            return latencies[int((len(latencies) - 1) * p)] * 1000
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(latencies)} requests in {elapsed:.1f}s from '
+            f'{options["concurrency"]} clients: '
+            f'{len(latencies) / elapsed:.1f} req/s, '
+            f'median {statistics.median(latencies) * 1000:.1f} ms, '
+            f'p95 {percentile(0.95):.1f} ms, p99 {percentile(0.99):.1f} ms, '
+            f'{failures} failed.'
+        ))
+
+    def _read(self, response, slow_read):
+        if not slow_read:
+            response.read()
+            return
+        while response.read(1024):
+            time.sleep(slow_read)
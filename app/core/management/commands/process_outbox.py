@@ -0,0 +1,71 @@
+"""Django command to send the emails queued in the outbox"""
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.outbox import MAX_ATTEMPTS, claim_messages, send_batch
+
+
+class Command(BaseCommand):
+    """Django command to drain the email outbox"""
+    help = 'Send the queued emails in batches, retrying failures later.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Messages claimed at a time.',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Threads sending a batch, each over its own connection.',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help='Seconds to wait when no message is due.',
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=MAX_ATTEMPTS,
+            help='Attempts before a message is marked failed.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once no message is due instead of polling.',
+        )
+
+    def send(self, messages):
+        try:
+            return send_batch(messages, self.max_attempts)
+        finally:
+            # Each pool thread has its own database connection.
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        concurrency = options['concurrency']
+        self.max_attempts = options['max_attempts']
+        statuses = Counter()
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix='outbox',
+        ) as pool:
+            while True:
+                messages = claim_messages(options['batch_size'])
+                if not messages:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                # One slice of the batch per thread.
+                slices = [messages[i::concurrency] for i in range(concurrency)]
+                for sent in pool.map(self.send, filter(None, slices)):
+                    statuses.update(sent)
+
+        summary = ', '.join(
+            f'{count} {status}' for status, count in sorted(statuses.items())
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed outbox messages: {summary or "none"}.'
+        ))
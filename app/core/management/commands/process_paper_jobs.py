@@ -0,0 +1,67 @@
+"""Django command to run the background processing of papers"""
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from paper.jobs import MAX_ATTEMPTS, claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    """Django command to process queued paper jobs"""
+    help = (
+        'Extract the page count, text and thumbnail of submitted papers, '
+        'polling the job queue.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Jobs run at the same time, each in its own thread.',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help='Seconds to wait when no job is due.',
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=MAX_ATTEMPTS,
+            help='Attempts before a job is marked failed.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once no job is due instead of polling.',
+        )
+
+    def run(self, job):
+        try:
+            return run_job(job, self.max_attempts)
+        finally:
+            # Each pool thread has its own connection.
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        concurrency = options['concurrency']
+        self.max_attempts = options['max_attempts']
+        statuses = Counter()
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix='paper-job',
+        ) as pool:
+            while True:
+                jobs = claim_jobs(concurrency)
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                statuses.update(pool.map(self.run, jobs))
+
+        summary = ', '.join(
+            f'{count} {status}' for status, count in sorted(statuses.items())
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed paper jobs: {summary or "none"}.'
+        ))
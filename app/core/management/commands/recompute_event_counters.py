@@ -0,0 +1,28 @@
+"""Django command to repair the denormalized counters on events"""
+from django.core.management.base import BaseCommand
+
+from core.models import Event
+from event.counters import recompute_counters
+
+
+class Command(BaseCommand):
+    """Django command to recompute event counters"""
+    help = 'Recount registrations, seats and papers stored on events.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event', type=int, action='append', dest='event_ids',
+            help='Only recompute this event (can be repeated).',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        events = Event.objects.all()
+        if options['event_ids']:
+            events = events.filter(pk__in=options['event_ids'])
+
+        changed = recompute_counters(events, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed event counters, {changed} event(s) repaired.'
+        ))
@@ -0,0 +1,58 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:35
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_topics(apps, schema_editor):
+    """Point events at the oldest topic of each name, drop the others."""
+    Topic = apps.get_model('core', 'Topic')
+    Event = apps.get_model('core', 'Event')
+    EventTopic = Event.topics.through
+
+    duplicates = Topic.objects.values('name').annotate(
+        count=Count('id'), keep=Min('id'),
+    ).filter(count__gt=1)
+    for row in duplicates:
+        extra_ids = list(
+            Topic.objects.filter(name=row['name'])
+            .exclude(id=row['keep'])
+            .values_list('id', flat=True)
+        )
+        event_ids = set(
+            EventTopic.objects.filter(topic_id__in=extra_ids)
+            .values_list('event_id', flat=True)
+        )
+        linked = set(
+            EventTopic.objects.filter(topic_id=row['keep'])
+            .values_list('event_id', flat=True)
+        )
+        EventTopic.objects.bulk_create([
+            EventTopic(event_id=event_id, topic_id=row['keep'])
+            for event_id in event_ids - linked
+        ])
+        Topic.objects.filter(id__in=extra_ids).delete()
+
+    if schema_editor.connection.vendor == 'postgresql':
+        # The deletes queue deferred foreign key checks, and PostgreSQL
+        # refuses to ALTER a table with pending trigger events in the
+        # same transaction: run them now.
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_topics, migrations.RunPython.noop,
+        ),
+        migrations.AlterField(
+            model_name='topic',
+            name='name',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
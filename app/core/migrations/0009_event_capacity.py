@@ -0,0 +1,48 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:38
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_taken_seats(apps, schema_editor):
+    """Existing registrations are all confirmed and hold a seat."""
+    Event = apps.get_model('core', 'Event')
+    EventRegistration = apps.get_model('core', 'EventRegistration')
+
+    counts = EventRegistration.objects.values('event_id').annotate(
+        count=Count('id'),
+    )
+    for row in counts:
+        Event.objects.filter(id=row['event_id']).update(
+            seats_taken=row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_unique_topic_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum confirmed registrations, empty for unlimited', null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0, help_text='Confirmed registrations, kept by conditional updates'),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='status',
+            field=models.CharField(choices=[('confirmed', 'Confirmed'), ('waitlisted', 'Waitlisted')], default='confirmed', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['event', 'status', 'created_at'], name='core_eventr_event_i_65ae6f_idx'),
+        ),
+        migrations.RunPython(count_taken_seats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:40
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    """Back-fill the counters from existing registrations and papers."""
+    Event = apps.get_model('core', 'Event')
+    EventRegistration = apps.get_model('core', 'EventRegistration')
+    Paper = apps.get_model('core', 'Paper')
+
+    rows = EventRegistration.objects.values('event_id', 'plan').annotate(
+        count=Count('id'),
+    )
+    for row in rows:
+        Event.objects.filter(id=row['event_id']).update(
+            **{f"registrations_{row['plan']}": row['count']}
+        )
+
+    rows = Paper.objects.values('event_id', 'status').annotate(
+        count=Count('id'),
+    )
+    for row in rows:
+        Event.objects.filter(id=row['event_id']).update(
+            **{f"papers_{row['status']}": row['count']}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_event_capacity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='papers_accepted',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='papers_rejected',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='papers_submitted',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='registrations_general',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='registrations_student',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='registrations_workshop',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
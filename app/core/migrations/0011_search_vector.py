@@ -0,0 +1,80 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:46
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Weighted fields of each table, mirrored by core.search.SEARCH_FIELDS.
+SEARCH_TABLES = {
+    'core_event': {'title': 'A', 'description': 'B', 'location': 'C'},
+    'core_paper': {'title': 'A', 'keywords': 'B', 'abstract': 'C'},
+}
+
+
+def vector_sql(fields, row):
+    return ' || '.join(
+        f"setweight(to_tsvector('english', coalesce({row}{field}, '')), "
+        f"'{weight}')"
+        for field, weight in fields.items()
+    )
+
+
+def create_search_triggers(apps, schema_editor):
+    """Keep search_vector current with triggers and index it with GIN."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, fields in SEARCH_TABLES.items():
+        schema_editor.execute(f"""
+            CREATE FUNCTION {table}_search_vector_update()
+            RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {vector_sql(fields, 'NEW.')};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        schema_editor.execute(f"""
+            CREATE TRIGGER {table}_search_vector
+            BEFORE INSERT OR UPDATE OF {', '.join(fields)} ON {table}
+            FOR EACH ROW EXECUTE PROCEDURE {table}_search_vector_update()
+        """)
+        schema_editor.execute(
+            f'UPDATE {table} SET search_vector = {vector_sql(fields, "")}'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX {table}_search_vector_gin '
+            f'ON {table} USING gin (search_vector)'
+        )
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_TABLES:
+        schema_editor.execute(f'DROP INDEX {table}_search_vector_gin')
+        schema_editor.execute(
+            f'DROP TRIGGER {table}_search_vector ON {table}'
+        )
+        schema_editor.execute(
+            f'DROP FUNCTION {table}_search_vector_update()'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_event_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='paper',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
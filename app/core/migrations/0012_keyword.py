@@ -0,0 +1,72 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:48
+
+import re
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def split_keywords(text):
+    # Same rules as paper.serializers.split_keywords.
+    names = (
+        ' '.join(part.split()).lower()[:100]
+        for part in re.split(r'[,;]', text or '')
+    )
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def link_keywords(Keyword, Through, batch):
+    names = {name for _, names in batch for name in names}
+    Keyword.objects.bulk_create(
+        [Keyword(name=name) for name in names], ignore_conflicts=True,
+    )
+    ids = dict(
+        Keyword.objects.filter(name__in=names).values_list('name', 'id')
+    )
+    Through.objects.bulk_create([
+        Through(paper_id=paper_id, keyword_id=ids[name])
+        for paper_id, names in batch for name in names
+    ], ignore_conflicts=True)
+
+
+def split_paper_keywords(apps, schema_editor):
+    """Create keyword tags from the keywords text of existing papers."""
+    Paper = apps.get_model('core', 'Paper')
+    Keyword = apps.get_model('core', 'Keyword')
+    Through = Paper.keyword_tags.through
+
+    batch = []
+    rows = Paper.objects.values_list('id', 'keywords').iterator(BATCH_SIZE)
+    for paper_id, keywords in rows:
+        batch.append((paper_id, split_keywords(keywords)))
+        if len(batch) == BATCH_SIZE:
+            link_keywords(Keyword, Through, batch)
+            batch = []
+    if batch:
+        link_keywords(Keyword, Through, batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Keyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='paper',
+            name='keyword_tags',
+            field=models.ManyToManyField(blank=True, related_name='papers', to='core.Keyword'),
+        ),
+        migrations.RunPython(
+            split_paper_keywords, migrations.RunPython.noop,
+        ),
+    ]
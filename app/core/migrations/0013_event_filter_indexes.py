@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-17 01:50
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_keyword'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_date', 'end_date'], name='core_event_start_d_05b9cd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(django.db.models.functions.text.Upper('location'), name='core_event_location_upper'),
+        ),
+        migrations.AddIndex(
+            model_name='eventschedule',
+            index=models.Index(fields=['date'], name='core_events_date_b091b5_idx'),
+        ),
+    ]
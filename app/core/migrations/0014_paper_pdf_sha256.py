@@ -0,0 +1,22 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_event_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paper',
+            name='pdf_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='paper',
+            index=models.Index(fields=['pdf_file'], name='core_paper_pdf_fil_dfa67d_idx'),
+        ),
+    ]
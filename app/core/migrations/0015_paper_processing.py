@@ -0,0 +1,90 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:07
+
+import core.models
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+# Weighted fields of core_paper before and after this migration, mirrored
+# by core.search.SEARCH_FIELDS.
+OLD_FIELDS = {'title': 'A', 'keywords': 'B', 'abstract': 'C'}
+NEW_FIELDS = {**OLD_FIELDS, 'pdf_text': 'D'}
+
+
+def vector_sql(fields, row):
+    return ' || '.join(
+        f"setweight(to_tsvector('english', coalesce({row}{field}, '')), "
+        f"'{weight}')"
+        for field, weight in fields.items()
+    )
+
+
+def replace_paper_trigger(fields):
+    def replace(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute(f"""
+            CREATE OR REPLACE FUNCTION core_paper_search_vector_update()
+            RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {vector_sql(fields, 'NEW.')};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        schema_editor.execute(
+            'DROP TRIGGER core_paper_search_vector ON core_paper'
+        )
+        schema_editor.execute(f"""
+            CREATE TRIGGER core_paper_search_vector
+            BEFORE INSERT OR UPDATE OF {', '.join(fields)} ON core_paper
+            FOR EACH ROW EXECUTE PROCEDURE core_paper_search_vector_update()
+        """)
+    return replace
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_paper_pdf_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paper',
+            name='page_count',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='paper',
+            name='pdf_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='paper',
+            name='thumbnail',
+            field=models.ImageField(editable=False, null=True, upload_to=core.models.paper_thumbnail_file_path),
+        ),
+        migrations.CreateModel(
+            name='PaperJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='core.paper')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='paperjob',
+            index=models.Index(fields=['status', 'run_after'], name='core_paperj_status_582199_idx'),
+        ),
+        migrations.RunPython(
+            replace_paper_trigger(NEW_FIELDS),
+            replace_paper_trigger(OLD_FIELDS),
+        ),
+    ]
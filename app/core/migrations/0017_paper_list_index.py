@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_outbox_message'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='paper',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='paper',
+            index=models.Index(fields=['event', 'created_at', 'id'], name='core_paper_event_i_bb1362_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_paper_list_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventregistration',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
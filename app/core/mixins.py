@@ -0,0 +1,79 @@
+"""Reusable viewset mixins."""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """Answer If-None-Match / If-Modified-Since before serializing.
+
+    Validators come from the ``last_modified_field`` of the rows: the
+    value of the requested row for detail actions, and the latest value
+    plus the row count of the filtered queryset for lists. A matching
+    request gets a 304 without the handler (and its serializer) running.
+
+    Rows the serializer embeds through relations are covered by listing
+    their timestamps in ``related_last_modified_fields``.
+    """
+    last_modified_field = 'updated_at'
+    related_last_modified_fields = ()
+
+    def _validator_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        return queryset.prefetch_related(None).order_by()
+
+    def get_conditional_validators(self):
+        """Return (etag, last_modified) of the response, or None."""
+        queryset = self._validator_queryset()
+        fields = (self.last_modified_field, *self.related_last_modified_fields)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            row = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).values_list(*fields).first()
+            if row is None:
+                return None
+            last_modified = max(value for value in row if value is not None)
+            state = tuple(
+                value and value.isoformat() for value in row
+            )
+        else:
+            # Lists only get an ETag: deleting a row doesn't move the
+            # latest timestamp, but it does change the count.
+            stats = queryset.aggregate(
+                *(Max(field) for field in fields), count=Count('pk'),
+            )
+            last_modified = None
+            state = tuple(sorted(stats.items()))
+
+        raw = repr((
+            self.request.path,
+            sorted(self.request.query_params.lists()),
+            self.request.accepted_media_type,
+            state,
+        ))
+        etag = f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Return a 304 if the client's copy is current, else call handler."""
+        validators = self.get_conditional_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        timestamp = None
+        if last_modified is not None:
+            timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp,
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
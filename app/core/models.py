@@ -3,7 +3,10 @@ import uuid
 import os
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
+from django.db.models.functions import Upper
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -66,6 +69,37 @@ class Event(models.Model):
     start_date = models.DateField()
     end_date = models.DateField()
     topics = models.ManyToManyField('Topic')
+    capacity = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Maximum confirmed registrations, empty for unlimited",
+    )
+    seats_taken = models.PositiveIntegerField(
+        default=0,
+        help_text="Confirmed registrations, kept by conditional updates",
+    )
+
+    # Denormalized counters for dashboards, maintained by event.counters
+    # and repaired by the recompute_event_counters command.
+    registrations_general = models.PositiveIntegerField(default=0)
+    registrations_student = models.PositiveIntegerField(default=0)
+    registrations_workshop = models.PositiveIntegerField(default=0)
+    papers_submitted = models.PositiveIntegerField(default=0)
+    papers_accepted = models.PositiveIntegerField(default=0)
+    papers_rejected = models.PositiveIntegerField(default=0)
+
+    # Maintained by a PostgreSQL trigger and GIN indexed, see core.search.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Date range filters (start_after, end_before, upcoming).
+            models.Index(fields=["start_date", "end_date"]),
+            # Case-insensitive ?location= lookups compare UPPER(location).
+            models.Index(Upper("location"), name="core_event_location_upper"),
+        ]
 
     def __str__(self):
         return self.title
@@ -91,12 +125,23 @@ class EventSchedule(models.Model):
     class Meta:
         unique_together = ("event", "date")
         ordering = ["date"] 
+        indexes = [
+            models.Index(fields=["date"]),
+        ]
 
     def __str__(self):
         return f"{self.event.title} - {self.title}"
 class Topic(models.Model):
     """Topic object"""
-    name = models.CharField(max_length=255)
+    name = models.CharField(max_length=255, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+class Keyword(models.Model):
+    """Normalized paper keyword"""
+    name = models.CharField(max_length=100, unique=True)
 
     def __str__(self):
         return self.name
@@ -107,6 +152,16 @@ def paper_pdf_file_path(instance, filename):
     filename = f"{uuid.uuid4()}{ext}"
     return os.path.join("uploads", "papers", filename)
 
+def paper_pdf_content_path(sha256):
+    """Return the content-addressed path of a paper PDF."""
+    return os.path.join("uploads", "papers", sha256[:2], f"{sha256}.pdf")
+
+def paper_thumbnail_file_path(instance, filename):
+    """Generate file path for paper thumbnails, shared by identical PDFs."""
+    ext = os.path.splitext(filename)[1]
+    name = instance.pdf_sha256 or uuid.uuid4()
+    return os.path.join("uploads", "thumbnails", f"{name}{ext}")
+
 class Paper(models.Model):
     """Object paper."""
 
@@ -135,11 +190,29 @@ class Paper(models.Model):
     title = models.CharField(max_length=255)
     abstract = models.TextField()
     keywords = models.CharField(max_length=255)
+    # Parsed from keywords when the paper is submitted, for filtering.
+    keyword_tags = models.ManyToManyField(
+        Keyword,
+        related_name="papers",
+        blank=True,
+    )
     paper_type = models.CharField(
         max_length=20,
         choices=PaperType.choices
     )
     pdf_file = models.FileField(null=True, upload_to=paper_pdf_file_path)
+    # SHA-256 of the PDF, which is stored under paper_pdf_content_path so
+    # papers with the same content share one file.
+    pdf_sha256 = models.CharField(max_length=64, blank=True, editable=False)
+
+    # Filled from the PDF by the background jobs, see paper.jobs.
+    page_count = models.PositiveIntegerField(null=True, editable=False)
+    pdf_text = models.TextField(blank=True, editable=False)
+    thumbnail = models.ImageField(
+        null=True,
+        editable=False,
+        upload_to=paper_thumbnail_file_path,
+    )
 
     status = models.CharField(
         max_length=20,
@@ -148,18 +221,102 @@ class Paper(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Maintained by a PostgreSQL trigger and GIN indexed, see core.search.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
         indexes = [
             models.Index(fields= ["event", "status"]),
+            # The paper list of an event, see PaperCursorPagination.
+            models.Index(fields=["event", "created_at", "id"]),
             models.Index(fields=["author"]),
+            # Reference counting of the shared PDF files.
+            models.Index(fields=["pdf_file"]),
         ]
 
     def __str__(self):
         return f"{self.title} - {self.author.email}"
 
 
+class PaperJob(models.Model):
+    """Background processing of a paper's PDF, run by process_paper_jobs."""
+
+    class Status(models.TextChoices):
+        """Status of a job."""
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    paper = models.ForeignKey(
+        Paper,
+        on_delete=models.CASCADE,
+        related_name="jobs",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Not run before this time, pushed back after each failed attempt.
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return f"{self.paper_id} - {self.status}"
+
+
+class OutboxMessage(models.Model):
+    """Email written with the change it reports, sent by process_outbox."""
+
+    class Status(models.TextChoices):
+        """Status of a message."""
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Sending"
+        DONE = "done", "Sent"
+        FAILED = "failed", "Failed"
+
+    # Identifies what the message reports, so it is queued and sent once.
+    key = models.CharField(max_length=255, unique=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    recipients = models.JSONField(default=list)
+
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return f"{self.key} - {self.status}"
+
+
 class EventRegistration(models.Model):
     """Represents a user's registration to an event"""
 
@@ -168,6 +325,10 @@ class EventRegistration(models.Model):
         STUDENT = "student", "Student"
         WORKSHOP = "workshop", "Workshop Participant"
 
+    class Status(models.TextChoices):
+        CONFIRMED = "confirmed", "Confirmed"
+        WAITLISTED = "waitlisted", "Waitlisted"
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -189,11 +350,22 @@ class EventRegistration(models.Model):
         help_text="Price at the time of registration"
     )
 
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.CONFIRMED,
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("user", "event")
         ordering = ["-created_at"]
+        indexes = [
+            # Oldest waitlisted registration of an event, for promotion.
+            models.Index(fields=["event", "status", "created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.user} → {self.event} ({self.plan})"
@@ -0,0 +1,59 @@
+"""Emails about registrations, paper decisions and contact messages.
+
+Each function queues its email in the outbox (see core.outbox): call it
+inside the transaction of the change it reports.
+"""
+from django.contrib.auth import get_user_model
+
+from core.models import EventRegistration
+from core.outbox import enqueue_email
+
+
+def notify_registration(registration):
+    """Tell a user their registration is confirmed or waitlisted."""
+    event = registration.event
+    if registration.status == EventRegistration.Status.CONFIRMED:
+        state = 'confirmed'
+    else:
+        state = 'on the waiting list; you will be told if a seat frees up'
+    enqueue_email(
+        # The save time tells apart later changes back to the same status.
+        key=(
+            f'registration:{registration.pk}:{registration.status}:'
+            f'{registration.updated_at.isoformat()}'
+        ),
+        subject=f'Your registration to {event.title}',
+        body=(
+            f'Your {registration.plan} registration to {event.title} '
+            f'({event.start_date} - {event.end_date}, {event.location}) '
+            f'is {state}.'
+        ),
+        recipients=[registration.user.email],
+    )
+
+
+def notify_paper_decision(paper):
+    """Tell an author their paper's new status."""
+    enqueue_email(
+        # The save time tells apart later changes back to the same status.
+        key=f'paper:{paper.pk}:{paper.status}:{paper.updated_at.isoformat()}',
+        subject=f'Your paper "{paper.title}" was {paper.status}',
+        body=(
+            f'Your paper "{paper.title}" submitted to {paper.event.title} '
+            f'was {paper.status}.'
+        ),
+        recipients=[paper.author.email],
+    )
+
+
+def notify_contact_message(contact):
+    """Forward a contact message to the staff."""
+    staff_emails = get_user_model().objects.filter(
+        is_staff=True, is_active=True,
+    ).values_list('email', flat=True)
+    enqueue_email(
+        key=f'contact:{contact.pk}',
+        subject=f'Contact message: {contact.subject}',
+        body=f'From {contact.user.email}:\n\n{contact.message}',
+        recipients=staff_emails,
+    )
@@ -0,0 +1,99 @@
+"""Transactional outbox of the emails sent by the API.
+
+An email is a row written in the same transaction as the change it
+reports, so it exists if and only if that change commits, and no request
+waits for an SMTP server: the process_outbox command sends the rows
+later, in batches.
+"""
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.utils import DNS_NAME
+
+from core.models import OutboxMessage
+from core.queue import claim, finish, renew
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+# Delay before the first retry, doubled after each failed attempt.
+RETRY_DELAY = timedelta(minutes=1)
+# A message sending for longer was left by a worker that died. The lease
+# is renewed before each message of a batch (see send_batch), so it only
+# has to cover one send, at most a few EMAIL_TIMEOUTs.
+LEASE = timedelta(minutes=5)
+
+
+def enqueue_email(key, subject, body, recipients):
+    """Add an email to the outbox, unless one with key already is.
+
+    Call inside the transaction of the change the email reports.
+    """
+    recipients = sorted(set(filter(None, recipients)))
+    if not recipients:
+        return
+    # A single INSERT; the unique key makes a repeated call a no-op.
+    OutboxMessage.objects.bulk_create([
+        OutboxMessage(
+            key=key, subject=subject, body=body, recipients=recipients,
+        ),
+    ], ignore_conflicts=True)
+
+
+def claim_messages(limit):
+    """Mark up to limit due messages as sending and return them."""
+    return claim(OutboxMessage.objects.all(), limit, LEASE)
+
+
+def build_email(message, connection=None):
+    """Return the EmailMessage of an outbox message.
+
+    Its Message-ID derives from the key: a message sent again after a
+    worker died before recording it can be recognized as a duplicate.
+    """
+    digest = hashlib.sha256(message.key.encode()).hexdigest()[:32]
+    return EmailMessage(
+        subject=message.subject,
+        body=message.body,
+        to=message.recipients,
+        connection=connection,
+        headers={'Message-ID': f'<{digest}@{DNS_NAME}>'},
+    )
+
+
+def send_batch(messages, max_attempts=MAX_ATTEMPTS):
+    """Send claimed messages over one connection, return their statuses.
+
+    A message whose lease ran out while the ones before it were sent is
+    skipped, and has no status: another worker claimed it again.
+    """
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.exception('Opening the email connection failed')
+        return [
+            finish(message, exc, max_attempts, RETRY_DELAY)
+            for message in messages
+        ]
+
+    statuses = []
+    try:
+        for message in messages:
+            if not renew(message, LEASE):
+                continue
+            error = None
+            try:
+                build_email(message, connection).send()
+            except Exception as exc:
+                logger.exception('Sending outbox message %s failed',
+                                 message.key)
+                error = exc
+            statuses.append(
+                finish(message, error, max_attempts, RETRY_DELAY)
+            )
+    finally:
+        connection.close()
+    return statuses
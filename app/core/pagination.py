@@ -0,0 +1,183 @@
+"""Cursor pagination shared by the list endpoints."""
+import json
+from base64 import b64decode
+from datetime import date, datetime, time
+from decimal import Decimal
+from urllib import parse
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    _reverse_ordering,
+)
+
+TIEBREAKER = 'id'
+
+
+def _is_unique(model, field_name):
+    """Return whether a model field holds a different value on each row."""
+    try:
+        return model._meta.get_field(field_name).unique
+    except FieldDoesNotExist:
+        return False
+
+
+def _position_value(value):
+    """Return value as JSON, without losing precision (unlike Django's)."""
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def keyset_after(ordering, position):
+    """Return the Q of the rows after position in ordering.
+
+    (a, b) after (x, y) is ``a > x OR (a = x AND b > y)``, with < for
+    descending fields. The first field's bound is repeated on its own so
+    the database can range-scan an index on the ordering.
+    """
+    condition = None
+    equal = {}
+    for order, value in zip(ordering, position):
+        field = order.lstrip('-')
+        lookup = 'lt' if order.startswith('-') else 'gt'
+        term = Q(**equal, **{f'{field}__{lookup}': value})
+        condition = term if condition is None else condition | term
+        equal[field] = value
+
+    first = ordering[0]
+    bound = 'lte' if first.startswith('-') else 'gte'
+    return Q(**{f'{first.lstrip("-")}__{bound}': position[0]}) & condition
+
+
+class StandardCursorPagination(CursorPagination):
+    """Keyset pagination on the newest rows first.
+
+    The cursor holds the values of every ordering field of the last row
+    seen, and the ordering always ends with a unique field, so pages are
+    fetched with ``WHERE (a, id) < (x, y)`` instead of OFFSET: deep pages
+    cost the same as the first one, and rows sharing a value are neither
+    skipped nor repeated, however many there are.
+    """
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        """Put the best search matches first and make the ordering total."""
+        ordering = super().get_ordering(request, queryset, view)
+        if 'search_rank' in queryset.query.annotations:
+            ordering = ('-search_rank',) + ordering
+
+        last = ordering[-1]
+        if not _is_unique(queryset.model, last.lstrip('-')):
+            descending = last.startswith('-')
+            ordering += ('-' + TIEBREAKER if descending else TIEBREAKER,)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        position = self.cursor.position if self.cursor else None
+
+        ordering = self.ordering
+        if reverse:
+            ordering = _reverse_ordering(ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(keyset_after(ordering, position))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # One extra row tells whether there is a page after this one.
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _link(self, reverse, instance):
+        if instance is not None:
+            position = self._get_position_from_instance(
+                instance, self.ordering,
+            )
+        else:
+            # Empty page: keep the position the request came with.
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=reverse, position=json.dumps(position),
+        ))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self._link(False, self.page[-1] if self.page else None)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self._link(True, self.page[0] if self.page else None)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            position = json.loads(tokens['p'][0])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field_name = order.lstrip('-')
+            if isinstance(instance, dict):
+                value = instance[field_name]
+            else:
+                value = getattr(instance, field_name)
+            values.append(_position_value(value))
+        return values
+
+
+class TopicCursorPagination(StandardCursorPagination):
+    """Topics are listed by name, larger pages since rows are tiny."""
+    ordering = '-name'
+    page_size = 100
+    max_page_size = 500
+
+
+class PaperCursorPagination(StandardCursorPagination):
+    """Papers are listed by submission date."""
+    ordering = '-created_at'
@@ -0,0 +1,76 @@
+"""Helpers of the database-backed queues (paper jobs, email outbox).
+
+A queue is a model with the status, attempts, run_after, locked_at and
+last_error fields of PaperJob: workers claim due rows, run them outside
+of any request and record the outcome, retrying failures later.
+"""
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+def claim(queryset, limit, lease):
+    """Mark up to limit due rows of queryset as running and return them.
+
+    Rows are locked with SKIP LOCKED, so concurrent workers never claim
+    the same row. Rows running for longer than lease were left by a
+    worker that died and are claimed again.
+    """
+    Status = queryset.model.Status
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            queryset.select_for_update(skip_locked=True).filter(
+                Q(status=Status.PENDING, run_after__lte=now)
+                | Q(status=Status.RUNNING, locked_at__lt=now - lease)
+            ).order_by("run_after", "id").values_list("id", flat=True)[:limit]
+        )
+        queryset.model.objects.filter(id__in=ids).update(
+            status=Status.RUNNING,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+    return list(queryset.filter(id__in=ids).order_by("run_after", "id"))
+
+
+def renew(job, lease):
+    """Extend the lease of a claimed row, return whether it still holds it.
+
+    False when the lease had run out and another worker claimed the row
+    again, in which case that worker runs it.
+    """
+    Status = type(job).Status
+    now = timezone.now()
+    renewed = type(job).objects.filter(
+        pk=job.pk, status=Status.RUNNING, locked_at=job.locked_at,
+        locked_at__gte=now - lease,
+    ).update(locked_at=now)
+    job.locked_at = now
+    return bool(renewed)
+
+
+def finish(job, error, max_attempts, retry_delay):
+    """Record the outcome of a claimed row and return its new status.
+
+    A failed row runs again after retry_delay, doubled after each
+    attempt, until it has failed max_attempts times.
+    """
+    Status = type(job).Status
+    if error is None:
+        job.status = Status.DONE
+        job.last_error = ""
+    else:
+        job.last_error = f"{type(error).__name__}: {error}"
+        if job.attempts >= max_attempts:
+            job.status = Status.FAILED
+        else:
+            job.status = Status.PENDING
+            job.run_after = (
+                timezone.now() + retry_delay * 2 ** (job.attempts - 1)
+            )
+
+    job.locked_at = None
+    job.save(update_fields=[
+        "status", "run_after", "locked_at", "last_error", "updated_at",
+    ])
+    return job.status
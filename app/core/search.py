@@ -0,0 +1,125 @@
+"""Full-text search over events and papers.
+
+On PostgreSQL every row carries a ``search_vector`` column, filled by
+triggers (see migration 0011) and covered by a GIN index, so a query is
+one index scan ranked with ts_rank. Other backends, like the SQLite test
+runs, use an in-process inverted index built from the same fields and
+rebuilt whenever the table changes.
+"""
+import re
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import Case, Count, F, FloatField, Max, Value, When
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'english'
+
+# Weighted fields of each model, mirrored by the triggers of migrations
+# 0011 and 0015 (pdf_text is the text extracted from the PDF).
+SEARCH_FIELDS = {
+    'core.Event': {'title': 'A', 'description': 'B', 'location': 'C'},
+    'core.Paper': {
+        'title': 'A', 'keywords': 'B', 'abstract': 'C', 'pdf_text': 'D',
+    },
+}
+
+# Default weights of ts_rank.
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+# Common words the english configuration ignores.
+STOP_WORDS = frozenset((
+    'a an and are as at be but by for from if in into is it no not of on '
+    'or such that the their then there these they this to was will with'
+).split())
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Return the lowercase search terms of text."""
+    return [
+        term for term in TOKEN_RE.findall(text.lower())
+        if term not in STOP_WORDS
+    ]
+
+
+class InvertedIndex:
+    """Map each term to the rows containing it and their weighted score."""
+
+    def __init__(self, rows, fields):
+        self.postings = defaultdict(dict)
+        weights = [WEIGHTS[weight] for weight in fields.values()]
+        for pk, *values in rows:
+            for weight, value in zip(weights, values):
+                for term in tokenize(value or ''):
+                    scores = self.postings[term]
+                    scores[pk] = scores.get(pk, 0.0) + weight
+
+    def search(self, query):
+        """Return {pk: score} of the rows containing every term of query."""
+        terms = set(tokenize(query))
+        if not terms:
+            return {}
+        postings = sorted(
+            (self.postings.get(term, {}) for term in terms), key=len,
+        )
+        matches = dict(postings[0])
+        for scores in postings[1:]:
+            matches = {
+                pk: score + scores[pk]
+                for pk, score in matches.items() if pk in scores
+            }
+        return matches
+
+
+_indexes = {}
+
+
+def get_index(model, using):
+    """Return the inverted index of model, rebuilding it if rows changed."""
+    manager = model._default_manager.using(using)
+    state = manager.aggregate(last=Max('updated_at'), count=Count('pk'))
+    key = (using, model._meta.label)
+    cached = _indexes.get(key)
+    if cached is not None and cached[0] == state:
+        return cached[1]
+
+    fields = SEARCH_FIELDS[model._meta.label]
+    index = InvertedIndex(
+        manager.values_list('pk', *fields).iterator(), fields,
+    )
+    _indexes[key] = (state, index)
+    return index
+
+
+def search(queryset, query):
+    """Filter queryset to rows matching query, annotated with search_rank."""
+    if connections[queryset.db].vendor == 'postgresql':
+        search_query = SearchQuery(
+            query, config=SEARCH_CONFIG, search_type='websearch',
+        )
+        # ts_rank is a real: as a double it round-trips through cursors.
+        return queryset.filter(search_vector=search_query).annotate(
+            search_rank=Cast(
+                SearchRank(F('search_vector'), search_query), FloatField(),
+            ),
+        )
+
+    scores = get_index(queryset.model, queryset.db).search(query)
+    # Scores are sums of a few weights, so grouping rows by score keeps
+    # the CASE short however many rows match.
+    by_score = defaultdict(list)
+    for pk, score in scores.items():
+        by_score[score].append(pk)
+    return queryset.filter(pk__in=list(scores)).annotate(
+        search_rank=Case(
+            *[
+                When(pk__in=pks, then=Value(score))
+                for score, pks in by_score.items()
+            ],
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    )
@@ -0,0 +1,23 @@
+"""Signal handlers for core models."""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from core.authentication import invalidate_token, invalidate_user
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    """Drop a deleted token from the authentication cache."""
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def forget_changed_user(sender, instance, **kwargs):
+    """Drop cached tokens of a user that was updated or deleted."""
+    token_keys = list(Token.objects.filter(
+        user_id=instance.pk
+    ).values_list('key', flat=True))
+    invalidate_user(instance.pk, token_keys)
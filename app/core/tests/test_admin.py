@@ -1,9 +1,16 @@
 """Test for the Django admin modification"""
+from datetime import date
+
+from django.contrib import admin
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.test import Client
 
+from core import models
+from core.admin import EventAdmin
+from event.counters import take_seat
+
 class AdminSiteTests(TestCase):
     """Tests for django admin"""
     
@@ -41,4 +48,23 @@ class AdminSiteTests(TestCase):
         url = reverse('admin:core_user_add')
         res = self.client.get(url)
 
-        self.assertEqual(res.status_code, 200)
\ No newline at end of file
+        self.assertEqual(res.status_code, 200)
+
+    def test_edit_event_keeps_counters(self):
+        """Test saving an event in the admin doesn't overwrite counters."""
+        event = models.Event.objects.create(
+            user=self.user, title='Event', description='Description',
+            location='Oran', start_date=date(2025, 12, 12),
+            end_date=date(2025, 12, 31),
+        )
+        stale = models.Event.objects.get(pk=event.pk)
+        take_seat(event.pk)
+        stale.title = 'New title'
+
+        EventAdmin(models.Event, admin.site).save_model(
+            None, stale, None, change=True,
+        )
+
+        event.refresh_from_db()
+        self.assertEqual(event.title, 'New title')
+        self.assertEqual(event.seats_taken, 1)
@@ -0,0 +1,157 @@
+"""Tests for the async read path."""
+import asyncio
+import json
+import threading
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import async_views
+from core.models import Event
+from event.tests.helpers import create_event
+from event.views import EventViewSet, TopicViewSet
+
+ASYNC_READS = {'ENABLED': True, 'MAX_WORKERS': 2}
+
+
+class AsyncReadViewTests(TestCase):
+    """Test views are only made async when enabled."""
+
+    def test_disabled_returns_sync_view(self):
+        """Test the default is the plain sync view."""
+        view = TopicViewSet.as_view({'get': 'list'})
+
+        self.assertFalse(asyncio.iscoroutinefunction(view))
+
+    @override_settings(ASYNC_READS=ASYNC_READS)
+    def test_enabled_returns_async_view(self):
+        """Test enabled views are coroutines keeping the view attributes."""
+        view = TopicViewSet.as_view({'get': 'list'})
+
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        self.assertTrue(view.csrf_exempt)
+        self.assertIs(view.cls, TopicViewSet)
+
+    @override_settings(ASYNC_READS=ASYNC_READS)
+    def test_write_uses_thread_sensitive_path(self):
+        """Test unsafe methods do not go through the read pool."""
+        admin = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='testpass123',
+        )
+        view = EventViewSet.as_view({'post': 'create'})
+        request = APIRequestFactory().post('/events/', {
+            'title': 'Event', 'description': 'Description',
+            'location': 'Oran', 'start_date': '2025-12-12',
+            'end_date': '2025-12-13',
+        }, format='json')
+        force_authenticate(request, user=admin)
+
+        with mock.patch.object(async_views, 'run_read') as run_read:
+            response = async_to_sync(view)(request)
+
+        run_read.assert_not_called()
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Event.objects.filter(title='Event').exists())
+
+
+@override_settings(ASYNC_READS=ASYNC_READS)
+class AsyncReadPoolTests(TransactionTestCase):
+    """Test reads run in the pool and come back rendered."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123',
+        )
+
+    def test_list_runs_in_pool(self):
+        """Test a list request is served from a pool thread."""
+        create_event(user=self.user, title='Summit')
+        view = EventViewSet.as_view({'get': 'list'})
+        threads = []
+        run_read = async_views.run_read
+
+        def record(*args):
+            threads.append(threading.current_thread().name)
+            return run_read(*args)
+
+        with mock.patch.object(async_views, 'run_read', side_effect=record):
+            response = async_to_sync(view)(
+                APIRequestFactory().get('/events/'),
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(threads[0].startswith('async-read'))
+        data = json.loads(response.content)
+        self.assertEqual(data['results'][0]['title'], 'Summit')
+
+    def test_connection_upkeep_in_pool(self):
+        """Test pool threads check and mark their own connections."""
+        view = EventViewSet.as_view({'get': 'list'})
+        threads = []
+
+        def record(**kwargs):
+            threads.append(threading.current_thread().name)
+
+        with mock.patch.object(
+            async_views, 'check_connections', side_effect=record,
+        ), mock.patch.object(
+            async_views, 'mark_connections_idle', side_effect=record,
+        ):
+            async_to_sync(view)(APIRequestFactory().get('/events/'))
+
+        self.assertEqual(len(threads), 2)
+        self.assertTrue(all(t.startswith('async-read') for t in threads))
+
+    def test_stream_sent_off_the_loop(self):
+        """Test streamed lists stay streaming and read rows off the loop."""
+        create_event(user=self.user, title='Summit')
+        view = EventViewSet.as_view({'get': 'list'})
+        messages = []
+
+        response = async_to_sync(view)(
+            APIRequestFactory().get('/events/', {'stream': '1'}),
+        )
+
+        async def send(message):
+            messages.append(message)
+
+        self.assertTrue(response.streaming)
+        asyncio.run(async_views.ASGIHandler().send_response(response, send))
+        self.assertEqual(messages[0]['status'], 200)
+        content = b''.join(message.get('body', b'') for message in messages)
+        self.assertEqual(json.loads(content)[0]['title'], 'Summit')
+        self.assertFalse(messages[-1].get('more_body', False))
+
+    def test_stream_does_not_block_loop(self):
+        """Test the loop runs other tasks while a chunk is produced."""
+        ticks = []
+
+        def slow_chunks():
+            time.sleep(0.2)
+            yield b'chunk'
+
+        async def tick():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.01)
+
+        async def consume():
+            ticker = asyncio.ensure_future(tick())
+            stream = async_views.stream_in_thread(slow_chunks())
+            chunks = [chunk async for chunk in stream]
+            ticker.cancel()
+            return chunks
+
+        with mock.patch.object(
+            async_views.connections, 'close_all',
+        ) as close_all:
+            self.assertEqual(asyncio.run(consume()), [b'chunk'])
+
+        self.assertGreater(len(ticks), 5)
+        close_all.assert_called_once_with()
@@ -0,0 +1,125 @@
+"""Tests for cached token authentication."""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import bump_versions, token_cache
+
+ME_URL = reverse('user:me')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(
+        email=email, password=password, name='Test Name',
+    )
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token lookups are cached and invalidated."""
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = create_user()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_token_lookup_cached(self):
+        """Test the second request does not query the token."""
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_deleted_token_rejected(self):
+        """Test deleting a token invalidates the cached entry."""
+        self.client.get(ME_URL)
+
+        self.token.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test deactivating a user invalidates the cached entry."""
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalidated_by_other_process(self):
+        """Test a change handled by another process drops the entry here."""
+        self.client.get(ME_URL)
+
+        # The other process saves the user and bumps the token versions
+        # in the shared cache; this process' LRU isn't touched.
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False,
+        )
+        bump_versions([self.token.key])
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_refreshes_cache(self):
+        """Test updating the profile is visible on the next request."""
+        self.client.get(ME_URL)
+
+        self.client.patch(ME_URL, {'name': 'Updated Name'})
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['name'], 'Updated Name')
+
+    @override_settings(TOKEN_AUTH_CACHE={'MAX_SIZE': 1})
+    def test_cache_bounded(self):
+        """Test the least recently used token is evicted."""
+        other = create_user(email='other@example.com')
+        other_token = Token.objects.create(user=other)
+
+        self.client.get(ME_URL)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {other_token.key}')
+        self.client.get(ME_URL)
+
+        self.assertEqual(len(token_cache), 1)
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    @override_settings(TOKEN_AUTH_CACHE={'SHARED_CACHE': True})
+    def test_shared_cache_tier(self):
+        """Test a lookup is served from the shared cache after a miss."""
+        self.client.get(ME_URL)
+        token_cache.clear()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'missing_cache_table',
+    }})
+    def test_database_cache_skipped(self):
+        """Test lookups aren't cached behind a database cache read."""
+        self.client.get(ME_URL)
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(token_cache), 0)
+        self.token.delete()
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,11 +1,16 @@
 """ 
 Test custom Django management commands
 """
+from datetime import date
+from io import StringIO
 from unittest.mock import patch
+from django.contrib.auth import get_user_model
 from django.db.utils import OperationalError
 from psycopg2 import OperationalError as Pyscopg2Error
 from django.core.management import call_command
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+
+from core.models import Event, EventRegistration, Paper
 
 @patch('core.management.commands.wait_for_db.Command.check')
 class CommandTests(SimpleTestCase):
@@ -29,3 +34,51 @@ class CommandTests(SimpleTestCase):
         patched_check.assert_called_with(databases=['default'])
 
 
+class RecomputeEventCountersTests(TestCase):
+    """Test repairing drifted event counters."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123',
+        )
+        self.event = Event.objects.create(
+            user=self.user,
+            title='Sample event',
+            description='Sample description',
+            location='AinSmara',
+            start_date=date(2025, 12, 12),
+            end_date=date(2025, 12, 31),
+        )
+
+    def test_recompute_repairs_drift(self):
+        """Test counters are recounted from registrations and papers."""
+        EventRegistration.objects.create(
+            user=self.user, event=self.event, plan='student', price=8000,
+        )
+        Paper.objects.create(
+            event=self.event, author=self.user, title='Paper',
+            abstract='Abstract', keywords='ai', paper_type='oral',
+            status=Paper.Status.ACCEPTED,
+        )
+        Event.objects.filter(pk=self.event.pk).update(registrations_general=5)
+        out = StringIO()
+
+        call_command('recompute_event_counters', stdout=out)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registrations_general, 0)
+        self.assertEqual(self.event.registrations_student, 1)
+        self.assertEqual(self.event.seats_taken, 1)
+        self.assertEqual(self.event.papers_accepted, 1)
+        self.assertIn('1 event(s) repaired', out.getvalue())
+
+    def test_recompute_leaves_correct_counters(self):
+        """Test events with correct counters are not rewritten."""
+        out = StringIO()
+
+        call_command(
+            'recompute_event_counters', '--event', str(self.event.pk),
+            stdout=out,
+        )
+
+        self.assertIn('0 event(s) repaired', out.getvalue())
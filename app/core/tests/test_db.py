@@ -0,0 +1,82 @@
+"""Tests for the database connection health checks."""
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.db import check_connections, mark_connections_idle
+
+
+def fake_connection(health_checks=True, connected=True, atomic=False,
+                    usable=True, idle=60):
+    """Return a mock database connection, unused for idle seconds."""
+    connection = mock.Mock()
+    connection.settings_dict = {
+        'CONN_HEALTH_CHECKS': health_checks,
+        'CONN_HEALTH_CHECK_IDLE': 30,
+    }
+    connection.connection = object() if connected else None
+    connection.idle_since = time.monotonic() - idle
+    connection.in_atomic_block = atomic
+    connection.is_usable.return_value = usable
+    return connection
+
+
+@mock.patch('core.db.connections')
+class HealthCheckTests(SimpleTestCase):
+    """Test kept connections are checked when a request starts."""
+
+    def test_unusable_connection_closed(self, connections):
+        """Test a connection failing the ping is closed."""
+        connection = fake_connection(usable=False)
+        connections.all.return_value = [connection]
+
+        check_connections()
+
+        connection.close.assert_called_once()
+
+    def test_usable_connection_kept(self, connections):
+        """Test a connection answering the ping is kept."""
+        connection = fake_connection()
+        connections.all.return_value = [connection]
+
+        check_connections()
+
+        connection.is_usable.assert_called_once()
+        connection.close.assert_not_called()
+
+    def test_skipped_connections(self, connections):
+        """Test disabled, unopened, in-transaction and busy connections."""
+        skipped = [
+            fake_connection(health_checks=False, usable=False),
+            fake_connection(connected=False, usable=False),
+            fake_connection(atomic=True, usable=False),
+            fake_connection(idle=1, usable=False),
+        ]
+        connections.all.return_value = skipped
+
+        check_connections()
+
+        for connection in skipped:
+            connection.is_usable.assert_not_called()
+            connection.close.assert_not_called()
+
+    def test_connection_never_idle_checked(self, connections):
+        """Test a connection not seen at the end of a request is pinged."""
+        connection = fake_connection()
+        connection.idle_since = None
+        connections.all.return_value = [connection]
+
+        check_connections()
+
+        connection.is_usable.assert_called_once()
+
+    def test_request_end_marks_idle(self, connections):
+        connection = fake_connection()
+        connections.all.return_value = [connection]
+
+        mark_connections_idle()
+
+        self.assertAlmostEqual(
+            connection.idle_since, time.monotonic(), delta=1,
+        )
@@ -0,0 +1,239 @@
+"""Tests for the email outbox."""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import EventRegistration, OutboxMessage, Paper
+from core.notifications import notify_registration
+from core.outbox import (
+    LEASE,
+    MAX_ATTEMPTS,
+    claim_messages,
+    enqueue_email,
+    send_batch,
+)
+from event.tests.helpers import create_event
+
+
+class EnqueueEmailTests(TestCase):
+    """Test emails are queued once per key."""
+
+    def test_idempotent(self):
+        enqueue_email('welcome:1', 'Hi', 'Body', ['a@example.com'])
+        enqueue_email('welcome:1', 'Hi again', 'Body', ['a@example.com'])
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.subject, 'Hi')
+        self.assertEqual(message.status, OutboxMessage.Status.PENDING)
+
+    def test_no_recipient(self):
+        enqueue_email('welcome:1', 'Hi', 'Body', ['', None])
+
+        self.assertFalse(OutboxMessage.objects.exists())
+
+
+class NotificationTests(TestCase):
+    """Test writes queue their notification instead of sending it."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_superuser(
+            'admin@example.com', 'admin123',
+        )
+        self.user = User.objects.create_user(
+            email='user@example.com', password='testpass123',
+            role='author',
+        )
+        self.event = create_event(self.admin, capacity=1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_registration(self):
+        url = reverse('event:event-register', args=[self.event.id])
+
+        res = self.client.post(url, {'plan': 'general'})
+        self.client.post(url, {'plan': 'general'})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.recipients, ['user@example.com'])
+        self.assertIn('is confirmed', message.body)
+        self.assertEqual(mail.outbox, [])
+
+    def test_waitlist_promotion(self):
+        """Test a waitlisted user is told when they get a seat."""
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='testpass123',
+        )
+        url = reverse('event:event-register', args=[self.event.id])
+        self.client.post(url, {'plan': 'general'})
+        self.client.force_authenticate(other)
+        self.client.post(url, {'plan': 'general'})
+        self.client.force_authenticate(self.user)
+
+        self.client.delete(url)
+
+        bodies = [
+            message.body for message in OutboxMessage.objects.filter(
+                recipients=['other@example.com'],
+            ).order_by('id')
+        ]
+        self.assertEqual(len(bodies), 2)
+        self.assertIn('waiting list', bodies[0])
+        self.assertIn('is confirmed', bodies[1])
+
+    def test_registration_back_to_same_status(self):
+        """Test a registration confirmed again is notified again."""
+        url = reverse('event:event-register', args=[self.event.id])
+        self.client.post(url, {'plan': 'general'})
+        registration = EventRegistration.objects.get()
+
+        for new_status in (
+            EventRegistration.Status.WAITLISTED,
+            EventRegistration.Status.CONFIRMED,
+        ):
+            registration.status = new_status
+            registration.save()
+            notify_registration(registration)
+
+        bodies = list(
+            OutboxMessage.objects.order_by('id').values_list('body', flat=True)
+        )
+        self.assertEqual(len(bodies), 3)
+        self.assertIn('is confirmed', bodies[2])
+
+    def test_paper_decision(self):
+        paper = Paper.objects.create(
+            event=self.event, author=self.user, title='Paper',
+            abstract='Abstract', keywords='ai', paper_type='oral',
+        )
+        url = reverse(
+            'event-papers-set-status', args=[self.event.id, paper.id],
+        )
+        self.client.force_authenticate(self.admin)
+
+        self.client.patch(url, {'status': 'accepted'})
+        self.client.patch(url, {'status': 'accepted'})
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.recipients, ['user@example.com'])
+        self.assertEqual(message.subject, 'Your paper "Paper" was accepted')
+
+    def test_contact_message(self):
+        res = self.client.post(
+            reverse('contact-us-list'),
+            {'subject': 'Question', 'message': 'Where is it?'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.recipients, ['admin@example.com'])
+        self.assertIn('Where is it?', message.body)
+
+
+class SendBatchTests(TestCase):
+    """Test sending claimed messages."""
+
+    def setUp(self):
+        enqueue_email('first', 'First', 'Body', ['a@example.com'])
+        enqueue_email('second', 'Second', 'Body', ['b@example.com'])
+
+    def test_send(self):
+        """Test messages are sent and marked done."""
+        messages = claim_messages(10)
+
+        statuses = send_batch(messages)
+
+        self.assertEqual(statuses, ['done', 'done'])
+        self.assertEqual(
+            [email.subject for email in mail.outbox], ['First', 'Second'],
+        )
+        self.assertNotEqual(
+            mail.outbox[0].extra_headers['Message-ID'],
+            mail.outbox[1].extra_headers['Message-ID'],
+        )
+        self.assertEqual(claim_messages(10), [])
+
+    def test_reclaimed_message_not_sent_twice(self):
+        """Test messages reclaimed after their lease ran out are skipped."""
+        messages = claim_messages(10)
+        # The worker stalled past the lease and another one took over.
+        OutboxMessage.objects.update(
+            locked_at=timezone.now() - LEASE - timedelta(seconds=1),
+        )
+        reclaimed = claim_messages(10)
+
+        self.assertEqual(send_batch(messages), [])
+        self.assertEqual(send_batch(reclaimed), ['done', 'done'])
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_failure_retried_then_failed(self):
+        """Test a failing message backs off, then is marked failed."""
+        with mock.patch(
+            'django.core.mail.EmailMessage.send',
+            side_effect=OSError('refused'),
+        ):
+            for attempt in range(MAX_ATTEMPTS):
+                OutboxMessage.objects.update(run_after='2000-01-01T00:00Z')
+                statuses = send_batch(claim_messages(10))
+
+        self.assertEqual(statuses, ['failed', 'failed'])
+        message = OutboxMessage.objects.get(key='first')
+        self.assertEqual(message.attempts, MAX_ATTEMPTS)
+        self.assertEqual(message.last_error, 'OSError: refused')
+
+    def test_retry_delay(self):
+        with mock.patch(
+            'django.core.mail.EmailMessage.send',
+            side_effect=OSError('refused'),
+        ):
+            send_batch(claim_messages(10))
+
+        self.assertEqual(claim_messages(10), [])
+        self.assertEqual(
+            OutboxMessage.objects.filter(status='pending').count(), 2,
+        )
+
+    def test_connection_failure(self):
+        """Test every message of the batch is retried if SMTP is down."""
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.open',
+            side_effect=ConnectionRefusedError(),
+        ):
+            statuses = send_batch(claim_messages(10))
+
+        self.assertEqual(statuses, ['pending', 'pending'])
+        self.assertEqual(mail.outbox, [])
+
+
+class ProcessOutboxCommandTests(TransactionTestCase):
+    """Test the process_outbox command."""
+
+    def test_drain(self):
+        for index in range(5):
+            enqueue_email(
+                f'message:{index}', f'Message {index}', 'Body',
+                [f'user{index}@example.com'],
+            )
+        out = StringIO()
+
+        call_command(
+            'process_outbox', '--once', '--batch-size', '2',
+            '--concurrency', '2', stdout=out,
+        )
+
+        self.assertIn('5 done', out.getvalue())
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(
+            OutboxMessage.objects.exclude(status='done').exists()
+        )
@@ -0,0 +1,85 @@
+"""Tests for the full-text search helpers."""
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from core.models import Event
+from core.search import InvertedIndex, search, tokenize
+
+FIELDS = {'title': 'A', 'description': 'B'}
+
+
+class InvertedIndexTests(SimpleTestCase):
+    """Test the in-process inverted index."""
+
+    def setUp(self):
+        self.index = InvertedIndex([
+            (1, 'Machine learning summit', 'Talks on security'),
+            (2, 'Security days', 'Machine learning for defenders'),
+            (3, 'Cooking class', None),
+        ], FIELDS)
+
+    def test_tokenize_drops_stop_words(self):
+        """Test terms are lowercased and stop words dropped."""
+        self.assertEqual(tokenize('The Art of WAR'), ['art', 'war'])
+
+    def test_search_requires_every_term(self):
+        """Test only rows containing all the terms match."""
+        self.assertEqual(set(self.index.search('machine security')), {1, 2})
+        self.assertEqual(set(self.index.search('cooking security')), set())
+
+    def test_search_weights_fields(self):
+        """Test matches in heavier fields score higher."""
+        scores = self.index.search('security')
+
+        self.assertGreater(scores[2], scores[1])
+
+    def test_search_stop_words_only(self):
+        """Test a query without search terms matches nothing."""
+        self.assertEqual(self.index.search('the of'), {})
+
+
+class SearchQuerysetTests(TestCase):
+    """Test searching querysets."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123',
+        )
+
+    def create_event(self, **params):
+        defaults = {
+            'description': 'Sample description',
+            'location': 'AinSmara',
+            'start_date': date(2025, 12, 12),
+            'end_date': date(2025, 12, 31),
+        }
+        defaults.update(params)
+        return Event.objects.create(user=self.user, **defaults)
+
+    def test_search_annotates_rank(self):
+        """Test matching rows are annotated with their rank."""
+        title = self.create_event(title='Django conference')
+        self.create_event(title='Other', description='About Django')
+        self.create_event(title='Unrelated')
+
+        events = search(Event.objects.all(), 'django').order_by(
+            '-search_rank',
+        )
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0], title)
+        self.assertGreater(events[0].search_rank, events[1].search_rank)
+
+    def test_search_sees_changes(self):
+        """Test created, updated and deleted rows are searchable at once."""
+        event = self.create_event(title='Django conference')
+        self.assertEqual(search(Event.objects.all(), 'python').count(), 0)
+
+        event.title = 'Python conference'
+        event.save()
+        self.assertEqual(search(Event.objects.all(), 'python').count(), 1)
+
+        event.delete()
+        self.assertEqual(search(Event.objects.all(), 'python').count(), 0)
@@ -0,0 +1,203 @@
+"""Caching of rendered public event and topic responses.
+
+Responses are stored as rendered JSON bytes under keys built from the
+request's URL, media type and normalized query, and the current version
+of every namespace the response depends on ("events", "topics",
+"event:<id>"). Writes bump the versions from the signal handlers in
+event.signals, so stale entries are never read again and simply expire.
+
+The validators (ETag, Last-Modified) of a response are cached with it:
+they change with the same writes, so a hit answers conditional requests
+without touching the database.
+"""
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from core.cache import is_shared_memory_cache
+
+# Response headers stored with the content.
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+STATS_KEYS = {
+    'hits': 'api-cache:stats:hits',
+    'misses': 'api-cache:stats:misses',
+}
+
+
+def get_cache():
+    """Return the cache backend used for API responses."""
+    return caches[settings.API_RESPONSE_CACHE['CACHE_ALIAS']]
+
+
+def is_enabled():
+    """Return whether responses may be cached.
+
+    Only in memcached or Redis: a hit in the database cache costs more
+    queries than the uncached response. Not in a per-process LocMemCache
+    unless allowed either: with several workers the others would keep
+    serving the responses invalidated in one.
+    """
+    cache = get_cache()
+    if isinstance(cache, LocMemCache):
+        return settings.API_RESPONSE_CACHE.get('LOCAL_CACHE', False)
+    return is_shared_memory_cache(cache)
+
+
+def _version_key(namespace):
+    return f'api-cache:version:{namespace}'
+
+
+def _new_version():
+    # Time based, so a version evicted from the cache never restarts at a
+    # value that old entries were stored under.
+    return time.time_ns()
+
+
+def get_versions(namespaces):
+    """Return the current version of each namespace."""
+    cache = get_cache()
+    keys = [_version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def _bump(namespaces):
+    cache = get_cache()
+    for namespace in namespaces:
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            cache.set(_version_key(namespace), _new_version(), None)
+
+
+def invalidate(*namespaces):
+    """Bump the version of namespaces, orphaning their cached responses.
+
+    Bumped again once the transaction commits: a request reading the old
+    rows in between would otherwise cache them under the new version.
+    """
+    _bump(namespaces)
+    transaction.on_commit(partial(_bump, namespaces))
+
+
+def invalidate_event(event_id):
+    """Invalidate the list and detail responses of one event."""
+    invalidate('events', f'event:{event_id}')
+
+
+def _record(stat):
+    # incr is atomic and keeps the timeout in the backends is_enabled
+    # accepts.
+    cache = get_cache()
+    try:
+        cache.incr(STATS_KEYS[stat])
+    except ValueError:
+        cache.add(STATS_KEYS[stat], 0, None)
+        cache.incr(STATS_KEYS[stat])
+
+
+def get_stats():
+    """Return the hit and miss counters."""
+    values = get_cache().get_many(STATS_KEYS.values())
+    return {
+        stat: values.get(key, 0) for stat, key in STATS_KEYS.items()
+    }
+
+
+def build_key(request, params, namespaces):
+    """Build the cache key of a response to request.
+
+    Responses embed absolute (pagination) URLs, so the scheme and host are
+    part of the key, along with the negotiated media type the response
+    varies on.
+    """
+    versions = get_versions(namespaces)
+    raw = repr((
+        request.build_absolute_uri(request.path),
+        request.accepted_media_type,
+        sorted(params.items()),
+        versions,
+    ))
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f'api-cache:response:{digest}'
+
+
+class CachedResponseMixin:
+    """Serve read actions from the response cache.
+
+    Views wrap a handler with ``cached_response`` and implement
+    ``get_cache_namespaces`` and ``get_cache_params``. With
+    ConditionalGetMixin, the conditional handler goes inside, so the
+    validators are only computed on a miss.
+    """
+
+    def get_cache_namespaces(self):
+        """Return the namespaces the current response depends on."""
+        raise NotImplementedError
+
+    def get_cache_params(self):
+        """Return the normalized query as a dict, or None to skip caching."""
+        return {
+            key: tuple(sorted(values))
+            for key, values in self.request.query_params.lists()
+        }
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Return a cached response, or call handler and cache its result."""
+        params = None
+        if request.accepted_renderer.format == 'json' and is_enabled():
+            params = self.get_cache_params()
+        if params is None:
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = build_key(request, params, self.get_cache_namespaces())
+        cached = cache.get(key)
+        if cached is not None:
+            _record('hits')
+            return self._cached_hit(request, *cached)
+
+        _record('misses')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response = self.finalize_response(
+                request, response, *args, **kwargs
+            )
+            response.render()
+            headers = {
+                name: response[name]
+                for name in CACHED_HEADERS if response.has_header(name)
+            }
+            cache.set(
+                key,
+                (response.content, response['Content-Type'], headers),
+                settings.API_RESPONSE_CACHE['TIMEOUT'],
+            )
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def _cached_hit(self, request, content, content_type, headers):
+        last_modified = headers.get('Last-Modified')
+        if last_modified is not None:
+            last_modified = parse_http_date_safe(last_modified)
+        response = get_conditional_response(
+            request, etag=headers.get('ETag'), last_modified=last_modified,
+        )
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+        for name, value in headers.items():
+            response[name] = value
+        response['X-Cache'] = 'HIT'
+        return response
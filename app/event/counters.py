@@ -0,0 +1,185 @@
+"""Counters kept on Event rows with conditional, lock-free updates.
+
+Every change is a single UPDATE ... SET col = col + 1 guarded by a
+WHERE clause, so concurrent requests never read-modify-write the
+counters and never COUNT(*) registrations. Edits of the event itself go
+through save_event, which leaves the counter columns out of the UPDATE.
+"""
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from core.models import Event, EventRegistration, Paper
+from core.notifications import notify_registration
+from event.cache import invalidate, invalidate_event
+
+REGISTRATION_COUNTERS = {
+    plan: f'registrations_{plan}'
+    for plan in EventRegistration.RegistrationPlan.values
+}
+PAPER_COUNTERS = {
+    paper_status: f'papers_{paper_status}'
+    for paper_status in Paper.Status.values
+}
+COUNTER_FIELDS = (
+    ['seats_taken']
+    + list(REGISTRATION_COUNTERS.values())
+    + list(PAPER_COUNTERS.values())
+)
+
+
+def take_seat(event_id):
+    """Reserve a seat if the event has room; return whether it did."""
+    taken = Event.objects.filter(
+        Q(capacity__isnull=True) | Q(seats_taken__lt=F('capacity')),
+        pk=event_id,
+    ).update(
+        seats_taken=F('seats_taken') + 1,
+        updated_at=timezone.now(),
+    )
+    if taken:
+        invalidate_event(event_id)
+    return bool(taken)
+
+
+def release_seat(event_id):
+    """Give back a seat of a cancelled confirmed registration."""
+    Event.objects.filter(pk=event_id, seats_taken__gt=0).update(
+        seats_taken=F('seats_taken') - 1,
+        updated_at=timezone.now(),
+    )
+    invalidate_event(event_id)
+
+
+def save_event(event):
+    """Save an existing event without writing its (maybe stale) counters.
+
+    Gives free seats to the waitlist when the capacity changed.
+    """
+    old_capacity = Event.objects.filter(pk=event.pk).values_list(
+        'capacity', flat=True,
+    ).first()
+    event.save(update_fields=[
+        field.name for field in Event._meta.concrete_fields
+        if not field.primary_key and field.name not in COUNTER_FIELDS
+    ])
+    if event.capacity != old_capacity:
+        promote_waitlisted(event.pk)
+    event.refresh_from_db(fields=COUNTER_FIELDS)
+
+
+def promote_waitlisted(event_id):
+    """Give free seats to the oldest waitlisted registrations.
+
+    Must run in a transaction; returns the number promoted.
+    """
+    # Only the registrations are locked, not the joined users and event.
+    waitlist = EventRegistration.objects.select_for_update(
+        skip_locked=True, of=('self',),
+    ).select_related('user', 'event').filter(
+        event_id=event_id,
+        status=EventRegistration.Status.WAITLISTED,
+    ).order_by('created_at', 'id')
+
+    promoted = 0
+    while True:
+        registration = waitlist.first()
+        if registration is None or not take_seat(event_id):
+            return promoted
+        registration.status = EventRegistration.Status.CONFIRMED
+        registration.save(update_fields=['status', 'updated_at'])
+        notify_registration(registration)
+        promoted += 1
+
+
+def _update_counters(event_id, increment=None, decrement=None):
+    """Add one to the increment field and remove one from decrement."""
+    filters = {'pk': event_id}
+    values = {'updated_at': timezone.now()}
+    if increment:
+        values[increment] = F(increment) + 1
+    if decrement:
+        # Never go below zero on drift; recompute_event_counters repairs.
+        filters[f'{decrement}__gt'] = 0
+        values[decrement] = F(decrement) - 1
+    Event.objects.filter(**filters).update(**values)
+    invalidate_event(event_id)
+
+
+def registration_added(event_id, plan):
+    """Count a new registration of the plan."""
+    _update_counters(event_id, increment=REGISTRATION_COUNTERS[plan])
+
+
+def registration_removed(event_id, plan):
+    """Uncount a cancelled registration of the plan."""
+    _update_counters(event_id, decrement=REGISTRATION_COUNTERS[plan])
+
+
+def paper_added(event_id, paper_status):
+    """Count a new paper with the status."""
+    _update_counters(event_id, increment=PAPER_COUNTERS[paper_status])
+
+
+def paper_removed(event_id, paper_status):
+    """Uncount a deleted paper with the status."""
+    _update_counters(event_id, decrement=PAPER_COUNTERS[paper_status])
+
+
+def paper_status_changed(event_id, old_status, new_status):
+    """Move a paper from one status counter to another."""
+    if old_status == new_status:
+        return
+    _update_counters(
+        event_id,
+        increment=PAPER_COUNTERS[new_status],
+        decrement=PAPER_COUNTERS[old_status],
+    )
+
+
+def recompute_counters(events, batch_size=1000):
+    """Recount the counters of events; return how many were wrong.
+
+    Costs two grouped queries and one batched UPDATE per batch of events.
+    """
+    changed = 0
+    last_pk = 0
+    events = events.order_by('pk').only('pk', *COUNTER_FIELDS)
+    while True:
+        batch = {
+            event.pk: event
+            for event in events.filter(pk__gt=last_pk)[:batch_size]
+        }
+        if not batch:
+            return changed
+        last_pk = max(batch)
+        counts = {pk: dict.fromkeys(COUNTER_FIELDS, 0) for pk in batch}
+
+        rows = EventRegistration.objects.filter(
+            event_id__in=batch,
+        ).values('event_id', 'plan', 'status').annotate(count=Count('id'))
+        for row in rows:
+            event_counts = counts[row['event_id']]
+            event_counts[REGISTRATION_COUNTERS[row['plan']]] += row['count']
+            if row['status'] == EventRegistration.Status.CONFIRMED:
+                event_counts['seats_taken'] += row['count']
+
+        rows = Paper.objects.filter(
+            event_id__in=batch,
+        ).values('event_id', 'status').annotate(count=Count('id'))
+        for row in rows:
+            counts[row['event_id']][PAPER_COUNTERS[row['status']]] = (
+                row['count']
+            )
+
+        stale = []
+        now = timezone.now()
+        for pk, event in batch.items():
+            if any(getattr(event, f) != v for f, v in counts[pk].items()):
+                for field, value in counts[pk].items():
+                    setattr(event, field, value)
+                event.updated_at = now
+                stale.append(event)
+        Event.objects.bulk_update(stale, COUNTER_FIELDS + ['updated_at'])
+        if stale:
+            invalidate('events', *(f'event:{event.pk}' for event in stale))
+        changed += len(stale)
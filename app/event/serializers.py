@@ -1,9 +1,21 @@
 """Serializers for event APIs"""
+from django.db import IntegrityError, connection, transaction
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from core.models import (Event,
                          Topic,
                          EventRegistration,
                          EventSchedule,)
+from core.notifications import notify_registration
+from event.cache import invalidate
+from event.counters import (
+    COUNTER_FIELDS,
+    registration_added,
+    save_event,
+    take_seat,
+)
+
+MAX_BULK_EVENTS = 500
 
 REGISTRATION_PRICES = {
     "general": 15000,
@@ -26,8 +38,158 @@ class TopicSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
         read_only_fields = ['id']
         
+class EventTopicSerializer(TopicSerializer):
+    """Topic nested in an event payload, matched to existing topics by name."""
+    class Meta(TopicSerializer.Meta):
+        extra_kwargs = {'name': {'validators': []}}
+
+
+def resolve_topics(names):
+    """Return {name: Topic}, creating the missing topics in one batch."""
+    names = set(names)
+    if not names:
+        return {}
+
+    topics = {t.name: t for t in Topic.objects.filter(name__in=names)}
+    missing = names - topics.keys()
+    if missing:
+        # ignore_conflicts: a concurrent request may create the same names.
+        Topic.objects.bulk_create(
+            [Topic(name=name) for name in missing],
+            ignore_conflicts=True,
+        )
+        topics.update(
+            (t.name, t) for t in Topic.objects.filter(name__in=missing)
+        )
+        invalidate('topics')
+    return topics
+
+
+def write_event_children(items):
+    """Link topics and create schedules for (event, topics, schedules) items.
+
+    Costs a fixed number of queries however many events, topics and
+    schedule days are written. Call inside a transaction.
+    """
+    items = list(items)
+    topics = resolve_topics(
+        topic["name"] for _, event_topics, _ in items for topic in event_topics
+    )
+
+    EventTopic = Event.topics.through
+    EventTopic.objects.bulk_create(
+        [
+            EventTopic(event_id=event.id, topic_id=topics[topic["name"]].id)
+            for event, event_topics, _ in items
+            for topic in event_topics
+        ],
+        ignore_conflicts=True,
+    )
+    EventSchedule.objects.bulk_create([
+        EventSchedule(
+            event=event,
+            title=s["title"],
+            date=s["date"],
+            details=s.get("details", ""),
+        )
+        for event, _, schedules in items
+        for s in schedules
+    ])
+
+    # bulk_create sends no signals, so invalidate cached responses here.
+    invalidate('events', *(f'event:{event.id}' for event, _, _ in items))
+
+
+def sync_event_topics(event, topics):
+    """Link and unlink topics so the event has exactly the given names."""
+    wanted = {topic["name"] for topic in topics}
+    current = {topic.name: topic.id for topic in event.topics.all()}
+
+    EventTopic = Event.topics.through
+    removed = [current[name] for name in current.keys() - wanted]
+    if removed:
+        EventTopic.objects.filter(
+            event_id=event.id, topic_id__in=removed,
+        ).delete()
+
+    added = resolve_topics(wanted - current.keys())
+    EventTopic.objects.bulk_create(
+        [EventTopic(event_id=event.id, topic_id=t.id) for t in added.values()],
+        ignore_conflicts=True,
+    )
+
+
+def sync_event_schedules(event, schedules):
+    """Insert, update and delete schedule days, matched by date."""
+    wanted = {s["date"]: s for s in schedules}
+    current = {s.date: s for s in event.schedules.all()}
+
+    removed = current.keys() - wanted.keys()
+    if removed:
+        EventSchedule.objects.filter(event=event, date__in=removed).delete()
+
+    changed = []
+    for day, schedule in current.items():
+        if day not in wanted:
+            continue
+        title = wanted[day]["title"]
+        details = wanted[day].get("details", "")
+        if (schedule.title, schedule.details) != (title, details):
+            schedule.title = title
+            schedule.details = details
+            changed.append(schedule)
+    EventSchedule.objects.bulk_update(changed, ["title", "details"])
+
+    EventSchedule.objects.bulk_create([
+        EventSchedule(
+            event=event,
+            title=s["title"],
+            date=day,
+            details=s.get("details", ""),
+        )
+        for day, s in wanted.items() if day not in current
+    ])
+
+
+class BulkEventSerializer(serializers.ListSerializer):
+    """Create many events with batched topic and schedule writes."""
+
+    def to_internal_value(self, data):
+        # Before validating any item, so an oversized payload costs nothing.
+        if isinstance(data, list) and len(data) > MAX_BULK_EVENTS:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f"At most {MAX_BULK_EVENTS} events per request."
+                ],
+            })
+        return super().to_internal_value(data)
+
+    @transaction.atomic
+    def create(self, validated_data):
+        events = []
+        children = []
+        for attrs in validated_data:
+            topics = attrs.pop("topics", [])
+            schedules = attrs.pop("schedules", [])
+            events.append(Event(**attrs))
+            children.append((topics, schedules))
+
+        if connection.features.can_return_rows_from_bulk_insert:
+            Event.objects.bulk_create(events)
+        else:
+            # Backends that can't return primary keys from a bulk insert.
+            for event in events:
+                event.save()
+
+        write_event_children(
+            (event, topics, schedules)
+            for event, (topics, schedules) in zip(events, children)
+        )
+        return events
+
+
 class EventSerializer(serializers.ModelSerializer):
-    topics = TopicSerializer(many=True, required=False, write_only=True)
+    topics = EventTopicSerializer(many=True, required=False, write_only=True)
     topics_detail = serializers.SerializerMethodField()
 
     schedules = EventScheduleSerializer(many=True, required=False, write_only=True)
@@ -41,64 +203,62 @@ class EventSerializer(serializers.ModelSerializer):
             "location",
             "start_date",
             "end_date",
+            "capacity",
+            "seats_taken",
             "topics",
             "topics_detail",
             "schedules",
             "schedules_detail",
         ]
-        read_only_fields = ["id"]
+        read_only_fields = ["id", "seats_taken"]
+        list_serializer_class = BulkEventSerializer
 
     def get_topics_detail(self, obj):
+        # .all() reuses the cache filled by EventViewSet.get_queryset.
         return TopicSerializer(obj.topics.all(), many=True).data
 
     def get_schedules_detail(self, obj):
-        return EventScheduleSerializer(obj.schedules.all().order_by("date"), many=True).data
-
-    def _get_or_create_topics(self, topics, event):
-        for topic in topics:
-            topic_obj, _ = Topic.objects.get_or_create(name=topic["name"])
-            event.topics.add(topic_obj)
-
-    def _create_schedules(self, schedules, event):
-        for s in schedules:
-            EventSchedule.objects.create(
-                event=event,
-                title=s["title"],
-                date=s["date"],
-                details=s.get("details", ""),
-            )
+        # EventSchedule is ordered by date in Meta, so no order_by() here:
+        # that would bypass the prefetched schedules and query per event.
+        return EventScheduleSerializer(obj.schedules.all(), many=True).data
 
+    @transaction.atomic
     def create(self, validated_data):
         topics = validated_data.pop("topics", [])
         schedules = validated_data.pop("schedules", [])
 
         event = Event.objects.create(**validated_data)
-        self._get_or_create_topics(topics, event)
-        self._create_schedules(schedules, event)
+        write_event_children([(event, topics, schedules)])
         return event
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         topics = validated_data.pop("topics", None)
         schedules = validated_data.pop("schedules", None)
 
+        # Only the rows that differ are written, so existing schedule days
+        # keep their ids and unchanged topics keep their links.
         if topics is not None:
-            instance.topics.clear()
-            self._get_or_create_topics(topics, instance)
-
+            sync_event_topics(instance, topics)
         if schedules is not None:
-            instance.schedules.all().delete()
-            self._create_schedules(schedules, instance)
+            sync_event_schedules(instance, schedules)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        instance.save()
+        # Also invalidates the cached responses: the bulk writes above
+        # send no signals.
+        save_event(instance)
         return instance
 
 class EventDetailSerializer(EventSerializer):
     """Serializer for event detail view."""
     class Meta(EventSerializer.Meta):
-        fields = EventSerializer.Meta.fields + ['description']
+        fields = EventSerializer.Meta.fields + ['description'] + [
+            field for field in COUNTER_FIELDS
+            if field not in EventSerializer.Meta.fields
+        ]
+        read_only_fields = COUNTER_FIELDS
 
 class EventRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for event registration"""
@@ -110,6 +270,7 @@ class EventRegistrationSerializer(serializers.ModelSerializer):
             "event",
             "plan",
             "price",
+            "status",
             "created_at",
         ]
         read_only_fields = [
@@ -117,15 +278,11 @@ class EventRegistrationSerializer(serializers.ModelSerializer):
             "user",
             "event",
             "price",
+            "status",
             "created_at",
         ]
 
     def validate_plan(self, value):
-        REGISTRATION_PRICES = {
-            "general": 15000,
-            "student": 8000,
-            "workshop": 25000,
-        }
         if value not in REGISTRATION_PRICES:
             raise serializers.ValidationError("Invalid plan.")
         return value
@@ -134,19 +291,43 @@ class EventRegistrationSerializer(serializers.ModelSerializer):
         request = self.context["request"]
         event = self.context["event"]
 
-        if EventRegistration.objects.filter(user=request.user, event=event).exists():
-            raise serializers.ValidationError("Already registered.")
+        # A single INSERT: the (user, event) unique constraint detects
+        # duplicates, including concurrent ones, without a prior SELECT.
+        # A duplicate also rolls back the seat taken just before.
+        with transaction.atomic():
+            if take_seat(event.pk):
+                registration_status = EventRegistration.Status.CONFIRMED
+            else:
+                registration_status = EventRegistration.Status.WAITLISTED
+            try:
+                with transaction.atomic():
+                    registration = EventRegistration.objects.create(
+                        user=request.user,
+                        event=event,
+                        plan=validated_data["plan"],
+                        price=REGISTRATION_PRICES[validated_data["plan"]],
+                        status=registration_status,
+                    )
+            except IntegrityError:
+                if EventRegistration.objects.filter(
+                    user=request.user, event=event,
+                ).exists():
+                    raise serializers.ValidationError("Already registered.")
+                raise
+            registration_added(event.pk, registration.plan)
+            notify_registration(registration)
+            return registration
 
-        price = {
-            "general": 15000,
-            "student": 8000,
-            "workshop": 25000,
-        }[validated_data["plan"]]
 
-        return EventRegistration.objects.create(
-            user=request.user,
-            event=event,
-            plan=validated_data["plan"],
-            price=price,
-        )
+class CalendarEntrySerializer(serializers.Serializer):
+    """Serializer for one event's schedule day in the calendar."""
+    event = serializers.IntegerField(source="event_id")
+    event_title = serializers.CharField()
+    location = serializers.CharField()
+    title = serializers.CharField()
+
 
+class CalendarDaySerializer(serializers.Serializer):
+    """Serializer for a calendar day and its schedule entries."""
+    date = serializers.DateField()
+    entries = CalendarEntrySerializer(many=True)
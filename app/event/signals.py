@@ -0,0 +1,76 @@
+"""Signal handlers that keep event responses and validators fresh."""
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import Event, EventSchedule, Topic
+from event.cache import invalidate, invalidate_event
+
+
+def _touch(pks):
+    Event.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+
+
+def touch_events(**filters):
+    """Bump updated_at of events whose embedded data changed.
+
+    Bumped again once the transaction commits, so validators handed out
+    for the old rows in between never match the new ones.
+    """
+    pks = list(Event.objects.filter(**filters).values_list('pk', flat=True))
+    if pks:
+        _touch(pks)
+        transaction.on_commit(partial(_touch, pks))
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def event_changed(sender, instance, **kwargs):
+    """Invalidate cached responses of a saved or deleted event."""
+    invalidate_event(instance.pk)
+
+
+@receiver(post_save, sender=EventSchedule)
+@receiver(post_delete, sender=EventSchedule)
+def schedule_changed(sender, instance, **kwargs):
+    """Invalidate cached responses of the event owning a schedule day."""
+    touch_events(pk=instance.event_id)
+    invalidate_event(instance.event_id)
+
+
+@receiver(post_save, sender=Topic)
+def topic_changed(sender, instance, **kwargs):
+    """Invalidate topic lists and every event response embedding topics."""
+    touch_events(topics=instance)
+    invalidate('topics')
+
+
+@receiver(pre_delete, sender=Topic)
+def topic_deleted(sender, instance, **kwargs):
+    """Same as topic_changed, while the topic is still linked to events."""
+    touch_events(topics=instance)
+    invalidate('topics')
+
+
+@receiver(m2m_changed, sender=Event.topics.through)
+def event_topics_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate cached responses of events whose topics changed."""
+    if action == 'pre_clear' and reverse:
+        touch_events(topics=instance)
+        invalidate('topics')
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        touch_events(pk=instance.pk)
+        invalidate_event(instance.pk)
+    elif pk_set:
+        touch_events(pk__in=pk_set)
+        invalidate('events', *(f'event:{pk}' for pk in pk_set))
@@ -0,0 +1,29 @@
+"""Helpers shared by the event tests."""
+from datetime import date
+
+from django.contrib.auth import get_user_model
+
+from core.models import Event
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def create_admin_user(**params):
+    """Create and return admin user."""
+    return get_user_model().objects.create_superuser(**params)
+
+
+def create_event(user, **params):
+    """Create and return a simple event."""
+    defaults = {
+        'title': 'Sample event title',
+        'description': 'Sample description',
+        'location': 'AinSmara',
+        'start_date': date(2025, 12, 12),
+        'end_date': date(2025, 12, 31),
+    }
+    defaults.update(params)
+    return Event.objects.create(user=user, **defaults)
@@ -1,42 +1,29 @@
 """Test for event apis."""
 from datetime import date
-from django.contrib.auth import get_user_model
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APIClient
-from core.models import Event
-from event.serializers import (EventSerializer,
+from core.models import (Event,
+                         EventSchedule,
+                         Topic,)
+from event.serializers import (MAX_BULK_EVENTS,
+                               EventSerializer,
                                EventDetailSerializer,)
+from event.tests.helpers import create_admin_user, create_event, create_user
 
 EVENTS_URL = reverse('event:event-list')
+BULK_URL = reverse('event:event-bulk')
 def detail_url(event_id):
     """Create and return a event detail URL."""
     return reverse('event:event-detail', args= [event_id])
 
-def create_event(user, **params):
-    """Create and return a simple event."""
-    defaults = {
-        'title': 'Sample event title',
-        'description': 'good one bro',
-        'location': 'AinSmara',
-        'start_date': date(2025,12,12),
-        'end_date': date(2025,12,31),
-    }
-    defaults.update(params)
-
-    event = Event.objects.create(user = user, **defaults)
-    return event
-
-def create_user(**params):
-    """Create and return a new user."""
-    return get_user_model().objects.create_user(**params)
-
-def create_admin_user(**params):
-    """Create and return admin user."""
-    return get_user_model().objects.create_superuser(**params)
-
 class PublicEventAPITests(TestCase):
     """Test unauthenticated API requests."""
     
@@ -90,7 +77,24 @@ class PrivateEventAPITests(TestCase):
         events = Event.objects.all().order_by('-id')
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         serializer = EventSerializer(events, many=True)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_list_events_paginated_by_cursor(self):
+        """Test events are returned in cursor pages, newest first."""
+        events = [create_event(user = self.user) for _ in range(3)]
+
+        res = self.client.get(EVENTS_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [e['id'] for e in res.data['results']]
+        self.assertEqual(ids, [events[2].id, events[1].id])
+        self.assertIsNone(res.data['previous'])
+
+        res = self.client.get(res.data['next'])
+
+        ids = [e['id'] for e in res.data['results']]
+        self.assertEqual(ids, [events[0].id])
+        self.assertIsNone(res.data['next'])
 
     def test_get_event_detail(self):
         """Test get event detail."""
@@ -191,3 +195,326 @@ class AdminEventAPITests(TestCase):
         print(res.data)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class EventQueryCountTests(TestCase):
+    """Test the event endpoints do not issue queries per event."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email = 'user@example.com', password = 'test123')
+
+    def _create_events(self, count):
+        """Create events that each have topics and schedule days."""
+        ai = Topic.objects.create(name = 'AI')
+        web = Topic.objects.create(name = 'Web')
+        for i in range(count):
+            event = create_event(user = self.user, title = f'Event {i}')
+            event.topics.add(ai, web)
+            EventSchedule.objects.create(
+                event = event, title = 'Day 2',
+                date = date(2025,12,13), details = 'Talks',
+            )
+            EventSchedule.objects.create(
+                event = event, title = 'Day 1',
+                date = date(2025,12,12), details = 'Opening',
+            )
+
+    def test_list_query_count_is_constant(self):
+        """Test listing events costs a fixed number of queries."""
+        self._create_events(10)
+
+        # ETag validators, events, topics, schedules.
+        with self.assertNumQueries(4):
+            res = self.client.get(EVENTS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 10)
+
+    def test_list_schedules_ordered_by_date(self):
+        """Test prefetched schedules are still returned ordered by date."""
+        self._create_events(1)
+
+        res = self.client.get(EVENTS_URL)
+
+        dates = [s['date'] for s in res.data['results'][0]['schedules_detail']]
+        self.assertEqual(dates, ['2025-12-12', '2025-12-13'])
+
+
+class EventConditionalGetTests(TestCase):
+    """Test ETag and Last-Modified handling on event reads."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email = 'user@example.com', password = 'test123')
+        self.event = create_event(user = self.user)
+
+    def test_detail_not_modified(self):
+        """Test a matching If-None-Match returns 304 without a body."""
+        url = detail_url(self.event.id)
+        res = self.client.get(url)
+        etag = res['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(res['ETag'], etag)
+
+    def test_detail_if_modified_since(self):
+        """Test If-Modified-Since with the Last-Modified value returns 304."""
+        url = detail_url(self.event.id)
+        res = self.client.get(url)
+
+        res = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE = res['Last-Modified'],
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_changes_on_update(self):
+        """Test updating an event changes its ETag."""
+        url = detail_url(self.event.id)
+        etag = self.client.get(url)['ETag']
+
+        self.event.title = 'New title'
+        self.event.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_detail_etag_changes_on_schedule_change(self):
+        """Test adding a schedule day changes the event ETag."""
+        url = detail_url(self.event.id)
+        etag = self.client.get(url)['ETag']
+
+        EventSchedule.objects.create(
+            event = self.event, title = 'Day 1',
+            date = date(2025,12,12), details = 'Opening',
+        )
+        res = self.client.get(url, HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_on_delete(self):
+        """Test deleting an event changes the list ETag."""
+        other = create_event(user = self.user)
+        etag = self.client.get(EVENTS_URL)['ETag']
+
+        other.delete()
+        res = self.client.get(EVENTS_URL, HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_not_modified_skips_serializer(self):
+        """Test an uncached 304 only runs the validator query."""
+        etag = self.client.get(EVENTS_URL)['ETag']
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(EVENTS_URL, HTTP_IF_NONE_MATCH = etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class EventBulkCreateTests(TestCase):
+    """Test batched event writes."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = create_admin_user(
+            email = 'admin@example.com',
+            password = 'admin123',
+        )
+        self.client.force_authenticate(self.admin_user)
+
+    def _payload(self, title, days=3, topics=('AI', 'Web')):
+        return {
+            'title': title,
+            'location': 'AinSmara',
+            'start_date': '2025-12-01',
+            'end_date': '2025-12-10',
+            'description': 'Conference',
+            'topics': [{'name': name} for name in topics],
+            'schedules': [
+                {'title': f'Day {i}', 'date': f'2025-12-{i:02d}',
+                 'details': 'Talks'}
+                for i in range(1, days + 1)
+            ],
+        }
+
+    def test_create_reuses_existing_topics(self):
+        """Test creating an event links existing topics by name."""
+        ai = Topic.objects.create(name = 'AI')
+
+        res = self.client.post(
+            EVENTS_URL, self._payload('Event'), format = 'json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        event = Event.objects.get(id = res.data['id'])
+        self.assertIn(ai, event.topics.all())
+        self.assertEqual(Topic.objects.count(), 2)
+        self.assertEqual(event.schedules.count(), 3)
+
+    def test_create_query_count_independent_of_size(self):
+        """Test topics and schedules are written in batches."""
+        small = self._payload('Small', days = 1, topics = ('A',))
+        large = self._payload(
+            'Large', days = 10, topics = [f'T{i}' for i in range(8)],
+        )
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.post(EVENTS_URL, small, format = 'json')
+        with CaptureQueriesContext(connection) as large_queries:
+            self.client.post(EVENTS_URL, large, format = 'json')
+
+        self.assertEqual(len(small_queries), len(large_queries))
+
+    def test_bulk_create_events(self):
+        """Test creating many events in one request."""
+        payload = [self._payload(f'Event {i}') for i in range(5)]
+
+        res = self.client.post(BULK_URL, payload, format = 'json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 5)
+        self.assertEqual(Event.objects.count(), 5)
+        self.assertEqual(Topic.objects.count(), 2)
+        self.assertEqual(EventSchedule.objects.count(), 15)
+        self.assertEqual(
+            sorted(t['name'] for t in res.data[0]['topics_detail']),
+            ['AI', 'Web'],
+        )
+
+    def test_bulk_create_is_atomic(self):
+        """Test an invalid event rejects the whole batch."""
+        payload = [self._payload('Valid'), {'title': 'Missing fields'}]
+
+        res = self.client.post(BULK_URL, payload, format = 'json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Event.objects.exists())
+
+    def test_bulk_create_limited_before_validation(self):
+        """Test an oversized batch is rejected without validating items."""
+        payload = [{}] * (MAX_BULK_EVENTS + 1)
+
+        with mock.patch.object(
+            EventSerializer, 'run_validation',
+        ) as run_validation:
+            res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', res.data)
+        run_validation.assert_not_called()
+
+    def test_bulk_create_requires_admin(self):
+        """Test non-admin users cannot bulk create events."""
+        user = create_user(email = 'user@example.com', password = 'test123')
+        self.client.force_authenticate(user)
+
+        res = self.client.post(
+            BULK_URL, [self._payload('Event')], format = 'json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class EventDiffUpdateTests(TestCase):
+    """Test event updates only write topics and schedules that changed."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = create_admin_user(
+            email = 'admin@example.com',
+            password = 'admin123',
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.event = create_event(user = self.admin_user)
+        self.ai = Topic.objects.create(name = 'AI')
+        self.web = Topic.objects.create(name = 'Web')
+        self.event.topics.add(self.ai, self.web)
+        self.day1 = EventSchedule.objects.create(
+            event = self.event, title = 'Day 1',
+            date = date(2025,12,12), details = 'Opening',
+        )
+        self.day2 = EventSchedule.objects.create(
+            event = self.event, title = 'Day 2',
+            date = date(2025,12,13), details = 'Talks',
+        )
+
+    def test_update_topics_diff(self):
+        """Test removed topics are unlinked and new ones added."""
+        payload = {'topics': [{'name': 'AI'}, {'name': 'Cloud'}]}
+
+        res = self.client.patch(
+            detail_url(self.event.id), payload, format = 'json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        names = sorted(t.name for t in self.event.topics.all())
+        self.assertEqual(names, ['AI', 'Cloud'])
+        self.assertTrue(Topic.objects.filter(name = 'Web').exists())
+        self.assertEqual(
+            sorted(t['name'] for t in res.data['topics_detail']),
+            ['AI', 'Cloud'],
+        )
+
+    def test_update_schedules_keeps_row_identity(self):
+        """Test schedule days are matched by date and updated in place."""
+        payload = {'schedules': [
+            {'title': 'Day 1', 'date': '2025-12-12', 'details': 'Opening'},
+            {'title': 'Day 2', 'date': '2025-12-13', 'details': 'Workshops'},
+            {'title': 'Day 3', 'date': '2025-12-14', 'details': 'Closing'},
+        ]}
+
+        res = self.client.patch(
+            detail_url(self.event.id), payload, format = 'json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.day2.refresh_from_db()
+        self.assertEqual(self.day2.details, 'Workshops')
+        self.assertTrue(
+            EventSchedule.objects.filter(id = self.day1.id).exists()
+        )
+        self.assertEqual(self.event.schedules.count(), 3)
+
+    def test_update_schedules_removes_missing_days(self):
+        """Test days absent from the payload are deleted."""
+        payload = {'schedules': [
+            {'title': 'Day 2', 'date': '2025-12-13', 'details': 'Talks'},
+        ]}
+
+        self.client.patch(detail_url(self.event.id), payload, format = 'json')
+
+        self.assertEqual(
+            list(self.event.schedules.values_list('id', flat = True)),
+            [self.day2.id],
+        )
+
+    def test_unchanged_payload_writes_nothing(self):
+        """Test resending the same topics and schedules writes no rows."""
+        payload = {
+            'topics': [{'name': 'AI'}, {'name': 'Web'}],
+            'schedules': [
+                {'title': 'Day 1', 'date': '2025-12-12', 'details': 'Opening'},
+                {'title': 'Day 2', 'date': '2025-12-13', 'details': 'Talks'},
+            ],
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(
+                detail_url(self.event.id), payload, format = 'json',
+            )
+
+        writes = [
+            q['sql'] for q in queries
+            if q['sql'].startswith(('INSERT', 'DELETE'))
+            or (q['sql'].startswith('UPDATE')
+                and 'core_eventschedule' in q['sql'])
+        ]
+        self.assertEqual(writes, [])
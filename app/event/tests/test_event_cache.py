@@ -0,0 +1,214 @@
+"""Tests for the event response cache."""
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import EventSchedule, Topic
+from event.tests.helpers import create_event
+
+EVENTS_URL = reverse('event:event-list')
+TOPICS_URL = reverse('event:topic-list')
+CACHE_STATS_URL = reverse('event:event-cache-stats')
+
+
+def detail_url(event_id):
+    """Create and return a event detail URL."""
+    return reverse('event:event-detail', args=[event_id])
+
+
+class EventResponseCacheTests(TestCase):
+    """Test public reads are cached and invalidated on writes."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123',
+        )
+        self.event = create_event(user=self.user)
+
+    def test_list_served_from_cache(self):
+        """Test a repeated list request hits no database."""
+        res = self.client.get(EVENTS_URL)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        etag = res['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(EVENTS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['X-Cache'], 'HIT')
+        self.assertEqual(res['ETag'], etag)
+        self.assertEqual(res.json()['results'][0]['id'], self.event.id)
+
+    def test_not_modified_from_cache(self):
+        """Test a conditional request is answered from the cached ETag."""
+        etag = self.client.get(detail_url(self.event.id))['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(
+                detail_url(self.event.id), HTTP_IF_NONE_MATCH=etag,
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+        self.assertEqual(res['X-Cache'], 'HIT')
+
+    @override_settings(API_RESPONSE_CACHE={
+        'TIMEOUT': 300, 'CACHE_ALIAS': 'default', 'LOCAL_CACHE': False,
+    })
+    def test_local_cache_refused(self):
+        """Test a per-process cache isn't used unless allowed."""
+        self.client.get(EVENTS_URL)
+
+        res = self.client.get(EVENTS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(res.has_header('X-Cache'))
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'missing_cache_table',
+    }})
+    def test_database_cache_skipped(self):
+        """Test responses aren't cached, nor counted, in the database."""
+        self.client.get(EVENTS_URL)
+
+        with self.assertNumQueries(4):
+            res = self.client.get(EVENTS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(res.has_header('X-Cache'))
+
+    @override_settings(ALLOWED_HOSTS=['a.example', 'b.example'])
+    def test_host_in_key(self):
+        """Test pagination links of another host or scheme aren't served."""
+        create_event(user=self.user)
+        self.client.get(EVENTS_URL, {'page_size': 1}, HTTP_HOST='a.example')
+
+        res = self.client.get(
+            EVENTS_URL, {'page_size': 1},
+            HTTP_HOST='b.example', secure=True,
+        )
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertTrue(res.data['next'].startswith('https://b.example/'))
+
+    def test_media_type_in_key(self):
+        """Test responses rendered for another media type aren't served."""
+        self.client.get(EVENTS_URL)
+
+        res = self.client.get(
+            EVENTS_URL, HTTP_ACCEPT='application/json; indent=4',
+        )
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertIn(b'\n    ', res.content)
+
+    def test_topic_filter_normalized(self):
+        """Test equivalent topic filters share one cache entry."""
+        t1 = Topic.objects.create(name='AI')
+        t2 = Topic.objects.create(name='Web')
+        self.event.topics.add(t1, t2)
+
+        self.client.get(EVENTS_URL, {'topics': f'{t1.id},{t2.id}'})
+        res = self.client.get(EVENTS_URL, {'topics': f'{t2.id},{t1.id}'})
+
+        self.assertEqual(res['X-Cache'], 'HIT')
+
+    def test_event_update_invalidates(self):
+        """Test saving an event invalidates its list and detail."""
+        self.client.get(EVENTS_URL)
+        self.client.get(detail_url(self.event.id))
+
+        self.event.title = 'New title'
+        self.event.save()
+
+        res = self.client.get(EVENTS_URL)
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['title'], 'New title')
+        res = self.client.get(detail_url(self.event.id))
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['title'], 'New title')
+
+    def test_invalidated_again_on_commit(self):
+        """Test a response cached before the write commits isn't served."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = 'New title'
+            self.event.save()
+            # A request racing the commit.
+            self.client.get(EVENTS_URL)
+
+        res = self.client.get(EVENTS_URL)
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+    def test_touched_again_on_commit(self):
+        """Test an ETag handed out before the write commits goes stale."""
+        with self.captureOnCommitCallbacks(execute=True):
+            EventSchedule.objects.create(
+                event=self.event, title='Day 1',
+                date=date(2025, 12, 12), details='Opening',
+            )
+            etag = self.client.get(detail_url(self.event.id))['ETag']
+
+        res = self.client.get(
+            detail_url(self.event.id), HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_schedule_change_invalidates(self):
+        """Test adding a schedule day invalidates the event."""
+        self.client.get(detail_url(self.event.id))
+
+        EventSchedule.objects.create(
+            event=self.event, title='Day 1',
+            date=date(2025, 12, 12), details='Opening',
+        )
+
+        res = self.client.get(detail_url(self.event.id))
+        self.assertEqual(len(res.data['schedules_detail']), 1)
+
+    def test_topic_rename_invalidates(self):
+        """Test renaming a topic invalidates topics and events."""
+        topic = Topic.objects.create(name='AI')
+        self.event.topics.add(topic)
+        self.client.get(TOPICS_URL)
+        self.client.get(EVENTS_URL)
+
+        topic.name = 'Artificial Intelligence'
+        topic.save()
+
+        res = self.client.get(TOPICS_URL)
+        self.assertEqual(res.data['results'][0]['name'], topic.name)
+        res = self.client.get(EVENTS_URL)
+        topics = res.data['results'][0]['topics_detail']
+        self.assertEqual(topics[0]['name'], topic.name)
+
+    def test_event_delete_invalidates(self):
+        """Test deleting an event removes it from the cached list."""
+        self.client.get(EVENTS_URL)
+
+        self.event.delete()
+
+        res = self.client.get(EVENTS_URL)
+        self.assertEqual(res.data['results'], [])
+
+    def test_admin_can_read_stats(self):
+        """Test the hit and miss counters are exposed to admins."""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'admin123',
+        )
+        self.client.get(EVENTS_URL)
+        self.client.get(EVENTS_URL)
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'hits': 1, 'misses': 1})
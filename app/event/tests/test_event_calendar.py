@@ -0,0 +1,94 @@
+"""Tests for the calendar API."""
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import EventSchedule
+from event.tests.helpers import create_event
+
+CALENDAR_URL = reverse('event:calendar')
+
+
+class CalendarApiTests(TestCase):
+    """Test the cross-event calendar."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123',
+        )
+        self.summit = create_event(user=user, title='Summit', location='Oran')
+        self.forum = create_event(user=user, title='Forum')
+        for event, day, title in (
+            (self.summit, date(2025, 3, 1), 'Day 1'),
+            (self.summit, date(2025, 3, 2), 'Day 2'),
+            (self.forum, date(2025, 3, 2), 'Opening'),
+            (self.forum, date(2025, 4, 10), 'Closing'),
+        ):
+            EventSchedule.objects.create(
+                event=event, date=day, title=title, details='Details',
+            )
+
+    def test_calendar_groups_days(self):
+        """Test schedule days in the window are grouped by date."""
+        params = {'from': '2025-03-01', 'to': '2025-03-31'}
+
+        with self.assertNumQueries(1):
+            res = self.client.get(CALENDAR_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [
+            {'date': '2025-03-01', 'entries': [{
+                'event': self.summit.id, 'event_title': 'Summit',
+                'location': 'Oran', 'title': 'Day 1',
+            }]},
+            {'date': '2025-03-02', 'entries': [
+                {
+                    'event': self.summit.id, 'event_title': 'Summit',
+                    'location': 'Oran', 'title': 'Day 2',
+                },
+                {
+                    'event': self.forum.id, 'event_title': 'Forum',
+                    'location': 'AinSmara', 'title': 'Opening',
+                },
+            ]},
+        ])
+
+    def test_calendar_cached_per_window(self):
+        """Test windows are cached until a schedule changes."""
+        params = {'from': '2025-04-01', 'to': '2025-04-30'}
+        self.client.get(CALENDAR_URL, params)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(CALENDAR_URL, params)
+        self.assertEqual(res['X-Cache'], 'HIT')
+
+        EventSchedule.objects.create(
+            event=self.summit, date=date(2025, 4, 1), title='Extra',
+            details='',
+        )
+        res = self.client.get(CALENDAR_URL, params)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(len(res.data), 2)
+
+    def test_calendar_invalid_window(self):
+        """Test missing, reversed and too long windows return 400."""
+        for params in (
+            {'from': '2025-03-01'},
+            {'from': '2025-03-31', 'to': '2025-03-01'},
+            {'from': '2025-01-01', 'to': '2026-12-31'},
+            {'from': 'march', 'to': '2025-03-31'},
+        ):
+            res = self.client.get(CALENDAR_URL, params)
+
+            self.assertEqual(
+                res.status_code, status.HTTP_400_BAD_REQUEST, params,
+            )
@@ -0,0 +1,84 @@
+"""Tests for the registrations export."""
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import EventRegistration
+from event.tests.helpers import create_event, create_user
+
+
+def export_url(event_id):
+    """Create and return the registrations export URL of an event."""
+    return reverse('event:event-export-registrations', args=[event_id])
+
+
+class RegistrationExportTests(TestCase):
+    """Test exporting the registrations of an event."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='testpass123',
+        )
+        self.client.force_authenticate(self.admin)
+        self.event = create_event(user=self.admin)
+        for i in range(3):
+            user = create_user(
+                email=f'user{i}@example.com', password='testpass123',
+                name=f'User {i}',
+            )
+            EventRegistration.objects.create(
+                user=user, event=self.event, plan='student', price=8000,
+            )
+
+    def test_export_csv(self):
+        """Test the default export is CSV with the joined user columns."""
+        res = self.client.get(export_url(self.event.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment;', res['Content-Disposition'])
+        body = b''.join(res.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['user_email'], 'user0@example.com')
+        self.assertEqual(rows[0]['user_name'], 'User 0')
+        self.assertEqual(rows[0]['plan'], 'student')
+
+    def test_export_ndjson(self):
+        """Test accepting NDJSON exports one registration per line."""
+        res = self.client.get(
+            export_url(self.event.id), HTTP_ACCEPT='application/x-ndjson',
+        )
+
+        lines = b''.join(res.streaming_content).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[2])['user_name'], 'User 2')
+
+    def test_export_single_query(self):
+        """Test user columns are joined instead of queried per row."""
+        with self.assertNumQueries(2):
+            res = self.client.get(export_url(self.event.id))
+            b''.join(res.streaming_content)
+
+    def test_export_requires_admin(self):
+        """Test non admin users cannot export registrations."""
+        user = create_user(email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user)
+
+        res = self.client.get(export_url(self.event.id))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_unknown_event(self):
+        """Test exporting an unknown event returns 404."""
+        res = self.client.get(export_url(self.event.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,177 @@
+"""Tests for filtering the event list."""
+from datetime import date, timedelta
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Event, EventSchedule, Topic
+from event.tests.helpers import create_event
+
+EVENTS_URL = reverse('event:event-list')
+
+
+def index_name(model, fields):
+    """Return the name of the index of model on fields."""
+    for index in model._meta.indexes:
+        if list(index.fields) == fields:
+            return index.name
+    raise LookupError(fields)
+
+
+class EventFilterTests(TestCase):
+    """Test the date, location and topic filters."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123',
+        )
+
+    def get_ids(self, params):
+        res = self.client.get(EVENTS_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {event['id'] for event in res.json()['results']}
+
+    def test_filter_date_range(self):
+        """Test start_after and end_before bound the event dates."""
+        early = create_event(
+            user=self.user,
+            start_date=date(2025, 1, 10), end_date=date(2025, 1, 12),
+        )
+        middle = create_event(
+            user=self.user,
+            start_date=date(2025, 6, 1), end_date=date(2025, 6, 3),
+        )
+        late = create_event(
+            user=self.user,
+            start_date=date(2025, 6, 20), end_date=date(2025, 7, 2),
+        )
+
+        self.assertEqual(
+            self.get_ids({'start_after': '2025-06-01'}), {middle.id, late.id},
+        )
+        self.assertEqual(
+            self.get_ids({'end_before': '2025-06-03'}), {early.id, middle.id},
+        )
+        self.assertEqual(
+            self.get_ids({
+                'start_after': '2025-02-01', 'end_before': '2025-06-30',
+            }),
+            {middle.id},
+        )
+
+    def test_filter_upcoming(self):
+        """Test upcoming keeps events that have not ended yet."""
+        today = timezone.localdate()
+        past = create_event(
+            user=self.user, start_date=today - timedelta(days=10),
+            end_date=today - timedelta(days=1),
+        )
+        ongoing = create_event(
+            user=self.user, start_date=today - timedelta(days=1),
+            end_date=today,
+        )
+
+        self.assertEqual(self.get_ids({'upcoming': 'true'}), {ongoing.id})
+        self.assertEqual(self.get_ids({'upcoming': 'false'}), {past.id})
+
+    def test_filter_location_case_insensitive(self):
+        """Test location matches whole values regardless of case."""
+        event = create_event(user=self.user, location='Constantine')
+        create_event(user=self.user, location='Constantine North')
+
+        self.assertEqual(self.get_ids({'location': 'constantine'}), {event.id})
+
+    def test_filter_topics_any_and_all(self):
+        """Test topics_match selects any or all of the topics."""
+        ai = Topic.objects.create(name='AI')
+        web = Topic.objects.create(name='Web')
+        both = create_event(user=self.user)
+        both.topics.add(ai, web)
+        only_ai = create_event(user=self.user)
+        only_ai.topics.add(ai)
+        create_event(user=self.user)
+        topics = f'{ai.id},{web.id}'
+
+        self.assertEqual(
+            self.get_ids({'topics': topics}), {both.id, only_ai.id},
+        )
+        self.assertEqual(
+            self.get_ids({'topics': topics, 'topics_match': 'all'}),
+            {both.id},
+        )
+
+    def test_filter_topics_no_join(self):
+        """Test the topic filter uses EXISTS instead of a DISTINCT join."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(EVENTS_URL, {'topics': '1,2'})
+
+        event_query = next(
+            q['sql'] for q in queries
+            if q['sql'].startswith('SELECT "core_event"."id"')
+        )
+        self.assertIn('EXISTS', event_query)
+        self.assertNotIn('DISTINCT', event_query)
+
+    def test_invalid_filters(self):
+        """Test malformed filter values return 400."""
+        for params in (
+            {'start_after': '2025-13-01'},
+            {'end_before': 'tomorrow'},
+            {'upcoming': 'soon'},
+            {'topics': '1,abc'},
+            {'topics': ',2'},
+            {'topics': '1', 'topics_match': 'some'},
+        ):
+            res = self.client.get(EVENTS_URL, params)
+
+            self.assertEqual(
+                res.status_code, status.HTTP_400_BAD_REQUEST, params,
+            )
+            self.assertIn(list(params)[-1], res.data)
+
+
+class EventFilterIndexTests(TestCase):
+    """Test the filters are served by indexes."""
+
+    def explain(self, queryset):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Tiny test tables would be scanned sequentially otherwise.
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def test_date_range_uses_index(self):
+        """Test start date filters use the (start_date, end_date) index."""
+        plan = self.explain(
+            Event.objects.filter(start_date__gte=date(2025, 1, 1))
+        )
+
+        self.assertIn(
+            index_name(Event, ['start_date', 'end_date']), plan,
+        )
+
+    def test_schedule_date_uses_index(self):
+        """Test schedule day lookups use the date index."""
+        plan = self.explain(
+            EventSchedule.objects.filter(date=date(2025, 1, 1))
+        )
+
+        self.assertIn(index_name(EventSchedule, ['date']), plan)
+
+    @skipUnless(connection.vendor == 'postgresql', 'UPPER() index lookup')
+    def test_location_uses_index(self):
+        """Test case-insensitive location lookups use the UPPER() index."""
+        plan = self.explain(Event.objects.filter(location__iexact='Oran'))
+
+        self.assertIn('core_event_location_upper', plan)
@@ -0,0 +1,336 @@
+"""Tests for event registration."""
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Event, EventRegistration
+from event.counters import promote_waitlisted
+from event.serializers import EventSerializer
+from event.tests.helpers import create_event, create_user
+
+
+def register_url(event_id):
+    """Create and return an event registration URL."""
+    return reverse('event:event-register', args=[event_id])
+
+
+class EventRegistrationTests(TestCase):
+    """Test registering to events."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='user@example.com', password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        self.event = create_event(user=self.user)
+
+    def test_register_success(self):
+        """Test registering stores the plan price."""
+        res = self.client.post(register_url(self.event.id), {'plan': 'student'})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        registration = EventRegistration.objects.get(
+            user=self.user, event=self.event,
+        )
+        self.assertEqual(registration.price, 8000)
+
+    def test_register_twice_rejected(self):
+        """Test registering twice returns the Already registered error."""
+        self.client.post(register_url(self.event.id), {'plan': 'general'})
+
+        res = self.client.post(register_url(self.event.id), {'plan': 'general'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data, ['Already registered.'])
+        self.assertEqual(EventRegistration.objects.count(), 1)
+
+    def test_other_integrity_errors_raised(self):
+        """Test only a duplicate registration reads as Already registered."""
+        self.event.capacity = 1
+        self.event.save()
+
+        with mock.patch(
+            'event.serializers.notify_registration',
+            side_effect=IntegrityError('outbox'),
+        ), self.assertRaises(IntegrityError):
+            self.client.post(register_url(self.event.id), {'plan': 'general'})
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 0)
+        self.assertFalse(EventRegistration.objects.exists())
+
+    def test_register_single_insert(self):
+        """Test registering does not look up existing registrations."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(register_url(self.event.id), {'plan': 'general'})
+
+        registration_queries = [
+            q['sql'] for q in queries
+            if 'core_eventregistration' in q['sql']
+        ]
+        self.assertEqual(len(registration_queries), 1)
+        self.assertTrue(registration_queries[0].startswith('INSERT'))
+
+
+class EventCapacityTests(TestCase):
+    """Test seat counting and the waitlist."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = create_user(
+            email='owner@example.com', password='testpass123',
+        )
+        self.event = create_event(user=self.owner, capacity=1)
+        self.first = create_user(
+            email='first@example.com', password='testpass123',
+        )
+        self.second = create_user(
+            email='second@example.com', password='testpass123',
+        )
+
+    def _register(self, user):
+        self.client.force_authenticate(user)
+        return self.client.post(register_url(self.event.id), {'plan': 'general'})
+
+    def test_register_takes_seat(self):
+        """Test a confirmed registration increments seats_taken."""
+        res = self._register(self.first)
+
+        self.assertEqual(res.data['status'], 'confirmed')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 1)
+
+    def test_full_event_waitlists(self):
+        """Test registering to a full event puts the user on the waitlist."""
+        self._register(self.first)
+
+        res = self._register(self.second)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['status'], 'waitlisted')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 1)
+
+    def test_duplicate_does_not_take_seat(self):
+        """Test a rejected duplicate registration gives the seat back."""
+        self.event.capacity = 2
+        self.event.save()
+        self._register(self.first)
+
+        self._register(self.first)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 1)
+
+    def test_cancel_promotes_waitlisted(self):
+        """Test cancelling frees the seat for the oldest waitlisted user."""
+        self._register(self.first)
+        self._register(self.second)
+        self.client.force_authenticate(self.first)
+
+        res = self.client.delete(register_url(self.event.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        registration = EventRegistration.objects.get(user=self.second)
+        self.assertEqual(registration.status, 'confirmed')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 1)
+
+    def test_cancel_waitlisted_keeps_seats(self):
+        """Test cancelling a waitlisted registration frees no seat."""
+        self._register(self.first)
+        self._register(self.second)
+        self.client.force_authenticate(self.second)
+
+        self.client.delete(register_url(self.event.id))
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 1)
+
+    def test_unlimited_capacity(self):
+        """Test events without capacity confirm every registration."""
+        self.event.capacity = None
+        self.event.save()
+        self._register(self.first)
+
+        res = self._register(self.second)
+
+        self.assertEqual(res.data['status'], 'confirmed')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 2)
+
+    def test_raise_capacity_promotes_waitlisted(self):
+        """Test raising the capacity confirms waitlisted registrations."""
+        self._register(self.first)
+        self._register(self.second)
+        admin = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='testpass123',
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.client.patch(
+            reverse('event:event-detail', args=[self.event.id]),
+            {'capacity': 5},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['seats_taken'], 2)
+        registration = EventRegistration.objects.get(user=self.second)
+        self.assertEqual(registration.status, 'confirmed')
+
+    def test_promotion_does_not_query_per_user(self):
+        """Test promoting waitlisted users loads them with the waitlist."""
+        self._register(self.first)
+        for index in range(3):
+            self._register(create_user(
+                email=f'waiting{index}@example.com', password='testpass123',
+            ))
+        Event.objects.filter(pk=self.event.pk).update(capacity=4)
+
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                promoted = promote_waitlisted(self.event.pk)
+
+        self.assertEqual(promoted, 3)
+        for query in queries.captured_queries:
+            self.assertNotIn('FROM "core_user"', query['sql'])
+            self.assertNotIn('FROM "core_event"', query['sql'])
+
+
+class ConcurrentEventRegistrationTests(TransactionTestCase):
+    """Test parallel registrations of the same user.
+
+    Needs a database with row-level concurrency like PostgreSQL; SQLite
+    serializes writers and can fail with "database is locked" instead.
+    """
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_parallel_registrations(self):
+        """Test one registration wins and the others get a 400."""
+        user = create_user(email='user@example.com', password='testpass123')
+        event = create_event(user=user)
+        attempts = 8
+        barrier = threading.Barrier(attempts)
+
+        def register(_):
+            client = APIClient()
+            client.force_authenticate(user)
+            barrier.wait()
+            try:
+                res = client.post(register_url(event.id), {'plan': 'general'})
+                return res.status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=attempts) as pool:
+            codes = list(pool.map(register, range(attempts)))
+
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), 1)
+        self.assertEqual(
+            codes.count(status.HTTP_400_BAD_REQUEST), attempts - 1,
+        )
+        self.assertEqual(EventRegistration.objects.count(), 1)
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_parallel_registrations_never_oversell(self):
+        """Test parallel registrations confirm exactly capacity users."""
+        owner = create_user(email='owner@example.com', password='testpass123')
+        event = create_event(user=owner, capacity=3)
+        attempts = 10
+        users = [
+            create_user(email=f'user{i}@example.com', password='testpass123')
+            for i in range(attempts)
+        ]
+        barrier = threading.Barrier(attempts)
+
+        def register(user):
+            client = APIClient()
+            client.force_authenticate(user)
+            barrier.wait()
+            try:
+                res = client.post(register_url(event.id), {'plan': 'general'})
+                return res.data['status']
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=attempts) as pool:
+            statuses = list(pool.map(register, users))
+
+        self.assertEqual(statuses.count('confirmed'), 3)
+        self.assertEqual(statuses.count('waitlisted'), attempts - 3)
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 3)
+
+
+class EventCounterTests(TestCase):
+    """Test registration counters kept on events."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='user@example.com', password='testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        self.event = create_event(user=self.user)
+
+    def test_register_counts_plan(self):
+        """Test registering increments the plan counter."""
+        self.client.post(register_url(self.event.id), {'plan': 'student'})
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registrations_student, 1)
+        self.assertEqual(self.event.registrations_general, 0)
+
+    def test_duplicate_not_counted(self):
+        """Test a rejected duplicate does not change the counter."""
+        self.client.post(register_url(self.event.id), {'plan': 'student'})
+        self.client.post(register_url(self.event.id), {'plan': 'student'})
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registrations_student, 1)
+
+    def test_cancel_uncounts_plan(self):
+        """Test cancelling decrements the plan counter."""
+        self.client.post(register_url(self.event.id), {'plan': 'workshop'})
+
+        self.client.delete(register_url(self.event.id))
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registrations_workshop, 0)
+
+    def test_counters_in_event_detail(self):
+        """Test the counters are exposed read-only on event detail."""
+        self.client.post(register_url(self.event.id), {'plan': 'general'})
+
+        res = self.client.get(
+            reverse('event:event-detail', args=[self.event.id])
+        )
+
+        self.assertEqual(res.data['registrations_general'], 1)
+        self.assertEqual(res.data['papers_submitted'], 0)
+
+    def test_edit_during_registration_keeps_counters(self):
+        """Test saving an event loaded before a registration keeps counts."""
+        stale = Event.objects.get(pk=self.event.pk)
+        self.client.post(register_url(self.event.id), {'plan': 'student'})
+
+        serializer = EventSerializer(
+            stale, data={'title': 'New title'}, partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.title, 'New title')
+        self.assertEqual(self.event.seats_taken, 1)
+        self.assertEqual(self.event.registrations_student, 1)
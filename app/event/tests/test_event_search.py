@@ -0,0 +1,93 @@
+"""Tests for searching events."""
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Event
+from event.tests.helpers import create_event
+
+EVENTS_URL = reverse('event:event-list')
+
+
+class EventSearchTests(TestCase):
+    """Test the ?q= search of the event list."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123',
+        )
+
+    def test_search_ranks_matches(self):
+        """Test matches are returned best first, others left out."""
+        location = create_event(user=self.user, location='Security Hall')
+        title = create_event(user=self.user, title='Security summit')
+        create_event(user=self.user, title='Cooking class')
+
+        res = self.client.get(EVENTS_URL, {'q': 'security'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [e['id'] for e in res.data['results']], [title.id, location.id],
+        )
+
+    def test_search_pages_by_rank(self):
+        """Test the cursor walks every match once across pages."""
+        for i in range(5):
+            create_event(
+                user=self.user, title=f'Event {i}',
+                description='security ' * (i % 2 + 1),
+            )
+        create_event(user=self.user, title='Cooking class')
+
+        ids = []
+        res = self.client.get(EVENTS_URL, {'q': 'security', 'page_size': 2})
+        while True:
+            ids += [e['id'] for e in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+
+    def test_search_pages_through_many_ties(self):
+        """Test more than 1000 equally ranked matches are paged to the end."""
+        Event.objects.bulk_create([
+            Event(
+                user=self.user, title='Security summit',
+                description='Sample description', location='AinSmara',
+                start_date=date(2025, 12, 12), end_date=date(2025, 12, 31),
+            )
+            for _ in range(1250)
+        ])
+
+        ids = []
+        res = self.client.get(EVENTS_URL, {'q': 'security', 'page_size': 100})
+        for _ in range(20):
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [e['id'] for e in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertIsNone(res.data['next'])
+        self.assertEqual(len(ids), 1250)
+        self.assertEqual(len(set(ids)), 1250)
+
+    def test_search_with_topics(self):
+        """Test search combines with the topic filter."""
+        event = create_event(user=self.user, title='Security summit')
+        create_event(user=self.user, title='Security days')
+        topic = event.topics.create(name='AI')
+
+        res = self.client.get(
+            EVENTS_URL, {'q': 'security', 'topics': str(topic.id)},
+        )
+
+        self.assertEqual([e['id'] for e in res.data['results']], [event.id])
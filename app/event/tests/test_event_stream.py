@@ -0,0 +1,81 @@
+"""Tests for streaming event lists."""
+import json
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Event, EventSchedule, Topic
+from event.views import EventViewSet
+from event.tests.helpers import create_event
+
+EVENTS_URL = reverse('event:event-list')
+
+
+class EventStreamTests(TestCase):
+    """Test the opt-in streaming mode of the event list."""
+
+    def setUp(self):
+        self.client = APIClient()
+        user = get_user_model().objects.create_user(
+            email='user@example.com', password='testpass123',
+        )
+        topic = Topic.objects.create(name='AI')
+        self.events = []
+        for i in range(5):
+            event = create_event(user=user, title=f'Event {i}')
+            event.topics.add(topic)
+            EventSchedule.objects.create(
+                event=event, title='Day 1',
+                date=date(2025, 12, 12), details='Opening',
+            )
+            self.events.append(event)
+
+    def test_stream_json_array(self):
+        """Test ?stream=1 returns every event as one JSON array."""
+        res = self.client.get(EVENTS_URL, {'stream': '1', 'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        data = json.loads(b''.join(res.streaming_content))
+        self.assertEqual(
+            [e['id'] for e in data],
+            [e.id for e in reversed(self.events)],
+        )
+        self.assertEqual(data[0]['topics_detail'][0]['name'], 'AI')
+
+    def test_stream_ndjson(self):
+        """Test accepting NDJSON returns one event per line."""
+        res = self.client.get(
+            EVENTS_URL, HTTP_ACCEPT='application/x-ndjson',
+        )
+
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])['id'], self.events[-1].id)
+
+    def test_stream_query_count_per_chunk(self):
+        """Test rows are loaded in chunks with their prefetches."""
+        chunk_size = EventViewSet.stream_chunk_size
+        EventViewSet.stream_chunk_size = 2
+        self.addCleanup(
+            setattr, EventViewSet, 'stream_chunk_size', chunk_size,
+        )
+
+        # Primary keys, then events + topics + schedules per chunk of 2.
+        with self.assertNumQueries(1 + 3 * 3):
+            res = self.client.get(EVENTS_URL, {'stream': '1'})
+            b''.join(res.streaming_content)
+
+    def test_stream_empty(self):
+        """Test streaming an empty list returns an empty array."""
+        Event.objects.all().delete()
+
+        res = self.client.get(EVENTS_URL, {'stream': '1'})
+
+        self.assertEqual(json.loads(b''.join(res.streaming_content)), [])
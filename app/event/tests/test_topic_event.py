@@ -41,7 +41,7 @@ class PublicTopicsApiTests(TestCase):
         topics = Topic.objects.all().order_by('-name')
         serializer = TopicSerializer(topics, many = True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_public_cannot_create_topic(self):
         """Test for user cant create topics."""
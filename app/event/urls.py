@@ -11,5 +11,6 @@ router.register('topics', views.TopicViewSet)
 
 app_name = 'event'
 urlpatterns = [
+    path('calendar/', views.CalendarView.as_view(), name='calendar'),
     path('', include(router.urls))
 ]
@@ -1,7 +1,13 @@
 """Views for the event APIs."""
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
 
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.settings import api_settings
 from rest_framework import status
 from drf_spectacular.utils import (
     extend_schema_view,
@@ -13,20 +19,102 @@ from rest_framework import (
     viewsets,
     mixins,
     )
-from rest_framework.authentication import TokenAuthentication
+from core.async_views import AsyncReadMixin
+from core.authentication import CachedTokenAuthentication
 from event.permissions import CanRegisterToEvent
 from rest_framework.permissions import (IsAuthenticated,
                                         AllowAny,
                                         IsAdminUser,)
 
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.db.models import (
+    Exists,
+    F,
+    OuterRef,
+    Prefetch,
+    prefetch_related_objects,
+)
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
 from core.models import (
     Event,
     Topic,
     EventRegistration,
+    EventSchedule,
 )
 from event import serializers
+from event.cache import CachedResponseMixin, get_stats
+from event.counters import (
+    promote_waitlisted,
+    registration_removed,
+    release_seat,
+)
+from core.mixins import ConditionalGetMixin
+from core.streaming import (
+    CSVRenderer,
+    NDJSONRenderer,
+    StreamingListMixin,
+    export_response,
+)
+from core.pagination import TopicCursorPagination
+from core.search import search
+
+# Longest window the calendar answers, a bit more than a year view.
+MAX_CALENDAR_DAYS = 366
+
+# Accepted values of the upcoming filter.
+UPCOMING_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+# Actions that only need the event row, not its topics and schedules.
+REGISTRATION_ACTIONS = ['register', 'cancel_registration', 'my_registration']
+
+# Output column -> lookup of the registrations export.
+REGISTRATION_EXPORT_COLUMNS = {
+    'id': 'id',
+    'user_email': 'user__email',
+    'user_name': 'user__name',
+    'plan': 'plan',
+    'price': 'price',
+    'status': 'status',
+    'created_at': 'created_at',
+}
+
+def param_to_date(params, name, required=False):
+    """Return the date of a YYYY-MM-DD query param, or None."""
+    value = params.get(name)
+    if not value:
+        if required:
+            raise ValidationError({name: 'This query parameter is required.'})
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: 'Enter a valid date (YYYY-MM-DD).'})
+    return parsed
 
-class TopicViewSet(viewsets.GenericViewSet,
+def filter_by_topics(queryset, topic_ids, match='any'):
+    """Filter events on their topics with EXISTS semi-joins.
+
+    Unlike filtering through the topics join, this never returns an event
+    twice, so the list needs no DISTINCT (a sort or hash over every
+    joined row).
+    """
+    links = Event.topics.through.objects.filter(event_id = OuterRef('pk'))
+    if match == 'any':
+        return queryset.filter(Exists(links.filter(topic_id__in = topic_ids)))
+    for topic_id in set(topic_ids):
+        queryset = queryset.filter(Exists(links.filter(topic_id = topic_id)))
+    return queryset
+
+
+class TopicViewSet(AsyncReadMixin,
+                   ConditionalGetMixin,
+                   CachedResponseMixin,
+                   viewsets.GenericViewSet,
                    mixins.ListModelMixin,
                    mixins.UpdateModelMixin,
                    mixins.DestroyModelMixin,
@@ -34,7 +122,8 @@ class TopicViewSet(viewsets.GenericViewSet,
     """View for managing global topics."""
     queryset = Topic.objects.all().order_by('-name')
     serializer_class = serializers.TopicSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    pagination_class = TopicCursorPagination
 
     def get_permissions(self):
         """Public can read topics, and only admin users can create/update/delete."""
@@ -42,6 +131,13 @@ class TopicViewSet(viewsets.GenericViewSet,
             return [AllowAny()]
         return [IsAdminUser()]
 
+    def get_cache_namespaces(self):
+        return ['topics']
+
+    def list(self, request, *args, **kwargs):
+        handler = partial(self.conditional_response, super().list)
+        return self.cached_response(handler, request, *args, **kwargs)
+
 @extend_schema_view(
     list = extend_schema(
         parameters = [
@@ -49,22 +145,63 @@ class TopicViewSet(viewsets.GenericViewSet,
                 name = 'topics',
                 type = OpenApiTypes.STR,
                 description = 'Comma separated list of topic IDs to filter by'
-            )
+            ),
+            OpenApiParameter(
+                name = 'topics_match',
+                type = OpenApiTypes.STR,
+                enum = ['any', 'all'],
+                description = 'Match events with any (default) or all of the topics'
+            ),
+            OpenApiParameter(
+                name = 'start_after',
+                type = OpenApiTypes.DATE,
+                description = 'Only events starting on or after this date'
+            ),
+            OpenApiParameter(
+                name = 'end_before',
+                type = OpenApiTypes.DATE,
+                description = 'Only events ending on or before this date'
+            ),
+            OpenApiParameter(
+                name = 'upcoming',
+                type = OpenApiTypes.BOOL,
+                description = 'Only events that have not ended (false: only past events)'
+            ),
+            OpenApiParameter(
+                name = 'location',
+                type = OpenApiTypes.STR,
+                description = 'Exact location, case-insensitive'
+            ),
+            OpenApiParameter(
+                name = 'q',
+                type = OpenApiTypes.STR,
+                description = 'Full-text search in title, description and location'
+            ),
+            OpenApiParameter(
+                name = 'stream',
+                type = OpenApiTypes.BOOL,
+                description = 'Stream every event as one JSON array, unpaginated'
+            ),
         ]
     )
 )
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(AsyncReadMixin,
+                   ConditionalGetMixin,
+                   CachedResponseMixin,
+                   StreamingListMixin,
+                   viewsets.ModelViewSet):
     """View for manage recipe APIs."""
     serializer_class = serializers.EventSerializer
     queryset = Event.objects.all().order_by('-id')
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer]
 
     def get_permissions(self):
         """Custom permissions."""
         if self.action in ['list', 'retrieve']:
             return [AllowAny()]
         
-        if self.action in ['register', 'cancel_registration', 'my_registration']:
+        if self.action in REGISTRATION_ACTIONS:
             return [IsAuthenticated(), CanRegisterToEvent()]
         
         return [IsAdminUser()]
@@ -74,7 +211,8 @@ class EventViewSet(viewsets.ModelViewSet):
         if self.action == 'list':
             return serializers.EventSerializer
         
-        if self.action in ['create', 'update', 'partial_update', 'retrieve']:
+        if self.action in ['create', 'update', 'partial_update', 'retrieve',
+                           'bulk']:
             return serializers.EventDetailSerializer
         
         if self.action in ['register', 'my_registration']:
@@ -86,20 +224,123 @@ class EventViewSet(viewsets.ModelViewSet):
         """Create a new event"""
         serializer.save(user = self.request.user)
 
+    @action(methods=['POST'], detail=False, url_path='bulk')
+    def bulk(self, request):
+        """Admin: create many events in one request."""
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        events = serializer.save(user=request.user)
+
+        prefetch_related_objects(
+            events,
+            Prefetch('topics', queryset=Topic.objects.order_by('id')),
+            'schedules',
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     def _params_to_ints(self, qs):
         """Convert a comma separated string to a list of ints."""
-        return [int(str_id) for str_id in qs.split(',')]
+        try:
+            return [int(str_id) for str_id in qs.split(',')]
+        except ValueError:
+            raise ValidationError(
+                {'topics': 'Expected comma separated topic ids.'}
+            )
+
+    def get_cache_namespaces(self):
+        if self.action == 'retrieve':
+            return [f'event:{self.kwargs["pk"]}', 'topics']
+        return ['events', 'topics']
+
+    def get_cache_params(self):
+        """Normalize the query so equivalent topic filters share a key."""
+        params = super().get_cache_params()
+        topics = self.request.query_params.get('topics')
+        if topics:
+            params['topics'] = tuple(sorted(set(
+                self._params_to_ints(topics)
+            )))
+        if 'upcoming' in params:
+            # The same query matches other events once the day changes.
+            params['today'] = timezone.localdate().isoformat()
+        return params
+
+    def list(self, request, *args, **kwargs):
+        if self.wants_stream(request):
+            return self.stream_list(request)
+        handler = partial(self.conditional_response, super().list)
+        return self.cached_response(handler, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        handler = partial(self.conditional_response, super().retrieve)
+        return self.cached_response(handler, request, *args, **kwargs)
+
+    @action(methods=['GET'], detail=False, url_path='cache-stats')
+    def cache_stats(self, request):
+        """Admin: hit and miss counters of the response cache."""
+        return Response(get_stats(), status=status.HTTP_200_OK)
     
     def get_queryset(self):
-        """Retrieve events, optionally filtered by topics."""
-        queryset = self.queryset
+        """Retrieve events, optionally filtered and searched."""
+        queryset = self.queryset.defer('search_vector')
+        if self.action not in REGISTRATION_ACTIONS:
+            queryset = queryset.prefetch_related(
+                Prefetch('topics', queryset=Topic.objects.order_by('id')),
+                Prefetch(
+                    'schedules',
+                    queryset=EventSchedule.objects.order_by('date'),
+                ),
+            )
+
+        queryset = self._filter_dates(queryset)
+
+        location = self.request.query_params.get('location')
+        if location:
+            queryset = queryset.filter(location__iexact = location.strip())
 
         topics = self.request.query_params.get('topics')
         if topics:
-            topic_ids = self._params_to_ints(topics)
-            queryset = queryset.filter(topics__id__in = topic_ids)
+            queryset = self._filter_topics(
+                queryset, self._params_to_ints(topics),
+            )
+
+        query = self.request.query_params.get('q')
+        if query:
+            queryset = search(queryset, query)
+
+        return queryset.order_by('-id')
 
-        return queryset.order_by('-id').distinct()
+    def _filter_dates(self, queryset):
+        """Filter on the start_after, end_before and upcoming params."""
+        start_after = self._param_to_date('start_after')
+        if start_after:
+            queryset = queryset.filter(start_date__gte = start_after)
+
+        end_before = self._param_to_date('end_before')
+        if end_before:
+            queryset = queryset.filter(end_date__lte = end_before)
+
+        upcoming = self.request.query_params.get('upcoming')
+        if upcoming:
+            if upcoming.lower() not in UPCOMING_VALUES:
+                raise ValidationError({'upcoming': 'Expected true or false.'})
+            today = timezone.localdate()
+            if UPCOMING_VALUES[upcoming.lower()]:
+                queryset = queryset.filter(end_date__gte = today)
+            else:
+                queryset = queryset.filter(end_date__lt = today)
+        return queryset
+
+    def _filter_topics(self, queryset, topic_ids):
+        """Keep events linked to any (or all) of the topics."""
+        match = self.request.query_params.get('topics_match', 'any')
+        if match not in ('any', 'all'):
+            raise ValidationError({'topics_match': 'Expected any or all.'})
+        return filter_by_topics(queryset, topic_ids, match)
+
+    def _param_to_date(self, name):
+        """Return the date of a YYYY-MM-DD query param, or None."""
+        return param_to_date(self.request.query_params, name)
     
     @action(methods=['POST'], detail=True, url_path='register')
     def register(self, request, pk=None):
@@ -124,19 +365,25 @@ class EventViewSet(viewsets.ModelViewSet):
         """Cancel the current user's registration for this event."""
         event = self.get_object()
 
-        deleted, _ = EventRegistration.objects.filter(
-            user=request.user,
-            event=event
-        ).delete()
+        with transaction.atomic():
+            registration = EventRegistration.objects.select_for_update().filter(
+                user=request.user,
+                event=event
+            ).first()
 
-        if deleted == 0:
-            return Response(
-                {'detail': 'You are not registered for this event.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+            if registration is None:
+                return Response(
+                    {'detail': 'You are not registered for this event.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
 
-        return Response(status=status.HTTP_204_NO_CONTENT)
+            registration.delete()
+            registration_removed(event.pk, registration.plan)
+            if registration.status == EventRegistration.Status.CONFIRMED:
+                release_seat(event.pk)
+                promote_waitlisted(event.pk)
 
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(methods=['GET'], detail=True, url_path='my-registration')
     def my_registration(self, request, pk=None):
@@ -156,3 +403,82 @@ class EventViewSet(viewsets.ModelViewSet):
 
         serializer = serializers.EventRegistrationSerializer(registration)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(methods=['GET'], detail=True, url_path='registrations/export',
+            renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export_registrations(self, request, pk=None):
+        """Admin: stream every registration of this event as CSV/NDJSON."""
+        event = get_object_or_404(Event.objects.only('id'), pk=pk)
+        registrations = EventRegistration.objects.filter(
+            event=event
+        ).order_by('created_at', 'id')
+        return export_response(
+            request,
+            registrations,
+            REGISTRATION_EXPORT_COLUMNS,
+            f'event-{event.pk}-registrations',
+        )
+
+
+@extend_schema(
+    parameters = [
+        OpenApiParameter(
+            name = 'from',
+            type = OpenApiTypes.DATE,
+            required = True,
+            description = 'First day of the window'
+        ),
+        OpenApiParameter(
+            name = 'to',
+            type = OpenApiTypes.DATE,
+            required = True,
+            description = f'Last day of the window (at most {MAX_CALENDAR_DAYS} days)'
+        ),
+    ],
+    responses = serializers.CalendarDaySerializer(many=True),
+)
+class CalendarView(AsyncReadMixin, CachedResponseMixin, APIView):
+    """Schedule days of every event in a date window, grouped by day."""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [AllowAny]
+
+    def get_window(self):
+        """Return the validated (from, to) dates of the request."""
+        params = self.request.query_params
+        start = param_to_date(params, 'from', required=True)
+        end = param_to_date(params, 'to', required=True)
+        if end < start:
+            raise ValidationError({'to': 'Must not be before from.'})
+        if (end - start).days >= MAX_CALENDAR_DAYS:
+            raise ValidationError(
+                {'to': f'The window is limited to {MAX_CALENDAR_DAYS} days.'}
+            )
+        return start, end
+
+    def get_cache_namespaces(self):
+        return ['events']
+
+    def get_cache_params(self):
+        """Key the cache by the window only."""
+        start, end = self.get_window()
+        return {'from': start.isoformat(), 'to': end.isoformat()}
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(self.list_days, request, *args, **kwargs)
+
+    def list_days(self, request, *args, **kwargs):
+        """Read the window in one query on the schedule date index."""
+        start, end = self.get_window()
+        rows = EventSchedule.objects.filter(
+            date__range = (start, end)
+        ).order_by('date', 'event_id').values(
+            'date', 'title', 'event_id',
+            event_title = F('event__title'),
+            location = F('event__location'),
+        )
+        days = [
+            {'date': day, 'entries': list(entries)}
+            for day, entries in groupby(rows, key = itemgetter('date'))
+        ]
+        serializer = serializers.CalendarDaySerializer(days, many = True)
+        return Response(serializer.data, status = status.HTTP_200_OK)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PaperConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'paper'
+
+    def ready(self):
+        from paper import signals  # noqa: F401
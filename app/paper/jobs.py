@@ -0,0 +1,100 @@
+"""Database-backed queue of the background processing of papers.
+
+Submitting or replacing a PDF adds a PaperJob in the same transaction;
+the process_paper_jobs command claims due jobs and runs them out of the
+request path, retrying failures with a growing delay. PDFs that can't be
+read fail at once: they would not read better later.
+"""
+import logging
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Paper, PaperJob, paper_thumbnail_file_path
+from core.queue import claim, finish
+from paper.processing import PDFContents, PDFError
+from paper.uploads import THUMBNAIL_FIELD, release_pdf
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+# Delay before the first retry, doubled after each failed attempt.
+RETRY_DELAY = timedelta(seconds=30)
+# A job running for longer was left by a worker that died: run it again.
+LEASE = timedelta(minutes=10)
+
+
+def enqueue(paper):
+    """Queue the processing of a paper's PDF."""
+    return PaperJob.objects.create(paper=paper)
+
+
+def claim_jobs(limit):
+    """Mark up to limit due jobs as running and return them."""
+    return claim(PaperJob.objects.select_related("paper"), limit, LEASE)
+
+
+def process_paper(paper):
+    """Store the page count, text and thumbnail of a paper's PDF.
+
+    Nothing is stored once the paper has another PDF: the job queued
+    with that one does it.
+    """
+    if not paper.pdf_file:
+        return
+    with paper.pdf_file.open("rb") as pdf_file:
+        data = pdf_file.read()
+    try:
+        pdf = PDFContents(data)
+    except PDFError:
+        # Nothing is known of this PDF: don't keep what an earlier one had.
+        _save_results(paper, page_count=None, pdf_text="", thumbnail=None)
+        raise
+
+    thumbnail = paper.thumbnail
+    name = paper_thumbnail_file_path(paper, "thumbnail.jpg")
+    if not (paper.pdf_sha256 and thumbnail.storage.exists(name)):
+        image = pdf.thumbnail()
+        name = image and thumbnail.storage.save(name, ContentFile(image))
+
+    _save_results(
+        paper,
+        page_count=pdf.page_count(),
+        pdf_text=pdf.text(),
+        thumbnail=name or None,
+    )
+
+
+def _save_results(paper, **results):
+    """Save results if paper still has its PDF; release unused thumbnails."""
+    # Only these columns: the paper may have been edited meanwhile.
+    saved = Paper.objects.filter(
+        pk=paper.pk,
+        pdf_file=paper.pdf_file.name,
+        pdf_sha256=paper.pdf_sha256,
+    ).update(updated_at=timezone.now(), **results)
+
+    previous, new = paper.thumbnail.name, results["thumbnail"]
+    unused = previous if saved else new
+    if unused and unused != (new if saved else previous):
+        transaction.on_commit(
+            lambda: release_pdf(unused, field=THUMBNAIL_FIELD)
+        )
+
+
+def run_job(job, max_attempts=MAX_ATTEMPTS):
+    """Run a claimed job, record its outcome and return its status."""
+    error = None
+    try:
+        process_paper(job.paper)
+    except PDFError as exc:
+        logger.warning("Paper %s has an unreadable PDF: %s", job.paper_id, exc)
+        error = exc
+        # The same file will never read better: don't retry.
+        max_attempts = job.attempts
+    except Exception as exc:
+        logger.exception("Processing paper %s failed", job.paper_id)
+        error = exc
+    return finish(job, error, max_attempts, RETRY_DELAY)
@@ -36,3 +36,20 @@ class PaperPermissions(BasePermission):
 
 
         return is_staff(request.user)
+
+
+class PaperPDFPermissions(BasePermission):
+    """
+    PDF download: staff, the paper's author and the event's organizer.
+    """
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
+    def has_object_permission(self, request, view, obj):
+        user = request.user
+        return (
+            is_staff(user)
+            or obj.author_id == user.id
+            or obj.event.user_id == user.id
+        )
@@ -0,0 +1,104 @@
+"""Extraction of the page count, text and a thumbnail of paper PDFs.
+
+Documents are read with pypdf, which decodes the fonts the text is shown
+with (CID fonts and their ToUnicode maps included). The thumbnail is the
+first page rendered by Poppler's pdftoppm; without it there is none.
+"""
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from PIL import Image
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (200, 283)
+MAX_TEXT_LENGTH = 200_000
+PDFTOPPM = 'pdftoppm'
+RENDER_TIMEOUT = 60
+# Text with fewer readable characters is what fonts without a Unicode
+# mapping decode to: it would only pollute the search.
+MIN_READABLE_RATIO = 0.9
+
+
+class PDFError(Exception):
+    """The document can't be read."""
+
+
+def is_readable(text):
+    """Return whether text looks like words rather than glyph codes."""
+    letters = sum(char.isalpha() for char in text)
+    readable = sum(char.isprintable() or char.isspace() for char in text)
+    return letters > 0 and readable >= MIN_READABLE_RATIO * len(text)
+
+
+class PDFContents:
+    """The pages, text and first page render of a PDF document."""
+
+    def __init__(self, data):
+        self.data = data
+        try:
+            self.reader = PdfReader(io.BytesIO(data))
+            self.pages = list(self.reader.pages)
+        except Exception as exc:
+            # pypdf raises all sorts of errors on damaged files.
+            raise PDFError(f'{type(exc).__name__}: {exc}') from exc
+
+    def page_count(self):
+        """Return the number of pages of the document."""
+        return len(self.pages)
+
+    def text(self):
+        """Return the plain text of the document, for search.
+
+        Empty when nothing readable could be extracted.
+        """
+        texts = []
+        length = 0
+        for page in self.pages:
+            try:
+                text = page.extract_text().strip()
+            except Exception:
+                logger.warning('Extracting the text of a page failed',
+                               exc_info=True)
+                continue
+            if text:
+                texts.append(text)
+                length += len(text)
+            if length >= MAX_TEXT_LENGTH:
+                break
+        text = '\n'.join(texts)[:MAX_TEXT_LENGTH]
+        return text if is_readable(text) else ''
+
+    def thumbnail(self):
+        """Return the JPEG bytes of the first page, or None."""
+        if not self.pages or shutil.which(PDFTOPPM) is None:
+            return None
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'paper.pdf')
+            with open(source, 'wb') as pdf_file:
+                pdf_file.write(self.data)
+            root = os.path.join(directory, 'page')
+            try:
+                subprocess.run(
+                    [
+                        PDFTOPPM, '-f', '1', '-l', '1', '-singlefile',
+                        '-png', '-scale-to', str(max(THUMBNAIL_SIZE)),
+                        source, root,
+                    ],
+                    check=True, capture_output=True, timeout=RENDER_TIMEOUT,
+                )
+                image = Image.open(root + '.png')
+                image.load()
+            except (OSError, subprocess.SubprocessError):
+                logger.warning('Rendering a PDF page failed', exc_info=True)
+                return None
+
+        image.thumbnail(THUMBNAIL_SIZE, Image.LANCZOS)
+        output = io.BytesIO()
+        image.convert('RGB').save(output, format='JPEG', quality=85)
+        return output.getvalue()
@@ -1,11 +1,126 @@
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
-from core.models import Paper
+from core.models import Keyword, Paper
+from .uploads import (
+    PDF_MAGIC,
+    StoredPDF,
+    release_pdf,
+    remember_stored_pdf,
+    store_pdf,
+)
+
+
+def split_keywords(text):
+    """Return the normalized, de-duplicated keywords of a keywords text."""
+    names = (
+        " ".join(part.split()).lower()[:100]
+        for part in re.split(r"[,;]", text or "")
+    )
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def resolve_keywords(names):
+    """Return {name: Keyword}, creating the missing keywords in one batch."""
+    names = set(names)
+    if not names:
+        return {}
+
+    keywords = {k.name: k for k in Keyword.objects.filter(name__in=names)}
+    missing = names - keywords.keys()
+    if missing:
+        # ignore_conflicts: a concurrent request may create the same names.
+        Keyword.objects.bulk_create(
+            [Keyword(name=name) for name in missing],
+            ignore_conflicts=True,
+        )
+        keywords.update(
+            (k.name, k) for k in Keyword.objects.filter(name__in=missing)
+        )
+    return keywords
+
+
+def validate_pdf(value):
+    """Check an uploaded PDF that was not checked while streaming."""
+    if isinstance(value, StoredPDF):
+        return value
+
+    max_size = settings.PAPER_PDF_MAX_SIZE
+    if value.size > max_size:
+        raise serializers.ValidationError(
+            f"PDF must be <= {max_size // (1024 * 1024)}MB."
+        )
+    # The declared content type comes from the client, check the content.
+    head = value.read(len(PDF_MAGIC))
+    value.seek(0)
+    if head != PDF_MAGIC:
+        raise serializers.ValidationError("Only PDF files are allowed.")
+    return value
+
+
+def _file_url(route, paper, request=None):
+    url = reverse(route, args=[paper.event_id, paper.pk])
+    return request.build_absolute_uri(url) if request else url
+
+
+def pdf_download_url(paper, request=None):
+    """Return the URL of the permission-checked download of a paper's PDF.
+
+    Stored files are not public: their media URL must never be exposed.
+    """
+    if not paper.pdf_file:
+        return None
+    return _file_url("event-papers-pdf", paper, request)
+
+
+def thumbnail_url(paper, request=None):
+    """Return the URL of a paper's thumbnail, served like its PDF."""
+    if not paper.thumbnail:
+        return None
+    return _file_url("event-papers-thumbnail", paper, request)
+
+
+class PDFFieldMixin:
+    """Validate pdf_file and point it at the content-addressed file."""
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data["pdf_file"] = pdf_download_url(
+            instance, self.context.get("request"),
+        )
+        return data
+
+    def validate_pdf_file(self, value):
+        return validate_pdf(value)
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        pdf = attrs.get("pdf_file")
+        if pdf is not None:
+            if not isinstance(pdf, StoredPDF):
+                pdf = store_pdf(pdf)
+                remember_stored_pdf(self.context["request"], pdf)
+            # A name, so the model field doesn't save the file again.
+            attrs["pdf_file"] = pdf.path
+            attrs["pdf_sha256"] = pdf.sha256
+        return attrs
+
+
+class KeywordCountSerializer(serializers.Serializer):
+    """Serializer for a keyword facet (keyword and its paper count)."""
+    name = serializers.CharField()
+    count = serializers.IntegerField()
 
 
 class PaperSerializer(serializers.ModelSerializer):
     """Serializer for paper list/detail (read)."""
     author_email = serializers.EmailField(source="author.email", read_only=True)
     event_title = serializers.CharField(source="event.title", read_only=True)
+    pdf_file = serializers.SerializerMethodField()
+    thumbnail = serializers.SerializerMethodField()
 
     class Meta:
         model = Paper
@@ -20,13 +135,32 @@ class PaperSerializer(serializers.ModelSerializer):
             "keywords",
             "paper_type",
             "pdf_file",
+            "page_count",
+            "thumbnail",
             "status",
             "created_at",
         ]
         read_only_fields = fields
 
+    def get_pdf_file(self, obj):
+        return pdf_download_url(obj, self.context.get("request"))
+
+    def get_thumbnail(self, obj):
+        return thumbnail_url(obj, self.context.get("request"))
+
+
+class PaperListSerializer(PaperSerializer):
+    """Serializer for paper list, without the (large) abstract."""
+
+    class Meta(PaperSerializer.Meta):
+        fields = [
+            field for field in PaperSerializer.Meta.fields
+            if field != "abstract"
+        ]
+        read_only_fields = fields
+
 
-class PaperCreateSerializer(serializers.ModelSerializer):
+class PaperCreateSerializer(PDFFieldMixin, serializers.ModelSerializer):
     """Serializer for creating a paper (author)."""
 
     class Meta:
@@ -38,13 +172,15 @@ class PaperCreateSerializer(serializers.ModelSerializer):
             "pdf_file": {"required": True}
         }
 
-    def validate_pdf_file(self, value):
-        if hasattr(value, "content_type") and value.content_type != "application/pdf":
-            raise serializers.ValidationError("Only PDF files are allowed.")
-        max_mb = 10
-        if value.size > max_mb * 1024 * 1024:
-            raise serializers.ValidationError(f"PDF must be <= {max_mb}MB.")
-        return value
+    def create(self, validated_data):
+        paper = super().create(validated_data)
+        keywords = resolve_keywords(split_keywords(paper.keywords))
+        PaperKeyword = Paper.keyword_tags.through
+        PaperKeyword.objects.bulk_create([
+            PaperKeyword(paper_id=paper.id, keyword_id=keyword.id)
+            for keyword in keywords.values()
+        ])
+        return paper
 
 
 class PaperStatusSerializer(serializers.ModelSerializer):
@@ -56,7 +192,7 @@ class PaperStatusSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class PaperPDFSerializer(serializers.ModelSerializer):
+class PaperPDFSerializer(PDFFieldMixin, serializers.ModelSerializer):
     """Serializer for uploading/replacing PDF (optional)."""
 
     class Meta:
@@ -64,3 +200,10 @@ class PaperPDFSerializer(serializers.ModelSerializer):
         fields = ["id", "pdf_file"]
         read_only_fields = ["id"]
         extra_kwargs = {"pdf_file": {"required": True}}
+
+    def update(self, instance, validated_data):
+        replaced = instance.pdf_file.name
+        paper = super().update(instance, validated_data)
+        if replaced and replaced != paper.pdf_file.name:
+            transaction.on_commit(lambda: release_pdf(replaced))
+        return paper
@@ -0,0 +1,39 @@
+"""Signal handlers that release paper files and keep validators fresh."""
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import Paper, User
+from paper.uploads import PDF_FIELD, THUMBNAIL_FIELD, release_pdf
+
+
+@receiver(post_delete, sender=Paper)
+def paper_deleted(sender, instance, **kwargs):
+    """Delete the paper's PDF and thumbnail once no other paper shares them."""
+    for field in (PDF_FIELD, THUMBNAIL_FIELD):
+        name = getattr(instance, field).name
+        if name:
+            transaction.on_commit(
+                lambda name=name, field=field: release_pdf(name, field=field)
+            )
+
+
+def _touch_papers(author_id):
+    Paper.objects.filter(author_id=author_id).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=User)
+def author_changed(sender, instance, created, update_fields=None, **kwargs):
+    """Bump updated_at of the papers of a user, which embed their email.
+
+    Bumped again once the transaction commits, like event.signals does.
+    """
+    if created or (update_fields is not None and 'email' not in update_fields):
+        return
+    _touch_papers(instance.pk)
+    transaction.on_commit(partial(_touch_papers, instance.pk))
@@ -0,0 +1,402 @@
+"""Tests for the paper APIs."""
+import json
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Event, Keyword, Paper
+from event.tests.helpers import create_event, create_user
+from paper.serializers import resolve_keywords, split_keywords
+
+
+def papers_url(event_id):
+    """Create and return the paper list URL of an event."""
+    return reverse('event-papers-list', args=[event_id])
+
+
+def paper_detail_url(event_id, paper_id):
+    """Create and return a paper detail URL."""
+    return reverse('event-papers-detail', args=[event_id, paper_id])
+
+
+def create_paper(event, author, **params):
+    """Create and return a simple paper."""
+    defaults = {
+        'title': 'Sample paper',
+        'abstract': 'Sample abstract',
+        'keywords': 'ai, security',
+        'paper_type': Paper.PaperType.ORAL,
+    }
+    defaults.update(params)
+    return Paper.objects.create(event=event, author=author, **defaults)
+
+
+class PaperConditionalGetTests(TestCase):
+    """Test ETag handling on paper reads."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = create_user(
+            email='author@example.com', password='testpass123',
+            role='author',
+        )
+        self.event = create_event(user=self.author)
+        self.paper = create_paper(self.event, self.author)
+
+    def test_list_not_modified(self):
+        """Test a matching If-None-Match on the list returns 304."""
+        url = papers_url(self.event.id)
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_changes_on_status_change(self):
+        """Test changing a paper status changes the list ETag."""
+        url = papers_url(self.event.id)
+        etag = self.client.get(url)['ETag']
+
+        self.paper.status = Paper.Status.ACCEPTED
+        self.paper.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_on_event_rename(self):
+        """Test renaming the event changes the list ETag."""
+        url = papers_url(self.event.id)
+        etag = self.client.get(url)['ETag']
+
+        self.event.title = 'New title'
+        self.event.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['event_title'], 'New title')
+
+    def test_detail_etag_changes_on_event_rename(self):
+        """Test renaming the event changes the paper ETag."""
+        url = paper_detail_url(self.event.id, self.paper.id)
+        etag = self.client.get(url)['ETag']
+
+        self.event.title = 'New title'
+        self.event.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_on_author_email_change(self):
+        """Test changing the author email changes the list ETag."""
+        url = papers_url(self.event.id)
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.email = 'new@example.com'
+            self.author.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'][0]['author_email'], 'new@example.com',
+        )
+
+    def test_detail_not_modified(self):
+        """Test a matching If-None-Match on a paper returns 304."""
+        url = paper_detail_url(self.event.id, self.paper.id)
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class PaperCounterTests(TestCase):
+    """Test paper counters kept on events."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'admin123',
+        )
+        self.client.force_authenticate(self.admin)
+        self.event = create_event(user=self.admin)
+        self.paper = create_paper(self.event, self.admin)
+        Event.objects.filter(pk=self.event.pk).update(papers_submitted=1)
+
+    def test_set_status_moves_counter(self):
+        """Test accepting a paper moves it between counters."""
+        url = reverse(
+            'event-papers-set-status', args=[self.event.id, self.paper.id],
+        )
+
+        res = self.client.patch(url, {'status': 'accepted'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.papers_submitted, 0)
+        self.assertEqual(self.event.papers_accepted, 1)
+
+    def test_delete_uncounts_paper(self):
+        """Test deleting a paper decrements its status counter."""
+        url = paper_detail_url(self.event.id, self.paper.id)
+
+        self.client.delete(url)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.papers_submitted, 0)
+
+
+class PaperListTests(TestCase):
+    """Test listing papers."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = create_user(
+            email='owner@example.com', password='testpass123',
+        )
+        self.event = create_event(user=self.owner)
+
+    def test_list_query_count_is_constant(self):
+        """Test listing papers does not query authors or events per row."""
+        for i in range(5):
+            author = create_user(
+                email=f'author{i}@example.com', password='testpass123',
+                role='author',
+            )
+            create_paper(self.event, author, title=f'Paper {i}')
+
+        # ETag validators, papers joined with authors and events.
+        with self.assertNumQueries(2):
+            res = self.client.get(papers_url(self.event.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 5)
+        self.assertEqual(
+            res.data['results'][0]['author_email'], 'author4@example.com',
+        )
+        self.assertEqual(
+            res.data['results'][0]['event_title'], self.event.title,
+        )
+
+    def test_list_omits_abstract(self):
+        """Test the list leaves out abstracts and detail includes them."""
+        paper = create_paper(self.event, self.owner)
+
+        res = self.client.get(papers_url(self.event.id))
+        self.assertNotIn('abstract', res.data['results'][0])
+
+        res = self.client.get(paper_detail_url(self.event.id, paper.id))
+        self.assertEqual(res.data['abstract'], paper.abstract)
+
+    def test_list_defers_abstract_column(self):
+        """Test the list query does not select the abstract column."""
+        create_paper(self.event, self.owner)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(papers_url(self.event.id))
+
+        self.assertNotIn('"abstract"', queries[-1]['sql'])
+
+    def test_list_pages_through_tied_dates(self):
+        """Test papers submitted at the same time are each listed once."""
+        papers = [
+            create_paper(self.event, self.owner, title=f'Paper {i}')
+            for i in range(5)
+        ]
+        Paper.objects.update(created_at=papers[0].created_at)
+
+        ids = []
+        res = self.client.get(papers_url(self.event.id), {'page_size': 2})
+        while True:
+            ids += [p['id'] for p in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(ids, [p.id for p in reversed(papers)])
+
+
+class PaperStreamTests(TestCase):
+    """Test streaming paper lists."""
+
+    def test_stream_ndjson(self):
+        """Test ?format=ndjson streams every paper of the event."""
+        author = create_user(
+            email='author@example.com', password='testpass123',
+            role='author',
+        )
+        event = create_event(user=author)
+        for i in range(3):
+            create_paper(event, author, title=f'Paper {i}')
+        client = APIClient()
+
+        res = client.get(papers_url(event.id), {'format': 'ndjson'})
+
+        lines = b''.join(res.streaming_content).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertNotIn('abstract', json.loads(lines[0]))
+
+
+class PaperExportTests(TestCase):
+    """Test exporting the papers of an event."""
+
+    def test_export_csv(self):
+        """Test admins export every paper with its author as CSV."""
+        author = create_user(
+            email='author@example.com', password='testpass123',
+            role='author', name='Author',
+        )
+        admin = get_user_model().objects.create_superuser(
+            email='admin@example.com', password='testpass123',
+        )
+        event = create_event(user=author)
+        for i in range(3):
+            create_paper(event, author, title=f'Paper {i}')
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        with self.assertNumQueries(1):
+            res = client.get(
+                reverse('event-papers-export', args=[event.id])
+            )
+            body = b''.join(res.streaming_content).decode()
+
+        lines = body.splitlines()
+        self.assertEqual(lines[0].split(',')[:4],
+                         ['id', 'title', 'author_email', 'author_name'])
+        self.assertEqual(len(lines), 4)
+        self.assertIn('Paper 0,author@example.com,Author', lines[1])
+
+    def test_export_requires_admin(self):
+        """Test authors cannot export papers."""
+        author = create_user(
+            email='author@example.com', password='testpass123',
+            role='author',
+        )
+        event = create_event(user=author)
+        client = APIClient()
+        client.force_authenticate(author)
+
+        res = client.get(reverse('event-papers-export', args=[event.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PaperSearchTests(TestCase):
+    """Test the ?q= search of paper lists."""
+
+    def test_search_title_abstract_keywords(self):
+        """Test papers are searched by title, keywords and abstract."""
+        author = create_user(
+            email='author@example.com', password='testpass123',
+            role='author',
+        )
+        event = create_event(user=author)
+        title = create_paper(event, author, title='Graph networks')
+        keywords = create_paper(event, author, keywords='graph, ml')
+        abstract = create_paper(event, author, abstract='A graph method')
+        create_paper(event, author, title='Unrelated')
+        client = APIClient()
+
+        res = client.get(papers_url(event.id), {'q': 'graph'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [p['id'] for p in res.data['results']],
+            [title.id, keywords.id, abstract.id],
+        )
+
+
+def tag_paper(paper):
+    """Link a paper to the keywords of its keywords text."""
+    keywords = resolve_keywords(split_keywords(paper.keywords))
+    paper.keyword_tags.set(keywords.values())
+    return paper
+
+
+class PaperKeywordTests(TestCase):
+    """Test keyword tags, filtering and facets."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = create_user(
+            email='author@example.com', password='testpass123',
+            role='author',
+        )
+        self.event = create_event(user=self.author)
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def test_split_keywords(self):
+        """Test keywords are trimmed, lowercased and de-duplicated."""
+        self.assertEqual(
+            split_keywords(' Machine  Learning, AI;ai ,, '),
+            ['machine learning', 'ai'],
+        )
+
+    def test_create_paper_tags_keywords(self):
+        """Test submitting a paper links its keywords."""
+        Keyword.objects.create(name='ai')
+        self.client.force_authenticate(self.author)
+        pdf = SimpleUploadedFile(
+            'paper.pdf', b'%PDF-1.4 test', content_type='application/pdf',
+        )
+
+        with self.settings(MEDIA_ROOT=self.media_root):
+            res = self.client.post(papers_url(self.event.id), {
+                'title': 'Paper',
+                'abstract': 'Abstract',
+                'keywords': 'AI, Graphs',
+                'paper_type': 'oral',
+                'pdf_file': pdf,
+            }, format='multipart')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        paper = Paper.objects.get(id=res.data['id'])
+        self.assertEqual(
+            sorted(paper.keyword_tags.values_list('name', flat=True)),
+            ['ai', 'graphs'],
+        )
+        self.assertEqual(Keyword.objects.count(), 2)
+
+    def test_filter_by_keyword(self):
+        """Test ?keyword= returns only the papers tagged with it."""
+        tagged = tag_paper(create_paper(
+            self.event, self.author, keywords='Deep Learning, vision',
+        ))
+        tag_paper(create_paper(
+            self.event, self.author, keywords='deep learning theory',
+        ))
+
+        res = self.client.get(
+            papers_url(self.event.id), {'keyword': 'deep  LEARNING'},
+        )
+
+        self.assertEqual([p['id'] for p in res.data['results']], [tagged.id])
+
+    def test_keyword_facets(self):
+        """Test the facet endpoint counts papers per keyword in one query."""
+        tag_paper(create_paper(self.event, self.author, keywords='ai, nlp'))
+        tag_paper(create_paper(self.event, self.author, keywords='ai'))
+        other = create_event(user=self.author)
+        tag_paper(create_paper(other, self.author, keywords='nlp, vision'))
+
+        url = reverse('event-papers-keywords', args=[self.event.id])
+        with self.assertNumQueries(1):
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [
+            {'name': 'ai', 'count': 2},
+            {'name': 'nlp', 'count': 1},
+        ])
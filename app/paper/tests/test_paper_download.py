@@ -0,0 +1,283 @@
+"""Tests for the paper PDF download endpoint."""
+import os
+import shutil
+import tempfile
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import Http404
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.downloads import (
+    UnsatisfiableRange,
+    parse_range,
+    serve_public_media,
+)
+from core.models import Event, Paper
+from paper.uploads import store_pdf
+
+MEDIA_ROOT = tempfile.mkdtemp()
+PDF = b'%PDF-1.4\n' + bytes(range(256)) * 4
+
+
+def pdf_url(event_id, paper_id):
+    """Create and return the PDF download URL of a paper."""
+    return reverse('event-papers-pdf', args=[event_id, paper_id])
+
+
+def thumbnail_url(event_id, paper_id):
+    """Create and return the thumbnail URL of a paper."""
+    return reverse('event-papers-thumbnail', args=[event_id, paper_id])
+
+
+def content(res):
+    """Return the body of a (streaming) response."""
+    return b''.join(res.streaming_content)
+
+
+class ParseRangeTests(SimpleTestCase):
+    """Test Range headers are parsed into byte ranges."""
+
+    def test_ranges(self):
+        self.assertEqual(parse_range('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range('bytes=90-', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=50-500', 100), (50, 99))
+        self.assertEqual(parse_range('bytes=-500', 100), (0, 99))
+
+    def test_whole_file(self):
+        """Test malformed and multiple ranges fall back to the whole file."""
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range('bytes=0-1,5-9', 100))
+        self.assertIsNone(parse_range('items=0-9', 100))
+        self.assertIsNone(parse_range('bytes=9-0', 100))
+
+    def test_unsatisfiable(self):
+        with self.assertRaises(UnsatisfiableRange):
+            parse_range('bytes=100-', 100)
+        with self.assertRaises(UnsatisfiableRange):
+            parse_range('bytes=-0', 100)
+
+
+class PublicMediaTests(SimpleTestCase):
+    """Test the development media route keeps paper PDFs private."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        for name in ('papers/ab/paper.pdf', 'thumbnails/paper.jpg'):
+            path = os.path.join(self.root, 'uploads', name)
+            os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as media_file:
+                media_file.write(b'data')
+
+    def serve(self, path):
+        request = RequestFactory().get('/static/media/' + path)
+        return serve_public_media(request, path, document_root=self.root)
+
+    def test_thumbnail_served(self):
+        res = self.serve('uploads/thumbnails/paper.jpg')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_paper_pdf_not_served(self):
+        for path in (
+            'uploads/papers/ab/paper.pdf',
+            'uploads/../uploads/papers/ab/paper.pdf',
+            'uploads//papers/ab/paper.pdf',
+        ):
+            with self.subTest(path=path), self.assertRaises(Http404):
+                self.serve(path)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class PaperPDFDownloadTests(TestCase):
+    """Test downloading paper PDFs."""
+
+    def setUp(self):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        User = get_user_model()
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123',
+        )
+        self.author = User.objects.create_user(
+            email='author@example.com', password='testpass123',
+            role='author',
+        )
+        self.event = Event.objects.create(
+            user=self.organizer, title='Event', description='Description',
+            location='Oran', start_date=date(2025, 12, 12),
+            end_date=date(2025, 12, 31),
+        )
+        stored = store_pdf(SimpleUploadedFile('paper.pdf', PDF))
+        self.paper = Paper.objects.create(
+            event=self.event, author=self.author, title='Paper',
+            abstract='Abstract', keywords='ai', paper_type='oral',
+            pdf_file=stored.path, pdf_sha256=stored.sha256,
+        )
+        self.etag = f'"{stored.sha256}"'
+        self.url = pdf_url(self.event.id, self.paper.id)
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def test_download(self):
+        """Test the whole file is sent with its validators."""
+        res = self.client.get(self.url, HTTP_ACCEPT='application/pdf')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(content(res), PDF)
+        self.assertEqual(res['Content-Type'], 'application/pdf')
+        self.assertEqual(res['Content-Length'], str(len(PDF)))
+        self.assertEqual(res['ETag'], self.etag)
+        self.assertEqual(res['Accept-Ranges'], 'bytes')
+        self.assertIn('private', res['Cache-Control'])
+
+    def test_range(self):
+        """Test a byte range gets a 206 with only those bytes."""
+        res = self.client.get(self.url, HTTP_RANGE='bytes=5-104')
+
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(content(res), PDF[5:105])
+        self.assertEqual(res['Content-Length'], '100')
+        self.assertEqual(res['Content-Range'], f'bytes 5-104/{len(PDF)}')
+
+    def test_range_not_satisfiable(self):
+        res = self.client.get(self.url, HTTP_RANGE=f'bytes={len(PDF)}-')
+
+        self.assertEqual(
+            res.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        )
+        self.assertEqual(res['Content-Range'], f'bytes */{len(PDF)}')
+
+    def test_if_range_changed(self):
+        """Test a stale If-Range gets the whole file instead of a range."""
+        res = self.client.get(
+            self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"old"',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(content(res), PDF)
+
+    def test_not_modified(self):
+        """Test a client with the current copy gets a 304."""
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], self.etag)
+
+    def test_organizer_and_staff_allowed(self):
+        staff = get_user_model().objects.create_superuser(
+            'admin@example.com', 'admin123',
+        )
+        for user in (self.organizer, staff):
+            self.client.force_authenticate(user)
+            res = self.client.get(self.url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_other_user_forbidden(self):
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='testpass123',
+        )
+        self.client.force_authenticate(other)
+
+        res = self.client.get(self.url, HTTP_ACCEPT='application/pdf')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_anonymous_rejected(self):
+        res = APIClient().get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(
+        PAPER_PDF_SERVE='x-accel-redirect',
+        PAPER_PDF_ACCEL_PREFIX='/internal/',
+    )
+    def test_x_accel_redirect(self):
+        """Test the file is handed over to nginx."""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res['X-Accel-Redirect'], f'/internal/{self.paper.pdf_file.name}',
+        )
+        self.assertEqual(res.content, b'')
+        self.assertEqual(res['ETag'], self.etag)
+
+    @override_settings(PAPER_PDF_SERVE='x-sendfile')
+    def test_x_sendfile(self):
+        res = self.client.get(self.url)
+
+        self.assertEqual(res['X-Sendfile'], self.paper.pdf_file.path)
+        self.assertEqual(res.content, b'')
+
+    def test_paper_links_to_download(self):
+        """Test papers link to the checked download, not the stored file."""
+        expected = f'http://testserver{self.url}'
+
+        res = self.client.get(
+            reverse('event-papers-detail', args=[self.event.id, self.paper.id])
+        )
+        self.assertEqual(res.data['pdf_file'], expected)
+
+        res = self.client.get(
+            reverse('event-papers-list', args=[self.event.id])
+        )
+        self.assertEqual(res.data['results'][0]['pdf_file'], expected)
+
+    def test_upload_links_to_download(self):
+        """Test the upload response doesn't expose the stored file either."""
+        res = self.client.post(
+            reverse('event-papers-list', args=[self.event.id]),
+            {
+                'title': 'Other', 'abstract': 'Abstract', 'keywords': 'ai',
+                'paper_type': 'oral',
+                'pdf_file': SimpleUploadedFile('other.pdf', PDF),
+            },
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            res.data['pdf_file'],
+            f'http://testserver{pdf_url(self.event.id, res.data["id"])}',
+        )
+
+    def test_thumbnail(self):
+        """Test anyone gets the thumbnail through the API, not the media."""
+        name = self.paper.thumbnail.storage.save(
+            'uploads/thumbnails/abc.jpg', ContentFile(b'jpeg'),
+        )
+        Paper.objects.filter(pk=self.paper.pk).update(thumbnail=name)
+        url = thumbnail_url(self.event.id, self.paper.id)
+
+        res = APIClient().get(url, HTTP_ACCEPT='image/jpeg')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(content(res), b'jpeg')
+        self.assertEqual(res['Content-Type'], 'image/jpeg')
+        self.assertEqual(res['ETag'], '"abc"')
+        res = APIClient().get(
+            reverse('event-papers-detail', args=[self.event.id, self.paper.id])
+        )
+        self.assertEqual(res.data['thumbnail'], f'http://testserver{url}')
+
+    def test_no_thumbnail(self):
+        res = APIClient().get(thumbnail_url(self.event.id, self.paper.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        res = APIClient().get(
+            reverse('event-papers-detail', args=[self.event.id, self.paper.id])
+        )
+        self.assertIsNone(res.data['thumbnail'])
@@ -0,0 +1,367 @@
+"""Tests for the background processing of papers."""
+import io
+import os
+import shutil
+import tempfile
+import zlib
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Event, Paper, PaperJob
+from paper.jobs import MAX_ATTEMPTS, LEASE, claim_jobs, enqueue, run_job
+from paper.processing import (
+    PDFTOPPM,
+    THUMBNAIL_SIZE,
+    PDFContents,
+    PDFError,
+)
+from paper.uploads import store_pdf
+
+MEDIA_ROOT = tempfile.mkdtemp()
+CID_FONTS_PDF = os.path.join(
+    os.path.dirname(__file__), 'data', 'cid_fonts.pdf',
+)
+
+
+def make_pdf(text=b'(Quantum annealing) Tj'):
+    """Return a valid two page PDF showing text on its first page."""
+    content = zlib.compress(b'BT /F1 12 Tf 72 712 Td ' + text + b' ET')
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+        b'/Resources << /Font << /F1 6 0 R >> >> /Contents 5 0 R >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>',
+        b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream'
+        % (len(content), content),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    pdf = b'%PDF-1.4\n'
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n%s\nendobj\n' % (number, obj)
+    xref = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    pdf += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    pdf += (
+        b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+        % (len(objects) + 1, xref)
+    )
+    return pdf
+
+
+def create_paper(content=None, **params):
+    """Create and return a paper with a stored PDF."""
+    user = get_user_model().objects.create_user(
+        email=f'author{Paper.objects.count()}@example.com',
+        password='testpass123', role='author',
+    )
+    event = Event.objects.create(
+        user=user, title='Event', description='Description',
+        location='Oran', start_date=date(2025, 12, 12),
+        end_date=date(2025, 12, 31),
+    )
+    stored = store_pdf(SimpleUploadedFile('paper.pdf', content or make_pdf()))
+    defaults = {
+        'title': 'Paper',
+        'abstract': 'Abstract',
+        'keywords': 'ai',
+        'paper_type': 'oral',
+    }
+    defaults.update(params)
+    return Paper.objects.create(
+        event=event, author=user, pdf_file=stored.path,
+        pdf_sha256=stored.sha256, **defaults,
+    )
+
+
+class PDFContentsTests(TestCase):
+    """Test reading pages, text and the first page from PDF files."""
+
+    def test_page_count_and_text(self):
+        pdf = PDFContents(make_pdf(
+            b'(Hello \\(PDF\\)) Tj 0 -14 Td [(wor) -20 (ld)] TJ'
+        ))
+
+        self.assertEqual(pdf.page_count(), 2)
+        self.assertEqual(pdf.text(), 'Hello (PDF)\nworld')
+
+    def test_text_of_cid_fonts(self):
+        """Test text shown with Type0 fonts is decoded by their CMaps."""
+        with open(CID_FONTS_PDF, 'rb') as pdf_file:
+            pdf = PDFContents(pdf_file.read())
+
+        self.assertEqual(pdf.page_count(), 2)
+        self.assertTrue(pdf.text().startswith(
+            'So The Event object is like say is the big one',
+        ))
+        self.assertIn('Event Schedule', pdf.text())
+        self.assertNotIn('AdobeUCS', pdf.text())
+
+    def test_unreadable_text_dropped(self):
+        """Test glyph codes without a Unicode mapping aren't returned."""
+        pdf = PDFContents(make_pdf(b'<0102030405> Tj'))
+
+        self.assertEqual(pdf.text(), '')
+
+    def test_damaged_document(self):
+        with self.assertRaises(PDFError):
+            PDFContents(b'%PDF-1.4\nnot really')
+
+    @skipUnless(shutil.which(PDFTOPPM), 'needs Poppler')
+    def test_thumbnail_renders_first_page(self):
+        with open(CID_FONTS_PDF, 'rb') as pdf_file:
+            pdf = PDFContents(pdf_file.read())
+
+        thumbnail = Image.open(io.BytesIO(pdf.thumbnail()))
+
+        self.assertEqual(thumbnail.format, 'JPEG')
+        self.assertLessEqual(thumbnail.size, THUMBNAIL_SIZE)
+        self.assertEqual(max(thumbnail.size), max(THUMBNAIL_SIZE))
+
+    def test_no_thumbnail_without_renderer(self):
+        with mock.patch('paper.processing.PDFTOPPM', 'no-such-pdftoppm'):
+            self.assertIsNone(PDFContents(make_pdf()).thumbnail())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class PaperJobTests(TestCase):
+    """Test queueing and running paper jobs."""
+
+    def setUp(self):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_submit_queues_job(self):
+        """Test submitting a paper queues its processing and returns."""
+        author = get_user_model().objects.create_user(
+            email='author@example.com', password='testpass123',
+            role='author',
+        )
+        event = Event.objects.create(
+            user=author, title='Event', description='Description',
+            location='Oran', start_date=date(2025, 12, 12),
+            end_date=date(2025, 12, 31),
+        )
+        client = APIClient()
+        client.force_authenticate(author)
+
+        res = client.post(
+            reverse('event-papers-list', args=[event.id]),
+            {
+                'title': 'Paper', 'abstract': 'Abstract', 'keywords': 'ai',
+                'paper_type': 'oral',
+                'pdf_file': SimpleUploadedFile('paper.pdf', make_pdf()),
+            },
+            format='multipart',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        job = PaperJob.objects.get(paper_id=res.data['id'])
+        self.assertEqual(job.status, PaperJob.Status.PENDING)
+        self.assertIsNone(Paper.objects.get(id=res.data['id']).page_count)
+
+    def test_run_job(self):
+        """Test a job stores the page count, text and thumbnail."""
+        paper = create_paper()
+        enqueue(paper)
+
+        [job] = claim_jobs(10)
+        self.assertEqual(run_job(job), PaperJob.Status.DONE)
+
+        paper.refresh_from_db()
+        self.assertEqual(paper.page_count, 2)
+        self.assertEqual(paper.pdf_text, 'Quantum annealing')
+
+    @skipUnless(shutil.which(PDFTOPPM), 'needs Poppler')
+    def test_run_job_stores_thumbnail(self):
+        paper = create_paper()
+        run_job(enqueue(paper))
+
+        paper.refresh_from_db()
+        self.assertEqual(
+            paper.thumbnail.name,
+            f'uploads/thumbnails/{paper.pdf_sha256}.jpg',
+        )
+        self.assertTrue(os.path.exists(paper.thumbnail.path))
+
+    def test_run_job_without_renderer(self):
+        """Test no thumbnail is stored when the page can't be rendered."""
+        paper = create_paper()
+
+        with mock.patch('paper.processing.PDFTOPPM', 'no-such-pdftoppm'):
+            run_job(enqueue(paper))
+
+        paper.refresh_from_db()
+        self.assertEqual(paper.page_count, 2)
+        self.assertFalse(paper.thumbnail)
+        self.assertFalse(
+            os.path.exists(os.path.join(MEDIA_ROOT, 'uploads/thumbnails'))
+        )
+
+    def test_run_job_damaged_pdf(self):
+        """Test nothing is stored from, nor retried on, an unreadable PDF."""
+        paper = create_paper(b'%PDF-1.4\nnot really', page_count=3,
+                             pdf_text='Old text')
+
+        self.assertEqual(run_job(enqueue(paper)), PaperJob.Status.FAILED)
+
+        paper.refresh_from_db()
+        self.assertIsNone(paper.page_count)
+        self.assertEqual(paper.pdf_text, '')
+        self.assertFalse(paper.thumbnail)
+
+    def test_stale_job_stores_nothing(self):
+        """Test a job doesn't overwrite the results of a newer PDF."""
+        paper = create_paper()
+        job = enqueue(paper)
+        stored = store_pdf(
+            SimpleUploadedFile('new.pdf', make_pdf(b'(New) Tj')),
+        )
+        Paper.objects.filter(pk=paper.pk).update(
+            pdf_file=stored.path, pdf_sha256=stored.sha256,
+            page_count=1, pdf_text='New',
+        )
+
+        run_job(job)
+
+        paper.refresh_from_db()
+        self.assertEqual(paper.page_count, 1)
+        self.assertEqual(paper.pdf_text, 'New')
+
+    def test_replaced_thumbnail_released(self):
+        """Test the thumbnail of the previous PDF is released."""
+        paper = create_paper()
+        old = paper.thumbnail.storage.save(
+            'uploads/thumbnails/old.jpg', ContentFile(b'jpeg'),
+        )
+        Paper.objects.filter(pk=paper.pk).update(thumbnail=old)
+        paper.refresh_from_db()
+
+        with mock.patch(
+            'paper.jobs.release_pdf',
+        ) as release, self.captureOnCommitCallbacks(execute=True):
+            run_job(enqueue(paper))
+
+        release.assert_called_once_with(old, field='thumbnail')
+
+    def test_processed_text_searchable(self):
+        """Test the extracted text is searched with the paper fields."""
+        paper = create_paper()
+        run_job(enqueue(paper))
+
+        res = APIClient().get(
+            reverse('event-papers-list', args=[paper.event_id]),
+            {'q': 'annealing'},
+        )
+
+        self.assertEqual(
+            [row['id'] for row in res.data['results']], [paper.id],
+        )
+        self.assertEqual(res.data['results'][0]['page_count'], 2)
+
+    def test_claim_due_jobs_once(self):
+        """Test claimed, future and finished jobs aren't claimed."""
+        paper = create_paper()
+        due = enqueue(paper)
+        PaperJob.objects.create(
+            paper=paper, run_after=timezone.now() + timedelta(minutes=1),
+        )
+        PaperJob.objects.create(paper=paper, status=PaperJob.Status.DONE)
+
+        self.assertEqual([job.id for job in claim_jobs(10)], [due.id])
+        self.assertEqual(claim_jobs(10), [])
+
+        due.refresh_from_db()
+        self.assertEqual(due.status, PaperJob.Status.RUNNING)
+        self.assertEqual(due.attempts, 1)
+
+    def test_reclaim_expired_lease(self):
+        """Test a job left running by a dead worker runs again."""
+        job = enqueue(create_paper())
+        claim_jobs(10)
+        PaperJob.objects.filter(id=job.id).update(
+            locked_at=timezone.now() - LEASE - timedelta(seconds=1),
+        )
+
+        [job] = claim_jobs(10)
+
+        self.assertEqual(job.attempts, 2)
+
+    def test_retry_then_fail(self):
+        """Test failures are retried later, then marked failed."""
+        job = enqueue(create_paper())
+
+        with mock.patch(
+            'paper.jobs.process_paper', side_effect=ValueError('broken'),
+        ):
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                PaperJob.objects.filter(id=job.id).update(
+                    run_after=timezone.now(),
+                )
+                [job] = claim_jobs(10)
+                status_ = run_job(job)
+                if attempt < MAX_ATTEMPTS:
+                    self.assertEqual(status_, PaperJob.Status.PENDING)
+                    self.assertGreater(job.run_after, timezone.now())
+
+        self.assertEqual(status_, PaperJob.Status.FAILED)
+        self.assertEqual(job.attempts, MAX_ATTEMPTS)
+        self.assertEqual(job.last_error, 'ValueError: broken')
+
+    @skipUnless(shutil.which(PDFTOPPM), 'needs Poppler')
+    def test_identical_pdfs_share_thumbnail(self):
+        first = create_paper()
+        second = create_paper()
+        run_job(enqueue(first))
+        run_job(enqueue(second))
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.thumbnail.name, second.thumbnail.name)
+        self.assertEqual(
+            os.listdir(os.path.join(MEDIA_ROOT, 'uploads/thumbnails')),
+            [f'{first.pdf_sha256}.jpg'],
+        )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ProcessPaperJobsCommandTests(TransactionTestCase):
+    """Test the worker command."""
+
+    def test_process_queue(self):
+        """Test the command drains the due jobs from worker threads."""
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        papers = [
+            create_paper(make_pdf(b'(Paper %d) Tj' % index))
+            for index in range(3)
+        ]
+        for paper in papers:
+            enqueue(paper)
+        out = StringIO()
+
+        call_command(
+            'process_paper_jobs', '--once', '--concurrency', '2', stdout=out,
+        )
+
+        self.assertIn('3 done', out.getvalue())
+        self.assertFalse(
+            PaperJob.objects.exclude(status=PaperJob.Status.DONE).exists()
+        )
+        self.assertEqual(
+            sorted(Paper.objects.values_list('pdf_text', flat=True)),
+            ['Paper 0', 'Paper 1', 'Paper 2'],
+        )
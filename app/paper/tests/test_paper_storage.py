@@ -0,0 +1,242 @@
+"""Tests for content-addressed paper PDF storage."""
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Event, Paper
+from paper.uploads import get_storage, release_pdf, store_pdf
+
+MEDIA_ROOT = tempfile.mkdtemp()
+PDF = b'%PDF-1.4\nfirst'
+OTHER_PDF = b'%PDF-1.4\nsecond'
+
+
+def papers_url(event_id):
+    """Create and return the paper list URL of an event."""
+    return reverse('event-papers-list', args=[event_id])
+
+
+def upload_pdf_url(event_id, paper_id):
+    """Create and return the PDF replacement URL of a paper."""
+    return reverse('event-papers-upload-pdf', args=[event_id, paper_id])
+
+
+def content_path(content):
+    """Return the storage path of a PDF content."""
+    sha256 = hashlib.sha256(content).hexdigest()
+    return f'uploads/papers/{sha256[:2]}/{sha256}.pdf'
+
+
+def make_old(name):
+    """Move the modification time of a stored file out of the grace period."""
+    path = os.path.join(MEDIA_ROOT, name)
+    old = time.time() - 2 * 3600
+    os.utime(path, (old, old))
+
+
+def stored(name):
+    """Return whether a file exists in the paper storage."""
+    return os.path.exists(os.path.join(MEDIA_ROOT, name))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(TestCase):
+    """Test identical PDFs share one file, released when unreferenced."""
+
+    def setUp(self):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        self.author = get_user_model().objects.create_user(
+            email='author@example.com', password='testpass123',
+            role='author',
+        )
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com', 'admin123',
+        )
+        self.event = Event.objects.create(
+            user=self.author, title='Event', description='Description',
+            location='Oran', start_date=date(2025, 12, 12),
+            end_date=date(2025, 12, 31),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def submit(self, content):
+        res = self.client.post(papers_url(self.event.id), {
+            'title': 'Paper',
+            'abstract': 'Abstract',
+            'keywords': 'ai',
+            'paper_type': 'oral',
+            'pdf_file': SimpleUploadedFile('paper.pdf', content),
+        }, format='multipart')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return Paper.objects.get(id=res.data['id'])
+
+    def test_same_pdf_stored_once(self):
+        """Test re-submitting a PDF reuses the stored file."""
+        first = self.submit(PDF)
+        second = self.submit(PDF)
+
+        self.assertEqual(first.pdf_file.name, content_path(PDF))
+        self.assertEqual(second.pdf_file.name, first.pdf_file.name)
+        files = os.listdir(os.path.join(MEDIA_ROOT, 'uploads/papers/incoming'))
+        self.assertEqual(files, [])
+
+    def test_delete_keeps_shared_file(self):
+        """Test a file is deleted with the last paper referencing it."""
+        first = self.submit(PDF)
+        second = self.submit(PDF)
+        make_old(content_path(PDF))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(stored(content_path(PDF)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(stored(content_path(PDF)))
+
+    def test_recent_file_left_to_gc(self):
+        """Test a file touched during the grace period is not released."""
+        paper = self.submit(PDF)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            paper.delete()
+
+        self.assertTrue(stored(content_path(PDF)))
+
+    def test_replace_pdf_releases_old_file(self):
+        """Test replacing a paper's PDF releases the previous file."""
+        paper = self.submit(PDF)
+        make_old(content_path(PDF))
+        self.client.force_authenticate(self.admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                upload_pdf_url(self.event.id, paper.id),
+                {'pdf_file': SimpleUploadedFile('new.pdf', OTHER_PDF)},
+                format='multipart',
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        paper.refresh_from_db()
+        self.assertEqual(paper.pdf_file.name, content_path(OTHER_PDF))
+        self.assertEqual(
+            paper.pdf_sha256, hashlib.sha256(OTHER_PDF).hexdigest(),
+        )
+        self.assertFalse(stored(content_path(PDF)))
+
+    def test_failed_request_keeps_shared_file(self):
+        """Test a failing submission doesn't delete a file others use."""
+        self.submit(PDF)
+
+        res = self.client.post(papers_url(self.event.id), {
+            'title': 'Paper',
+            'paper_type': 'oral',
+            'pdf_file': SimpleUploadedFile('paper.pdf', PDF),
+        }, format='multipart')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(stored(content_path(PDF)))
+
+    def test_store_pdf_deduplicates(self):
+        """Test uploads not streamed by the handler are deduplicated too."""
+        first = store_pdf(SimpleUploadedFile('a.pdf', PDF))
+        second = store_pdf(SimpleUploadedFile('b.pdf', PDF))
+
+        self.assertEqual(first.path, content_path(PDF))
+        self.assertTrue(first.created)
+        self.assertEqual(second.path, first.path)
+        self.assertFalse(second.created)
+
+    def test_discard_keeps_deduplicated_file(self):
+        """Test a failed upload keeps a file another upload shares."""
+        first = store_pdf(SimpleUploadedFile('a.pdf', PDF))
+        store_pdf(SimpleUploadedFile('b.pdf', PDF))
+
+        first.discard()
+
+        self.assertTrue(stored(first.path))
+
+    def test_discard_deletes_created_file(self):
+        """Test a failed upload deletes the file only it used."""
+        first = store_pdf(SimpleUploadedFile('a.pdf', PDF))
+
+        first.discard()
+
+        self.assertFalse(stored(first.path))
+
+    def test_deduplicate_to_deleted_file(self):
+        """Test an upload deduplicated to a file being deleted recreates it."""
+        store_pdf(SimpleUploadedFile('a.pdf', PDF))
+        path = os.path.join(MEDIA_ROOT, content_path(PDF))
+        released = []
+
+        def release_first(target, *args):
+            # Another request releases the file before it is touched.
+            if not released:
+                released.append(target)
+                os.remove(target)
+                raise FileNotFoundError(target)
+
+        with mock.patch('paper.uploads.os.utime', side_effect=release_first):
+            second = store_pdf(SimpleUploadedFile('b.pdf', PDF))
+
+        self.assertTrue(second.created)
+        self.assertTrue(os.path.exists(path))
+
+    def test_release_keeps_file_referenced_meanwhile(self):
+        """Test a release racing a new reference puts the file back."""
+        paper = self.submit(PDF)
+        name = paper.pdf_file.name
+        make_old(name)
+
+        with mock.patch('paper.uploads.pdf_references', return_value=1):
+            self.assertFalse(release_pdf(name))
+
+        self.assertTrue(stored(name))
+        self.assertEqual(os.listdir(os.path.dirname(
+            os.path.join(MEDIA_ROOT, name)
+        )), [os.path.basename(name)])
+
+    def test_gc_deletes_unreferenced_files(self):
+        """Test the GC command deletes only old, unreferenced files."""
+        kept = self.submit(PDF)
+        storage = get_storage()
+        orphan = storage.save(content_path(OTHER_PDF), SimpleUploadedFile(
+            'orphan.pdf', OTHER_PDF,
+        ))
+        partial = storage.save(
+            'uploads/papers/incoming/abandoned.part',
+            SimpleUploadedFile('abandoned.part', b'%PDF'),
+        )
+        recent = storage.save('uploads/papers/recent.pdf', SimpleUploadedFile(
+            'recent.pdf', PDF,
+        ))
+        for name in (kept.pdf_file.name, orphan, partial):
+            make_old(name)
+
+        out = StringIO()
+        call_command('gc_paper_pdfs', '--dry-run', stdout=out)
+        self.assertIn('Would delete 2', out.getvalue())
+        self.assertTrue(stored(orphan))
+
+        call_command('gc_paper_pdfs', stdout=StringIO())
+
+        self.assertTrue(stored(kept.pdf_file.name))
+        self.assertTrue(stored(recent))
+        self.assertFalse(stored(orphan))
+        self.assertFalse(stored(partial))
@@ -0,0 +1,151 @@
+"""Tests for streaming PDF uploads."""
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopFutureHandlers
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Event, Paper
+from paper.uploads import PDFUploadError, PDFUploadHandler
+
+MEDIA_ROOT = tempfile.mkdtemp()
+PDF = b'%PDF-1.4\n' + b'x' * 200
+
+
+def papers_url(event_id):
+    """Create and return the paper list URL of an event."""
+    return reverse('event-papers-list', args=[event_id])
+
+
+def stored_files():
+    """Return the paths of the files in the paper upload directory."""
+    directory = os.path.join(MEDIA_ROOT, 'uploads', 'papers')
+    return sorted(
+        os.path.relpath(os.path.join(root, name), MEDIA_ROOT)
+        for root, _, files in os.walk(directory) for name in files
+    )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, PAPER_PDF_MAX_SIZE=1024)
+class PDFUploadTests(TestCase):
+    """Test paper PDFs are checked and stored while streaming."""
+
+    def setUp(self):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        self.author = get_user_model().objects.create_user(
+            email='author@example.com', password='testpass123',
+            role='author',
+        )
+        self.event = Event.objects.create(
+            user=self.author, title='Event', description='Description',
+            location='Oran', start_date=date(2025, 12, 12),
+            end_date=date(2025, 12, 31),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def submit(self, content, **params):
+        payload = {
+            'title': 'Paper',
+            'abstract': 'Abstract',
+            'keywords': 'ai',
+            'paper_type': 'oral',
+            'pdf_file': SimpleUploadedFile(
+                'paper.pdf', content, content_type='application/pdf',
+            ),
+        }
+        payload.update(params)
+        return self.client.post(
+            papers_url(self.event.id), payload, format='multipart',
+        )
+
+    def test_upload_written_in_place(self):
+        """Test the PDF is stored once, straight at its final path."""
+        with mock.patch.object(FileSystemStorage, 'save') as save:
+            res = self.submit(PDF)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        save.assert_not_called()
+        paper = Paper.objects.get(id=res.data['id'])
+        sha256 = hashlib.sha256(PDF).hexdigest()
+        self.assertEqual(
+            paper.pdf_file.name, f'uploads/papers/{sha256[:2]}/{sha256}.pdf',
+        )
+        self.assertEqual(paper.pdf_sha256, sha256)
+        self.assertEqual(stored_files(), [paper.pdf_file.name])
+        with paper.pdf_file.open('rb') as stored:
+            self.assertEqual(stored.read(), PDF)
+
+    def test_reject_non_pdf(self):
+        """Test content without the PDF magic is refused, whatever its type."""
+        res = self.submit(b'<html>not a pdf</html>')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('not a PDF', res.data['detail'])
+        self.assertEqual(stored_files(), [])
+        self.assertFalse(Paper.objects.exists())
+
+    def test_reject_too_large(self):
+        """Test an oversized PDF is refused and nothing is kept."""
+        res = self.submit(PDF + b'x' * 1024)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('at most 1024 bytes', res.data['detail'])
+        self.assertEqual(stored_files(), [])
+
+    def test_invalid_form_discards_pdf(self):
+        """Test a stored PDF is removed when the rest of the form fails."""
+        res = self.submit(PDF, paper_type='keynote')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('paper_type', res.data)
+        self.assertEqual(stored_files(), [])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, PAPER_PDF_MAX_SIZE=1024)
+class PDFUploadHandlerTests(TestCase):
+    """Test the upload handler on its own."""
+
+    def setUp(self):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        self.handler = PDFUploadHandler(RequestFactory().post('/'))
+
+    def test_reject_by_content_length(self):
+        """Test a body that can't fit is refused before being read."""
+        body = mock.Mock()
+
+        with self.assertRaises(PDFUploadError):
+            self.handler.handle_raw_input(
+                body, {}, 10 * 1024 * 1024, b'boundary',
+            )
+        body.read.assert_not_called()
+
+    def test_hash_computed_while_streaming(self):
+        """Test the SHA-256 of the chunks is computed incrementally."""
+        with self.assertRaises(StopFutureHandlers):
+            self.handler.new_file(
+                'pdf_file', 'paper.pdf', 'application/pdf', len(PDF),
+            )
+        stream = io.BytesIO(PDF)
+        start = 0
+        for chunk in iter(lambda: stream.read(7), b''):
+            self.handler.receive_data_chunk(chunk, start)
+            start += len(chunk)
+
+        stored = self.handler.file_complete(len(PDF))
+
+        self.assertEqual(stored.size, len(PDF))
+        self.assertEqual(stored.sha256, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(stored_files(), [stored.path])
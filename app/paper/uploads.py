@@ -0,0 +1,353 @@
+"""Streaming upload of paper PDFs.
+
+PDFUploadHandler takes over the ``pdf_file`` part of a multipart request.
+Every chunk is checked and hashed as it arrives, and written straight to
+the paper storage, so an oversized or non-PDF upload is rejected without
+being spooled first and an accepted one is never copied.
+
+PDFs are content-addressed: a file is stored under its SHA-256 (see
+paper_pdf_content_path) and papers with the same PDF share it. A file is
+deleted once no paper references it, see release_pdf.
+
+Uploads and deletions of the same content may run concurrently. An upload
+links its file to the content path, which only one of them can create, and
+touches the file when it already exists; a deletion renames the file away
+before checking it is unused (see link_content and delete_unused).
+"""
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import (
+    FileUploadHandler,
+    StopFutureHandlers,
+)
+from django.http.multipartparser import MultiPartParserError
+from django.utils import timezone
+
+from core.models import Paper, paper_pdf_content_path
+
+PDF_FIELD = 'pdf_file'
+PDF_MAGIC = b'%PDF-'
+PDF_DIR = os.path.join('uploads', 'papers')
+# Thumbnails made by paper.jobs, garbage collected the same way.
+THUMBNAIL_FIELD = 'thumbnail'
+THUMBNAIL_DIR = os.path.join('uploads', 'thumbnails')
+# Uploads in progress, moved to their content path once hashed.
+INCOMING_DIR = os.path.join(PDF_DIR, 'incoming')
+# Unreferenced files touched more recently than this are kept: a request
+# may have just deduplicated an upload to them and not saved its paper yet.
+GC_GRACE = timedelta(hours=1)
+
+
+class PDFUploadError(MultiPartParserError):
+    """The uploaded PDF was rejected while streaming."""
+
+
+def get_storage():
+    """Return the storage of paper PDFs."""
+    return Paper._meta.get_field(PDF_FIELD).storage
+
+
+def get_max_size():
+    """Return the largest accepted PDF, in bytes."""
+    return settings.PAPER_PDF_MAX_SIZE
+
+
+class StoredPDF(UploadedFile):
+    """A PDF upload already written to the paper storage under path.
+
+    created is False when the content was already stored and the upload
+    was deduplicated to the existing file. modified_ns is the modification
+    time of a file the upload created on local storage.
+    """
+
+    def __init__(self, path, size, sha256, storage, created=True,
+                 modified_ns=None):
+        # UploadedFile keeps only the basename in name.
+        super().__init__(
+            file=None, name=path, content_type='application/pdf',
+            size=size,
+        )
+        self.path = path
+        self.sha256 = sha256
+        self.storage = storage
+        self.created = created
+        self.modified_ns = modified_ns
+
+    def discard(self):
+        """Remove the file if this upload created it and nothing uses it.
+
+        A file touched since, by an identical upload deduplicated to it,
+        is kept for that upload's paper.
+        """
+        if not self.created:
+            return
+        delete_unused(self.storage, self.path, self._is_unused)
+
+    def _is_unused(self, modified_ns):
+        if self.modified_ns is not None and modified_ns != self.modified_ns:
+            return False
+        return not pdf_references(self.path)
+
+
+def store_pdf(upload, storage=None):
+    """Store an uploaded PDF under its content path and return a StoredPDF.
+
+    For uploads that did not go through PDFUploadHandler.
+    """
+    storage = storage or get_storage()
+    sha256 = hashlib.sha256()
+    for chunk in upload.chunks():
+        sha256.update(chunk)
+    sha256 = sha256.hexdigest()
+
+    path = paper_pdf_content_path(sha256)
+    upload.seek(0)
+    try:
+        storage.path(path)
+    except NotImplementedError:
+        # Remote storage: no atomic create, deduplicate by name.
+        created = not storage.exists(path)
+        if created:
+            path = storage.save(path, upload)
+        return StoredPDF(path, upload.size, sha256, storage, created)
+
+    name = storage.save(
+        os.path.join(INCOMING_DIR, f'{uuid.uuid4()}.part'), upload,
+    )
+    created, modified_ns = link_content(storage, name, path)
+    return StoredPDF(
+        path, upload.size, sha256, storage, created, modified_ns,
+    )
+
+
+def link_content(storage, name, path):
+    """Move the stored file name to the content path path.
+
+    Returns whether the file was created, and its modification time then.
+    Linking fails when path exists, so of two identical uploads only one
+    creates it. The other touches the existing file instead, which keeps
+    discard and release_pdf from deleting it; when a deletion got to it
+    first, the file is linked again.
+    """
+    source = storage.path(name)
+    target = storage.path(path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        modified_ns = os.stat(source).st_mtime_ns
+        while True:
+            try:
+                # Same file system: never a copy.
+                os.link(source, target)
+                return True, modified_ns
+            except FileExistsError:
+                pass
+            try:
+                os.utime(target)
+                return False, None
+            except FileNotFoundError:
+                continue
+    finally:
+        os.remove(source)
+
+
+def remember_stored_pdf(request, stored):
+    """Record a PDF stored for request, to discard it if the request fails."""
+    if not hasattr(request, 'stored_pdfs'):
+        request.stored_pdfs = []
+    request.stored_pdfs.append(stored)
+
+
+def discard_stored_pdfs(request):
+    """Delete the PDFs stored by a request that ended up failing."""
+    stored_pdfs = getattr(request, 'stored_pdfs', [])
+    for stored in stored_pdfs:
+        stored.discard()
+    stored_pdfs.clear()
+
+
+def pdf_references(name, field=PDF_FIELD):
+    """Return the number of papers referencing the file name in field."""
+    return Paper.objects.filter(**{field: name}).count()
+
+
+def get_modified_ns(storage, name):
+    """Return the modification time of a stored file, in nanoseconds."""
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        return int(storage.get_modified_time(name).timestamp() * 10 ** 9)
+    return os.stat(path).st_mtime_ns
+
+
+def _is_garbage(name, modified_ns, grace, field):
+    cutoff = timezone.now() - grace
+    if modified_ns > cutoff.timestamp() * 10 ** 9:
+        return False
+    return pdf_references(name, field) == 0
+
+
+def is_garbage(name, storage=None, grace=GC_GRACE, field=PDF_FIELD):
+    """Return whether a stored file is unreferenced and can be deleted."""
+    storage = storage or get_storage()
+    try:
+        modified_ns = get_modified_ns(storage, name)
+    except FileNotFoundError:
+        return False
+    return _is_garbage(name, modified_ns, grace, field)
+
+
+def delete_unused(storage, name, is_unused):
+    """Delete a stored file if is_unused(modified_ns) holds.
+
+    Returns whether the file was deleted. On local storage the file is
+    renamed away before is_unused is checked: an upload deduplicated to it
+    before then touched it, which shows in modified_ns, and one after
+    creates it again (see link_content). The file is put back otherwise.
+    """
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        # Remote storage: no atomic rename, check then delete.
+        try:
+            modified_ns = get_modified_ns(storage, name)
+        except FileNotFoundError:
+            return False
+        if not is_unused(modified_ns):
+            return False
+        storage.delete(name)
+        return True
+
+    # Left behind by a crash, the renamed file is garbage collected.
+    trash = f'{path}.{uuid.uuid4().hex}.deleting'
+    try:
+        os.rename(path, trash)
+    except FileNotFoundError:
+        return False
+    try:
+        if is_unused(os.stat(trash).st_mtime_ns):
+            return True
+        try:
+            os.link(trash, path)
+        except FileExistsError:
+            # Created again meanwhile by an identical upload.
+            pass
+        return False
+    finally:
+        os.remove(trash)
+
+
+def release_pdf(name, storage=None, grace=GC_GRACE, field=PDF_FIELD):
+    """Delete a file a paper stopped referencing if no other paper does.
+
+    Returns whether the file was deleted. Files still inside the grace
+    period are left to the gc_paper_pdfs command.
+    """
+    storage = storage or get_storage()
+    if not name:
+        return False
+    return delete_unused(
+        storage, name,
+        lambda modified_ns: _is_garbage(name, modified_ns, grace, field),
+    )
+
+
+def iter_stored_pdfs(storage=None, directory=PDF_DIR):
+    """Yield the names of every file under directory."""
+    storage = storage or get_storage()
+    if not storage.exists(directory):
+        return
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield os.path.join(directory, name)
+    for name in directories:
+        yield from iter_stored_pdfs(storage, os.path.join(directory, name))
+
+
+class PDFUploadHandler(FileUploadHandler):
+    """Stream the pdf_file part of a request to the paper storage."""
+    chunk_size = 64 * 1024
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.storage = get_storage()
+        self.max_size = get_max_size()
+        self.file = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        # Refuse before reading anything when the body can't fit: the PDF
+        # plus the other fields, which Django caps separately.
+        limit = self.max_size + (settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0)
+        if content_length > limit:
+            raise PDFUploadError(
+                f'The PDF must be at most {self.max_size} bytes.'
+            )
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        if field_name != PDF_FIELD:
+            return
+        # The content path is only known once the whole file is hashed.
+        name = os.path.join(INCOMING_DIR, f'{uuid.uuid4()}.part')
+        try:
+            path = self.storage.path(name)
+        except NotImplementedError:
+            # Remote storage: leave the file to the default handlers.
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.name = name
+        self.file = open(path, 'xb')
+        self.head = b''
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.file is None:
+            return raw_data
+        if len(self.head) < len(PDF_MAGIC):
+            self.head += raw_data[:len(PDF_MAGIC) - len(self.head)]
+            if not PDF_MAGIC.startswith(self.head):
+                self._abort('The file is not a PDF.')
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self._abort(f'The PDF must be at most {self.max_size} bytes.')
+        self.sha256.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if self.file is None:
+            return None
+        if self.head != PDF_MAGIC:
+            self._abort('The file is not a PDF.')
+        self.file.close()
+        self.file = None
+
+        sha256 = self.sha256.hexdigest()
+        path = paper_pdf_content_path(sha256)
+        created, modified_ns = link_content(self.storage, self.name, path)
+
+        stored = StoredPDF(
+            path, self.size, sha256, self.storage, created, modified_ns,
+        )
+        remember_stored_pdf(self.request, stored)
+        return stored
+
+    def upload_interrupted(self):
+        if self.file is not None:
+            self._discard()
+
+    def _abort(self, message):
+        self._discard()
+        raise PDFUploadError(message)
+
+    def _discard(self):
+        self.file.close()
+        self.file = None
+        self.storage.delete(self.name)
@@ -1,34 +1,127 @@
+import posixpath
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils.cache import patch_cache_control
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.settings import api_settings
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import AllowAny, IsAdminUser
 
-from core.models import Paper
+from core.authentication import CachedTokenAuthentication
+from core.downloads import JPEGRenderer, PDFRenderer, serve_file
+from core.mixins import ConditionalGetMixin
+from core.models import Keyword, Paper
+from core.notifications import notify_paper_decision
+from core.pagination import PaperCursorPagination
+from core.search import search
+from core.streaming import (
+    CSVRenderer,
+    NDJSONRenderer,
+    StreamingListMixin,
+    export_response,
+)
+from event.counters import paper_added, paper_removed, paper_status_changed
 from . import serializers
-from .permissions import PaperPermissions
+from .jobs import enqueue
+from .permissions import PaperPDFPermissions, PaperPermissions
+from .uploads import PDFUploadHandler, discard_stored_pdfs
+
+# Output column -> lookup of the papers export.
+PAPER_EXPORT_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "author_email": "author__email",
+    "author_name": "author__name",
+    "paper_type": "paper_type",
+    "keywords": "keywords",
+    "status": "status",
+    "pdf_file": "pdf_file",
+    "created_at": "created_at",
+}
 
 
-class EventPaperViewSet(viewsets.ModelViewSet):
+class EventPaperViewSet(ConditionalGetMixin,
+                        StreamingListMixin,
+                        viewsets.ModelViewSet):
     """
     /api/event/<event_id>/papers/
     - GET: list papers for this event (public)
     - POST: author creates paper (pdf upload)
     - PATCH set-status: admin accept/reject
     - POST upload-pdf: admin replace pdf (optional)
+    - GET pdf: download the pdf (staff, author, event organizer)
+    - GET thumbnail: the first page of the pdf, as a JPEG (public)
     """
 
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [PaperPermissions]
     parser_classes = [MultiPartParser, FormParser]  # needed for pdf upload
+    pagination_class = PaperCursorPagination
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer]
+    # Papers embed the event title; author emails are covered by
+    # paper.signals touching the papers.
+    related_last_modified_fields = ("event__updated_at",)
+
+    def initialize_request(self, request, *args, **kwargs):
+        if request.method == "POST":
+            # Must happen before anything reads the body.
+            request.upload_handlers.insert(0, PDFUploadHandler(request))
+        return super().initialize_request(request, *args, **kwargs)
+
+    def handle_exception(self, exc):
+        # The request failed after its PDF was stored: don't keep it.
+        discard_stored_pdfs(self.request)
+        return super().handle_exception(exc)
 
     def get_queryset(self):
-        return Paper.objects.filter(
+        queryset = Paper.objects.filter(
             event_id=self.kwargs["event_id"]
-        ).order_by("-created_at")
+        ).select_related("author", "event").defer(
+            "search_vector", "event__search_vector", "pdf_text",
+        ).order_by("-created_at", "-id")
+
+        if self.action == "list":
+            # Only the columns PaperListSerializer reads; abstracts stay
+            # in the database.
+            queryset = queryset.only(
+                "id", "title", "keywords", "paper_type", "pdf_file",
+                "page_count", "thumbnail", "status", "created_at",
+                "author__email", "event__title",
+            )
+
+        if self.action == "list":
+            keyword = self.request.query_params.get("keyword")
+            if keyword:
+                queryset = queryset.filter(
+                    keyword_tags__name=" ".join(keyword.split()).lower()
+                )
+
+            query = self.request.query_params.get("q")
+            if query:
+                queryset = search(queryset, query)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        if self.wants_stream(request):
+            return self.stream_list(request)
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
 
     def get_serializer_class(self):
+        if self.action == "list":
+            return serializers.PaperListSerializer
         if self.action == "create":
             return serializers.PaperCreateSerializer
         if self.action == "set_status":
@@ -37,31 +130,131 @@ class EventPaperViewSet(viewsets.ModelViewSet):
             return serializers.PaperPDFSerializer
         return serializers.PaperSerializer
 
+    @transaction.atomic
     def perform_create(self, serializer):
         # event comes from URL, author from authenticated user
-        serializer.save(
+        paper = serializer.save(
             author=self.request.user,
             event_id=self.kwargs["event_id"],
         )
+        paper_added(paper.event_id, paper.status)
+        # Page count, text and thumbnail are extracted out of the request.
+        enqueue(paper)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        paper_removed(instance.event_id, instance.status)
 
     @action(methods=["PATCH"], detail=True, url_path="set-status",
-            authentication_classes=[TokenAuthentication],
+            authentication_classes=[CachedTokenAuthentication],
             permission_classes=[IsAdminUser])
     def set_status(self, request, event_id=None, pk=None):
         """Admin: accept/reject paper by changing status."""
         paper = self.get_object()
         serializer = self.get_serializer(paper, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+
+        with transaction.atomic():
+            # Lock the row so concurrent changes move the counters once.
+            old_status = Paper.objects.select_for_update().values_list(
+                "status", flat=True,
+            ).get(pk=paper.pk)
+            serializer.save()
+            paper_status_changed(paper.event_id, old_status, paper.status)
+            if paper.status != old_status:
+                notify_paper_decision(paper)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @extend_schema(responses=serializers.KeywordCountSerializer(many=True))
+    @action(methods=["GET"], detail=False, url_path="keywords")
+    def keywords(self, request, event_id=None):
+        """Keywords of this event's papers with their paper counts."""
+        facets = Keyword.objects.filter(
+            papers__event_id=event_id
+        ).values("name").annotate(
+            count=Count("papers")
+        ).order_by("-count", "name")
+        serializer = serializers.KeywordCountSerializer(facets, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(methods=["GET"], detail=False, url_path="export",
+            authentication_classes=[CachedTokenAuthentication],
+            permission_classes=[IsAdminUser],
+            renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request, event_id=None):
+        """Admin: stream every paper of this event as CSV/NDJSON."""
+        papers = Paper.objects.filter(
+            event_id=event_id
+        ).order_by("created_at", "id")
+        return export_response(
+            request, papers, PAPER_EXPORT_COLUMNS,
+            f"event-{event_id}-papers",
+        )
+
+    @action(methods=["GET"], detail=True, url_path="pdf",
+            authentication_classes=[CachedTokenAuthentication],
+            permission_classes=[PaperPDFPermissions],
+            renderer_classes=api_settings.DEFAULT_RENDERER_CLASSES + [
+                PDFRenderer,
+            ])
+    def pdf(self, request, event_id=None, pk=None):
+        """Download the pdf, with Range and If-None-Match support."""
+        paper = self.get_object()
+        if not paper.pdf_file:
+            raise NotFound("This paper has no PDF.")
+
+        # Files are stored by content hash, which makes a strong ETag.
+        etag = f'"{paper.pdf_sha256}"' if paper.pdf_sha256 else None
+        response = serve_file(
+            request,
+            paper.pdf_file.storage,
+            paper.pdf_file.name,
+            content_type="application/pdf",
+            filename=f"paper-{paper.pk}.pdf",
+            etag=etag,
+            offload=settings.PAPER_PDF_SERVE,
+            accel_prefix=settings.PAPER_PDF_ACCEL_PREFIX,
+        )
+        # Permission checked: browsers may keep it, shared caches not.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @action(methods=["GET"], detail=True, url_path="thumbnail",
+            renderer_classes=api_settings.DEFAULT_RENDERER_CLASSES + [
+                JPEGRenderer,
+            ])
+    def thumbnail(self, request, event_id=None, pk=None):
+        """Send the thumbnail of the paper's first page."""
+        paper = self.get_object()
+        if not paper.thumbnail:
+            raise NotFound("This paper has no thumbnail.")
+
+        # Thumbnails are named by the hash of their PDF, or made unique.
+        name = paper.thumbnail.name
+        etag = f'"{posixpath.splitext(posixpath.basename(name))[0]}"'
+        response = serve_file(
+            request,
+            paper.thumbnail.storage,
+            name,
+            content_type="image/jpeg",
+            filename=f"paper-{paper.pk}.jpg",
+            etag=etag,
+            offload=settings.PAPER_PDF_SERVE,
+            accel_prefix=settings.PAPER_PDF_ACCEL_PREFIX,
+        )
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
     @action(methods=["POST"], detail=True, url_path="upload-pdf",
-            authentication_classes=[TokenAuthentication],
+            authentication_classes=[CachedTokenAuthentication],
             permission_classes=[IsAdminUser])
     def upload_pdf(self, request, event_id=None, pk=None):
         """Admin: upload/replace pdf file (optional)."""
         paper = self.get_object()
         serializer = self.get_serializer(paper, data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
+            enqueue(paper)
         return Response(serializer.data, status=status.HTTP_200_OK)